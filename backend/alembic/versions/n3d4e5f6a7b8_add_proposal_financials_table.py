@@ -0,0 +1,39 @@
+"""add proposal_financials summary table
+
+Revision ID: n3d4e5f6a7b8
+Revises: m2c3d4e5f6a7
+Create Date: 2026-03-06
+
+Existing proposals are not backfilled here: the summary is built lazily from
+pricing_rows the first time a proposal is read or written.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "n3d4e5f6a7b8"
+down_revision = "m2c3d4e5f6a7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "proposal_financials",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("proposal_id", UUID(as_uuid=True), sa.ForeignKey("proposals.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("scope", sa.String(), nullable=False),
+        sa.Column("key", sa.String(), nullable=False, server_default=""),
+        sa.Column("hours", sa.Numeric(16, 4), nullable=False, server_default="0"),
+        sa.Column("billing", sa.Numeric(16, 4), nullable=False, server_default="0"),
+        sa.Column("cost", sa.Numeric(16, 4), nullable=False, server_default="0"),
+        sa.Column("burdened", sa.Numeric(16, 4), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.UniqueConstraint("proposal_id", "scope", "key", name="uq_proposal_financials_bucket"),
+    )
+    op.create_index("ix_proposal_financials_proposal_id", "proposal_financials", ["proposal_id"])
+
+
+def downgrade():
+    op.drop_index("ix_proposal_financials_proposal_id", table_name="proposal_financials")
+    op.drop_table("proposal_financials")
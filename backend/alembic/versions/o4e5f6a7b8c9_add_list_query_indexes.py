@@ -0,0 +1,45 @@
+"""add composite indexes for per-proposal list queries and wbs/person lookups
+
+Revision ID: o4e5f6a7b8c9
+Revises: n3d4e5f6a7b8
+Create Date: 2026-03-09
+
+Each composite index matches a list route's WHERE proposal_id = ... ORDER BY ...
+so Postgres can read rows in order instead of sorting them.  The single-column
+wbs_id / person_id indexes serve get_wbs_links and the person rate cascade.
+"""
+from alembic import op
+
+revision = "o4e5f6a7b8c9"
+down_revision = "n3d4e5f6a7b8"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_pricing_rows_proposal_updated", "pricing_rows", ["proposal_id", "updated_at"]),
+    ("ix_pricing_rows_wbs_id", "pricing_rows", ["wbs_id"]),
+    ("ix_pricing_rows_person_id", "pricing_rows", ["person_id"]),
+    ("ix_proposed_people_proposal_updated", "proposed_people", ["proposal_id", "updated_at"]),
+    ("ix_relevant_projects_proposal_updated", "relevant_projects", ["proposal_id", "updated_at"]),
+    ("ix_scope_sections_proposal_order", "scope_sections", ["proposal_id", "order_index"]),
+    ("ix_compliance_items_proposal_category_order", "compliance_items", ["proposal_id", "category", "order_index"]),
+    ("ix_schedule_items_proposal_start", "schedule_items", ["proposal_id", "start_date", "updated_at"]),
+    ("ix_schedule_items_wbs_id", "schedule_items", ["wbs_id"]),
+    ("ix_wbs_items_proposal_order", "wbs_items", ["proposal_id", "order_index", "wbs_code"]),
+    ("ix_drawings_proposal_number", "drawings", ["proposal_id", "drawing_number", "updated_at"]),
+    ("ix_drawings_wbs_id", "drawings", ["wbs_id"]),
+    ("ix_deliverables_proposal_ref", "deliverables", ["proposal_id", "deliverable_ref", "updated_at"]),
+    ("ix_deliverables_wbs_id", "deliverables", ["wbs_id"]),
+    ("ix_proposal_disciplines_proposal_order", "proposal_disciplines", ["proposal_id", "order_index"]),
+    ("ix_client_outreach_proposal_date", "client_outreach", ["proposal_id", "outreach_date"]),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
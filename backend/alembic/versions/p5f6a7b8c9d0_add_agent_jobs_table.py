@@ -0,0 +1,40 @@
+"""add agent_jobs table
+
+Revision ID: p5f6a7b8c9d0
+Revises: o4e5f6a7b8c9
+Create Date: 2026-03-11
+
+Replaces the per-agent in-memory job dicts so job state survives restarts and
+is visible to every uvicorn worker.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision = "p5f6a7b8c9d0"
+down_revision = "o4e5f6a7b8c9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "agent_jobs",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("agent", sa.String(), nullable=False),
+        sa.Column("proposal_id", sa.String(), nullable=True),
+        sa.Column("status", sa.String(), nullable=False, server_default="pending"),
+        sa.Column("params", JSONB(), nullable=False, server_default="{}"),
+        sa.Column("result", JSONB(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_agent_jobs_proposal_id", "agent_jobs", ["proposal_id"])
+    op.create_index("ix_agent_jobs_created_at", "agent_jobs", ["created_at"])
+
+
+def downgrade():
+    op.drop_index("ix_agent_jobs_created_at", table_name="agent_jobs")
+    op.drop_index("ix_agent_jobs_proposal_id", table_name="agent_jobs")
+    op.drop_table("agent_jobs")
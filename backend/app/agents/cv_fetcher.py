@@ -2,18 +2,30 @@
 CV Fetcher Agent — mock implementation for PoC.
 
 In production this would call an internal HR system (Oracle HCM) or SharePoint
-to fetch real employee CVs. For the PoC demo we return plausible mock data
-so leadership can see the end-to-end flow without needing API credentials.
+to fetch real employee CVs. For the PoC demo the in-process fake HR service
+(app.agents.fakes) answers with plausible mock data so leadership can see the
+end-to-end flow without needing API credentials.
 
 The agent pattern (async job with polling) is preserved exactly as it would be
 in the real implementation so the contract is production-ready.
+
+Names are looked up concurrently (at most ``agent_cv_concurrency`` calls in
+flight), each call with its own timeout and retried on transport errors and
+5xx responses.  Matched CVs are cached per normalized name, so key staff named
+on several proposals are fetched from HR once per ``agent_cv_cache_ttl_seconds``.
 """
-import uuid
+import asyncio
 import random
-from datetime import datetime, timezone
 
-# In-memory job store.  Replace with Redis or DB in production.
-_jobs: dict[str, dict] = {}
+import httpx
+
+from app.agents.cv_index import NameIndex
+from app.agents.http import Emit, get_client, iter_items
+from app.cache import TTLCache
+from app.config import settings
+
+# Base delay before retrying a failed HR call; doubles each attempt
+RETRY_BACKOFF_SECONDS = 0.2
 
 MOCK_CVS: list[dict] = [
     {
@@ -100,57 +112,79 @@ MOCK_CVS: list[dict] = [
 ]
 
 
-def create_job(proposal_id: str, names: list[str]) -> str:
-    job_id = str(uuid.uuid4())
-    _jobs[job_id] = {
-        "job_id": job_id,
-        "proposal_id": proposal_id,
-        "status": "pending",
-        "names": names,
-        "result": None,
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "completed_at": None,
-    }
-    return job_id
+cv_index = NameIndex(MOCK_CVS)
 
 
-def get_job(job_id: str) -> dict | None:
-    return _jobs.get(job_id)
+def match_cv(name: str) -> dict:
+    """Mock HR lookup: exact, token or fuzzy match from the index, else a random mock CV."""
+    return cv_index.match(name) or random.choice(MOCK_CVS)
 
 
-def run_job(job_id: str) -> None:
-    """
-    Synchronous mock execution — in production this would be a Celery/ARQ task
-    that calls HR APIs and optionally an LLM to summarise the CV.
-    """
-    job = _jobs.get(job_id)
-    if not job:
-        return
+cv_cache = TTLCache(maxsize=settings.agent_cv_cache_max_entries, ttl=settings.agent_cv_cache_ttl_seconds)
 
-    job["status"] = "running"
 
-    names = job["names"]
-    if not names:
-        job["status"] = "complete"
-        job["result"] = [{**cv, "requested_name": cv["employee_name"]} for cv in MOCK_CVS]
-        job["completed_at"] = datetime.now(timezone.utc).isoformat()
-        return
+def _name_key(name: str) -> str:
+    return " ".join(name.lower().split())
 
-    matched = []
-    for name in names:
-        name_lower = name.lower()
-        # Try exact match first, then fuzzy, then pick a random mock CV
-        candidate = next(
-            (cv for cv in MOCK_CVS if cv["employee_name"].lower() == name_lower),
-            None,
-        )
-        if not candidate:
-            candidate = next(
-                (cv for cv in MOCK_CVS if any(part in name_lower for part in cv["employee_name"].lower().split())),
-                random.choice(MOCK_CVS),
+
+def _retryable(exc: httpx.HTTPError) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+async def fetch_cv(client: httpx.AsyncClient, name: str) -> dict:
+    """One employee's CV, from the cache or the HR system."""
+    key = _name_key(name)
+    cv = cv_cache.get(key)
+    if cv is not None:
+        return cv
+    for attempt in range(settings.agent_cv_retries + 1):
+        try:
+            response = await client.get(
+                "/hr/cvs/match", params={"name": name}, timeout=settings.agent_cv_call_timeout_seconds
             )
-        matched.append({**candidate, "requested_name": name})
+            response.raise_for_status()
+            break
+        except httpx.HTTPError as exc:
+            if attempt == settings.agent_cv_retries or not _retryable(exc):
+                raise
+            await asyncio.sleep(RETRY_BACKOFF_SECONDS * 2 ** attempt)
+    cv = response.json()["cv"]
+    cv_cache.set(key, cv)
+    return cv
+
+
+async def run_job(proposal_id: str, params: dict, emit: Emit | None = None) -> list:
+    """
+    Look up each requested employee's CV in the HR system.  ``params["names"]``
+    lists the employees to fetch; an empty list returns every available CV.
+    Each CV is passed to ``emit`` as soon as it is found; the result keeps the
+    order of ``names``.
+    """
+    names = params.get("names") or []
+    matched = []
+    if not names:
+        async for cv in iter_items("GET", "/hr/cvs"):
+            matched.append({**cv, "requested_name": cv["employee_name"]})
+            if emit is not None:
+                await emit(matched[-1:])
+        return matched
+
+    client = get_client()
+    slots = asyncio.Semaphore(settings.agent_cv_concurrency)
+
+    async def lookup(name: str) -> dict:
+        async with slots:
+            cv = {**await fetch_cv(client, name), "requested_name": name}
+        if emit is not None:
+            await emit([cv])
+        return cv
 
-    job["status"] = "complete"
-    job["result"] = matched
-    job["completed_at"] = datetime.now(timezone.utc).isoformat()
+    # A failed lookup cancels the rest rather than leaving them running
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(lookup(name)) for name in names]
+    except ExceptionGroup as exc:
+        raise exc.exceptions[0]
+    return [task.result() for task in tasks]
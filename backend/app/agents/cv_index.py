@@ -0,0 +1,145 @@
+"""
+In-memory index for matching requested names against a staff directory.
+
+Lookups, tried in order:
+
+    exact     normalized full name -> employee
+    tokens    inverted index token -> employees; the earliest entry having every
+              requested token
+    partial   the entry sharing the most tokens with the request
+
+With ``fuzzy`` on, a requested token missing from the index (a typo or spelling
+variant) is replaced by the most similar indexed token (Jaccard similarity of
+character trigrams, at least ``FUZZY_THRESHOLD``) that still co-occurs with the
+rest of the requested name.  Trigrams index the token vocabulary rather than
+every employee, so correction cost doesn't grow with the directory.
+
+Ties go to the earliest directory entry.  Postings hold directory positions, so
+a lookup touches only the postings of the requested tokens.  ``upsert`` /
+``remove`` refresh entries in place as the directory changes, so the index is
+built once per process.
+"""
+from collections import Counter, defaultdict
+from typing import Iterable
+
+# Minimum trigram Jaccard similarity for a fuzzy token correction
+FUZZY_THRESHOLD = 0.4
+
+
+def normalize(name: str) -> str:
+    return " ".join(name.lower().replace(".", " ").replace(",", " ").split())
+
+
+def trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    def __init__(self, employees: Iterable[dict] = (), fuzzy: bool = True):
+        self.fuzzy = fuzzy
+        # Directory position -> employee; positions are stable across refreshes
+        self._entries: dict[int, dict] = {}
+        self._position: dict[str, int] = {}
+        self._exact: dict[str, set[int]] = defaultdict(set)
+        self._tokens: dict[str, set[int]] = defaultdict(set)
+        # Trigram -> indexed tokens containing it, and each token's trigram count
+        self._vocabulary: dict[str, set[str]] = defaultdict(set)
+        self._gram_count: dict[str, int] = {}
+        self.upsert(employees)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def upsert(self, employees: Iterable[dict]) -> None:
+        """Add employees, or re-index ones that changed (keyed by employee_id)."""
+        for employee in employees:
+            position = self._position.get(employee["employee_id"])
+            if position is None:
+                position = self._position[employee["employee_id"]] = len(self._position)
+            elif position in self._entries:
+                self._unlink(position)
+            self._entries[position] = employee
+            name = normalize(employee["employee_name"])
+            self._exact[name].add(position)
+            # Once per distinct token: a name may repeat one ("Anne Anne")
+            for token in set(name.split()):
+                if token not in self._tokens and self.fuzzy:
+                    grams = trigrams(token)
+                    self._gram_count[token] = len(grams)
+                    for gram in grams:
+                        self._vocabulary[gram].add(token)
+                self._tokens[token].add(position)
+
+    def remove(self, employee_ids: Iterable[str]) -> None:
+        for employee_id in employee_ids:
+            position = self._position.get(employee_id)
+            if position is not None and position in self._entries:
+                self._unlink(position)
+                del self._entries[position]
+
+    def _unlink(self, position: int) -> None:
+        name = normalize(self._entries[position]["employee_name"])
+        self._discard(self._exact, name, position)
+        for token in set(name.split()):
+            self._discard(self._tokens, token, position)
+            if token not in self._tokens and self.fuzzy:
+                del self._gram_count[token]
+                for gram in trigrams(token):
+                    self._discard(self._vocabulary, gram, token)
+
+    @staticmethod
+    def _discard(postings: dict, key: str, value) -> None:
+        values = postings.get(key)
+        if values is not None:
+            values.discard(value)
+            if not values:
+                del postings[key]
+
+    def corrections(self, token: str, limit: int = 5) -> list[str]:
+        """Indexed tokens most similar to ``token``, best first."""
+        grams = trigrams(token)
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self._vocabulary.get(gram, ()))
+        # Jaccard >= threshold needs at least this many shared trigrams
+        need = FUZZY_THRESHOLD * len(grams)
+        scored = []
+        for candidate, n in shared.items():
+            if n < need:
+                continue
+            score = n / (len(grams) + self._gram_count[candidate] - n)
+            if score >= FUZZY_THRESHOLD:
+                scored.append((-score, candidate))
+        scored.sort()
+        return [candidate for _, candidate in scored[:limit]]
+
+    def match(self, name: str) -> dict | None:
+        """Best directory entry for ``name``, or None if nothing is close."""
+        key = normalize(name)
+        if not key:
+            return None
+        if key in self._exact:
+            return self._entries[min(self._exact[key])]
+
+        tokens = set(key.split())
+        postings = sorted((self._tokens[t] for t in tokens if t in self._tokens), key=len)
+        common = postings[0].intersection(*postings[1:]) if postings else None
+        if self.fuzzy:
+            for token in [t for t in tokens if t not in self._tokens]:
+                options = [self._tokens[c] for c in self.corrections(token)]
+                # Prefer a correction that still matches the rest of the name
+                fits = next((ids for ids in options if common is None or not common.isdisjoint(ids)), None)
+                if fits is not None:
+                    postings.append(fits)
+                    common = set(fits) if common is None else common & fits
+        if not postings:
+            return None
+        if common:
+            return self._entries[min(common)]
+
+        shared: Counter = Counter()
+        for ids in postings:
+            shared.update(ids)
+        top = max(shared.values())
+        return self._entries[min(p for p, n in shared.items() if n == top)]
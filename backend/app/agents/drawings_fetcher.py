@@ -3,13 +3,10 @@ Drawings Fetcher Agent — mock implementation for PoC.
 
 In production this would call an LLM agent to analyze the RFP requirements and
 the WBS to generate an expected drawing list for the project.
-For the PoC demo we return plausible mock data after a delay.
+For the PoC demo the request is answered by the in-process fake service
+(app.agents.fakes) with plausible mock data after a delay.
 """
-import uuid
-import time
-from datetime import datetime, timezone
-
-_jobs: dict[str, dict] = {}
+from app.agents.http import Emit, stream_items
 
 MOCK_DRAWINGS = [
     {
@@ -95,32 +92,6 @@ MOCK_DRAWINGS = [
 ]
 
 
-def create_job(proposal_id: str) -> str:
-    job_id = str(uuid.uuid4())
-    _jobs[job_id] = {
-        "job_id": job_id,
-        "proposal_id": proposal_id,
-        "status": "pending",
-        "result": None,
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "completed_at": None,
-    }
-    return job_id
-
-
-def get_job(job_id: str) -> dict | None:
-    return _jobs.get(job_id)
-
-
-def run_job(job_id: str) -> None:
-    """Synchronous mock — simulates 2s LLM processing delay."""
-    job = _jobs.get(job_id)
-    if not job:
-        return
-
-    job["status"] = "running"
-    time.sleep(2)
-
-    job["status"] = "complete"
-    job["result"] = MOCK_DRAWINGS
-    job["completed_at"] = datetime.now(timezone.utc).isoformat()
+async def run_job(proposal_id: str, params: dict, emit: Emit | None = None) -> list:
+    """Ask the drawings service for the expected drawing list, emitting each drawing as it arrives."""
+    return await stream_items("POST", "/drawings/suggest", emit, json={"proposal_id": proposal_id})
@@ -0,0 +1,52 @@
+"""
+In-process stand-ins for the services agents call over HTTP.
+
+``fake_transport`` is an ``httpx.MockTransport`` that answers the agent
+endpoints with the mock data defined in each agent module after an
+``asyncio.sleep`` of ``latency`` seconds — a coroutine wait, not a blocked
+thread.  List endpoints asked for NDJSON stream their items instead, the
+latency spread evenly across them.  It backs the shared client whenever no real ``agent_api_base_url`` is
+configured, and tests build it with ``latency=0``.
+"""
+import asyncio
+import json
+
+import httpx
+
+from app.agents import cv_fetcher, deliverables_fetcher, drawings_fetcher, projects_search, relevant_projects_fetcher, rfp_extractor
+from app.agents.http import NDJSON
+
+# (method, path) -> (response key, mock data)
+_STATIC = {
+    ("POST", "/rfp/extract"): ("sections", rfp_extractor.MOCK_SCOPE_SECTIONS),
+    ("POST", "/drawings/suggest"): ("drawings", drawings_fetcher.MOCK_DRAWINGS),
+    ("POST", "/deliverables/suggest"): ("deliverables", deliverables_fetcher.MOCK_DELIVERABLES),
+    ("POST", "/projects/relevant"): ("projects", relevant_projects_fetcher.MOCK_RELEVANT_PROJECTS),
+    ("POST", "/projects/search"): ("projects", projects_search.MOCK_RESULTS),
+    ("GET", "/hr/cvs"): ("cvs", cv_fetcher.MOCK_CVS),
+}
+
+
+async def _ndjson(items: list[dict], latency: float):
+    for item in items:
+        if latency:
+            await asyncio.sleep(latency / len(items))
+        yield (json.dumps(item) + "\n").encode()
+
+
+def fake_transport(latency: float = 0.0) -> httpx.MockTransport:
+    async def handle(request: httpx.Request) -> httpx.Response:
+        route = (request.method, request.url.path)
+        if route in _STATIC and request.headers.get("accept") == NDJSON:
+            _, data = _STATIC[route]
+            return httpx.Response(200, headers={"Content-Type": NDJSON}, content=_ndjson(data, latency))
+        if latency:
+            await asyncio.sleep(latency)
+        if route in _STATIC:
+            key, data = _STATIC[route]
+            return httpx.Response(200, json={key: data})
+        if route == ("GET", "/hr/cvs/match"):
+            return httpx.Response(200, json={"cv": cv_fetcher.match_cv(request.url.params.get("name", ""))})
+        return httpx.Response(404, json={"detail": "Not found"})
+
+    return httpx.MockTransport(handle)
@@ -0,0 +1,81 @@
+"""
+Shared HTTP client for agent calls (HR system, LLM and project-search services).
+
+One pooled ``httpx.AsyncClient`` per process keeps connections alive across
+jobs and bounds how many are open at once; every request gets the configured
+timeouts.  With no ``agent_api_base_url`` configured the client is wired to the
+in-process fakes in app.agents.fakes instead of the network.
+
+List endpoints are requested as NDJSON (one item per line) so agents can hand
+each item on as it arrives instead of waiting for the whole response.
+"""
+import json
+from typing import AsyncIterator, Awaitable, Callable
+
+import httpx
+
+from app.config import settings
+
+NDJSON = "application/x-ndjson"
+
+# Receives each batch of partial results while a job runs
+Emit = Callable[[list], Awaitable[None]]
+
+_client: httpx.AsyncClient | None = None
+
+
+def build_client(transport: httpx.AsyncBaseTransport | None = None) -> httpx.AsyncClient:
+    if transport is None and not settings.agent_api_base_url:
+        from app.agents.fakes import fake_transport
+        transport = fake_transport(settings.agent_fake_latency_seconds)
+    return httpx.AsyncClient(
+        base_url=settings.agent_api_base_url or "http://agents.local",
+        transport=transport,
+        timeout=httpx.Timeout(
+            settings.agent_http_timeout_seconds,
+            connect=settings.agent_http_connect_timeout_seconds,
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.agent_http_max_connections,
+            max_keepalive_connections=settings.agent_http_max_keepalive,
+        ),
+    )
+
+
+def get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = build_client()
+    return _client
+
+
+def use_client(client: httpx.AsyncClient | None) -> None:
+    """Swap the shared client (tests); None rebuilds from settings on next use."""
+    global _client
+    _client = client
+
+
+async def iter_items(method: str, url: str, **kwargs) -> AsyncIterator[dict]:
+    """Items of an NDJSON response, yielded as each line arrives."""
+    async with get_client().stream(method, url, headers={"Accept": NDJSON}, **kwargs) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if line.strip():
+                yield json.loads(line)
+
+
+async def stream_items(method: str, url: str, emit: Emit | None = None, **kwargs) -> list:
+    """Collect an NDJSON response, passing each item to ``emit`` on arrival."""
+    items = []
+    async for item in iter_items(method, url, **kwargs):
+        items.append(item)
+        if emit is not None:
+            await emit([item])
+    return items
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
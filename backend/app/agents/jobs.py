@@ -0,0 +1,308 @@
+"""
+Agent job store shared by every agent type.
+
+Jobs are plain dicts::
+
+    {"job_id", "agent", "proposal_id", "status", "params", "result", "error",
+     "created_at", "completed_at"}
+
+with ISO-8601 timestamps.  Job ids encode the agent type
+(``drawings_fetcher.<hex>``) so a job can be attributed without a lookup.
+``job_store`` persists them through a backend:
+``DatabaseJobStore`` (the ``agent_jobs`` table, visible to every worker) or
+``SQLiteJobStore`` (a local file, for single-host setups without Postgres).
+Updates only apply to unfinished jobs, so a late write (a cancelled job's
+worker finishing anyway) can't overwrite a job's final state.
+Jobs older than ``agent_job_ttl_seconds`` are hidden on read and deleted in
+batches as new jobs are created and by the reaper (app.agents.scheduler).
+Finished jobs never change again, so they are also kept in a per-process
+cache and repeat polls skip the backend.
+"""
+import asyncio
+import json
+import sqlite3
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Protocol
+
+from sqlalchemy import delete, select, update
+
+from app.cache import TTLCache
+from app.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.agent_job import AgentJob
+
+# Seconds between eviction sweeps triggered from create()
+EVICT_INTERVAL = 60.0
+
+# Statuses after which a job never changes again
+TERMINAL_STATUSES = frozenset({"complete", "error"})
+
+JOB_FIELDS = ("agent", "proposal_id", "status", "params", "result", "error", "created_at", "completed_at")
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def new_job_id(agent: str) -> str:
+    return f"{agent}.{uuid.uuid4().hex}"
+
+
+def job_agent(job_id: str) -> str | None:
+    """Agent type encoded in a job id, or None if the id is malformed."""
+    agent, sep, key = job_id.partition(".")
+    return agent if sep and agent and len(key) == 32 else None
+
+
+class JobBackend(Protocol):
+    async def insert(self, job: dict) -> None: ...
+    async def fetch(self, job_id: str) -> dict | None: ...
+    async def fetch_many(self, job_ids: list[str]) -> list[dict]: ...
+    async def update(self, job_id: str, fields: dict) -> bool: ...
+    async def evict(self, before: datetime) -> int: ...
+    async def fetch_unfinished(self, before: datetime) -> list[dict]: ...
+
+
+class DatabaseJobStore:
+    """Jobs in the ``agent_jobs`` table of the application database."""
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self.session_factory = session_factory
+
+    @staticmethod
+    def _to_dict(row: AgentJob) -> dict:
+        return {
+            "job_id": row.id,
+            **{f: getattr(row, f) for f in JOB_FIELDS},
+            "created_at": row.created_at.isoformat(),
+            "completed_at": row.completed_at.isoformat() if row.completed_at else None,
+        }
+
+    async def insert(self, job: dict) -> None:
+        async with self.session_factory() as db:
+            db.add(AgentJob(
+                id=job["job_id"],
+                **{f: job[f] for f in JOB_FIELDS if f not in ("created_at", "completed_at")},
+                created_at=datetime.fromisoformat(job["created_at"]),
+            ))
+            await db.commit()
+
+    async def fetch(self, job_id: str) -> dict | None:
+        async with self.session_factory() as db:
+            result = await db.execute(select(AgentJob).where(AgentJob.id == job_id))
+            row = result.scalar_one_or_none()
+            return self._to_dict(row) if row else None
+
+    async def fetch_many(self, job_ids: list[str]) -> list[dict]:
+        async with self.session_factory() as db:
+            result = await db.execute(select(AgentJob).where(AgentJob.id.in_(job_ids)))
+            return [self._to_dict(row) for row in result.scalars().all()]
+
+    async def update(self, job_id: str, fields: dict) -> bool:
+        values = dict(fields)
+        if values.get("completed_at"):
+            values["completed_at"] = datetime.fromisoformat(values["completed_at"])
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(AgentJob)
+                .where(AgentJob.id == job_id, AgentJob.status.not_in(TERMINAL_STATUSES))
+                .values(**values)
+            )
+            await db.commit()
+            return result.rowcount > 0
+
+    async def evict(self, before: datetime) -> int:
+        async with self.session_factory() as db:
+            result = await db.execute(delete(AgentJob).where(AgentJob.created_at < before))
+            await db.commit()
+            return result.rowcount
+
+    async def fetch_unfinished(self, before: datetime) -> list[dict]:
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(AgentJob).where(
+                    AgentJob.created_at < before, AgentJob.status.not_in(TERMINAL_STATUSES)
+                )
+            )
+            return [self._to_dict(row) for row in result.scalars().all()]
+
+
+class SQLiteJobStore:
+    """
+    Jobs in a local SQLite file.  Every call opens its own connection in a
+    worker thread, so several processes on one host can share the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        if not self._ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS agent_jobs ("
+                " id TEXT PRIMARY KEY, agent TEXT NOT NULL, proposal_id TEXT,"
+                " status TEXT NOT NULL, params TEXT NOT NULL, result TEXT, error TEXT,"
+                " created_at TEXT NOT NULL, completed_at TEXT)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_agent_jobs_created_at ON agent_jobs (created_at)")
+            self._ready = True
+        return conn
+
+    def _execute(self, sql: str, args: tuple = ()) -> tuple[int, list[sqlite3.Row]]:
+        conn = self._connect()
+        try:
+            with conn:
+                cursor = conn.execute(sql, args)
+                return cursor.rowcount, cursor.fetchall()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _encode(field: str, value: Any) -> Any:
+        return json.dumps(value) if field in ("params", "result") and value is not None else value
+
+    async def insert(self, job: dict) -> None:
+        columns = ("id", *JOB_FIELDS)
+        values = (job["job_id"], *(self._encode(f, job[f]) for f in JOB_FIELDS))
+        await asyncio.to_thread(
+            self._execute,
+            f"INSERT INTO agent_jobs ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            values,
+        )
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> dict:
+        job = {"job_id": row["id"], **{f: row[f] for f in JOB_FIELDS}}
+        job["params"] = json.loads(job["params"])
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        return job
+
+    async def fetch(self, job_id: str) -> dict | None:
+        jobs = await self.fetch_many([job_id])
+        return jobs[0] if jobs else None
+
+    async def fetch_many(self, job_ids: list[str]) -> list[dict]:
+        _, rows = await asyncio.to_thread(
+            self._execute,
+            f"SELECT * FROM agent_jobs WHERE id IN ({', '.join('?' * len(job_ids))})",
+            tuple(job_ids),
+        )
+        return [self._to_dict(row) for row in rows]
+
+    async def update(self, job_id: str, fields: dict) -> bool:
+        statuses = sorted(TERMINAL_STATUSES)
+        assignments = ", ".join(f"{f} = ?" for f in fields)
+        args = (*(self._encode(f, v) for f, v in fields.items()), job_id, *statuses)
+        updated, _ = await asyncio.to_thread(
+            self._execute,
+            f"UPDATE agent_jobs SET {assignments} WHERE id = ? AND status NOT IN ({', '.join('?' * len(statuses))})",
+            args,
+        )
+        return updated > 0
+
+    async def evict(self, before: datetime) -> int:
+        deleted, _ = await asyncio.to_thread(
+            self._execute, "DELETE FROM agent_jobs WHERE created_at < ?", (before.isoformat(),)
+        )
+        return deleted
+
+    async def fetch_unfinished(self, before: datetime) -> list[dict]:
+        statuses = sorted(TERMINAL_STATUSES)
+        _, rows = await asyncio.to_thread(
+            self._execute,
+            f"SELECT * FROM agent_jobs WHERE created_at < ? AND status NOT IN ({', '.join('?' * len(statuses))})",
+            (before.isoformat(), *statuses),
+        )
+        return [self._to_dict(row) for row in rows]
+
+
+class JobStore:
+    def __init__(self, backend: JobBackend, ttl: float, finished_cache_size: int = 4096):
+        self.backend = backend
+        self.ttl = ttl
+        self.finished = TTLCache(maxsize=finished_cache_size, ttl=ttl)
+        self._last_evicted = 0.0
+
+    def use_backend(self, backend: JobBackend) -> None:
+        self.backend = backend
+        self.finished.clear()
+
+    def _expired(self, job: dict) -> bool:
+        return datetime.fromisoformat(job["created_at"]) < _now() - timedelta(seconds=self.ttl)
+
+    async def create(
+        self, agent: str, proposal_id: str | None, params: dict | None = None, result: list | None = None
+    ) -> dict:
+        """New pending job, or an already complete one when ``result`` is given (cache hit)."""
+        job = {
+            "job_id": new_job_id(agent),
+            "agent": agent,
+            "proposal_id": proposal_id,
+            "status": "pending",
+            "params": params or {},
+            "result": None,
+            "error": None,
+            "created_at": _now().isoformat(),
+            "completed_at": None,
+        }
+        if result is not None:
+            job.update(status="complete", result=result, completed_at=job["created_at"])
+        await self.backend.insert(job)
+        self._remember(job)
+        if time.monotonic() - self._last_evicted > EVICT_INTERVAL:
+            await self.evict_expired()
+        return job
+
+    def _remember(self, job: dict) -> None:
+        if job["status"] in TERMINAL_STATUSES:
+            self.finished.set(job["job_id"], job)
+
+    async def get(self, job_id: str) -> dict | None:
+        jobs = await self.get_many([job_id])
+        return jobs.get(job_id)
+
+    async def get_many(self, job_ids: list[str]) -> dict[str, dict]:
+        """Jobs by id; unknown, malformed and expired ids are simply absent."""
+        found: dict[str, dict] = {}
+        missing = []
+        for job_id in dict.fromkeys(job_ids):
+            if job_agent(job_id) is None:
+                continue
+            job = self.finished.get(job_id)
+            if job is not None:
+                found[job_id] = job
+            else:
+                missing.append(job_id)
+        if missing:
+            for job in await self.backend.fetch_many(missing):
+                if not self._expired(job):
+                    self._remember(job)
+                    found[job["job_id"]] = job
+        return found
+
+    async def update(self, job_id: str, **fields) -> bool:
+        """Apply ``fields`` to an unfinished job.  False if it was already finished (or gone)."""
+        return await self.backend.update(job_id, fields)
+
+    async def evict_expired(self) -> int:
+        self._last_evicted = time.monotonic()
+        return await self.backend.evict(_now() - timedelta(seconds=self.ttl))
+
+    async def unfinished(self, older_than: float) -> list[dict]:
+        """Pending/running jobs created more than ``older_than`` seconds ago."""
+        return await self.backend.fetch_unfinished(_now() - timedelta(seconds=older_than))
+
+
+def _default_backend() -> JobBackend:
+    if settings.agent_job_store == "sqlite":
+        return SQLiteJobStore(settings.agent_job_store_path)
+    return DatabaseJobStore()
+
+
+job_store = JobStore(_default_backend(), ttl=settings.agent_job_ttl_seconds)
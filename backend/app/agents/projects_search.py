@@ -3,13 +3,10 @@ Projects Search Agent — mock implementation for PoC.
 
 In production this would search WSP's master project database using semantic
 search to find past projects relevant to the current proposal.
-For the PoC demo we return plausible mock data after a delay.
+For the PoC demo the request is answered by the in-process fake service
+(app.agents.fakes) with plausible mock data after a delay.
 """
-import uuid
-import time
-from datetime import datetime, timezone
-
-_jobs: dict[str, dict] = {}
+from app.agents.http import Emit, stream_items
 
 MOCK_RESULTS = [
     {
@@ -45,32 +42,6 @@ MOCK_RESULTS = [
 ]
 
 
-def create_job(proposal_id: str) -> str:
-    job_id = str(uuid.uuid4())
-    _jobs[job_id] = {
-        "job_id": job_id,
-        "proposal_id": proposal_id,
-        "status": "pending",
-        "result": None,
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "completed_at": None,
-    }
-    return job_id
-
-
-def get_job(job_id: str) -> dict | None:
-    return _jobs.get(job_id)
-
-
-def run_job(job_id: str) -> None:
-    """Synchronous mock — simulates 2s database search delay."""
-    job = _jobs.get(job_id)
-    if not job:
-        return
-
-    job["status"] = "running"
-    time.sleep(2)
-
-    job["status"] = "complete"
-    job["result"] = MOCK_RESULTS
-    job["completed_at"] = datetime.now(timezone.utc).isoformat()
+async def run_job(proposal_id: str, params: dict, emit: Emit | None = None) -> list:
+    """Search the master project database for relevant past projects, emitting each project as it arrives."""
+    return await stream_items("POST", "/projects/search", emit, json={"proposal_id": proposal_id})
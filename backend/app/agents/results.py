@@ -0,0 +1,124 @@
+"""
+Agent result cache and single-flight coalescing.
+
+Agents that take only a ``proposal_id`` return the same result until the
+proposal's inputs change, so their results are cached under a content address:
+a hash of the agent type, params and an input fingerprint (row counts and
+latest ``updated_at`` of the proposal, its scope sections and WBS items).  Any
+edit to those inputs changes the fingerprint, so stale entries are never read
+and simply age out of the LRU.
+
+While a job for a key is being created, pending or running, identical requests
+are handed that job's id instead of starting another one — several
+collaborators clicking "Fetch drawings" at once share one run.  Both maps are
+per process.
+"""
+import asyncio
+import hashlib
+import json
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import TTLCache
+from app.config import settings
+from app.models.proposal import Proposal
+from app.models.scope import ScopeSection
+from app.models.wbs import WBSItem
+
+# Agents whose result depends only on the proposal's inputs (and their params)
+CACHEABLE_AGENTS = frozenset({
+    "rfp_extractor",
+    "relevant_projects_fetcher",
+    "deliverables_fetcher",
+    "drawings_fetcher",
+    "projects_search",
+})
+
+
+async def input_fingerprint(db: AsyncSession, proposal_id: str) -> list[str]:
+    """Cheap summary of the proposal's agent inputs; changes whenever they are edited."""
+    try:
+        pid = UUID(proposal_id)
+    except ValueError:
+        return []
+    stmt = select(
+        select(Proposal.updated_at).where(Proposal.id == pid).scalar_subquery(),
+        select(func.count(ScopeSection.id)).where(ScopeSection.proposal_id == pid).scalar_subquery(),
+        select(func.max(ScopeSection.updated_at)).where(ScopeSection.proposal_id == pid).scalar_subquery(),
+        select(func.count(WBSItem.id)).where(WBSItem.proposal_id == pid).scalar_subquery(),
+        select(func.max(WBSItem.updated_at)).where(WBSItem.proposal_id == pid).scalar_subquery(),
+    )
+    row = (await db.execute(stmt)).one()
+    return [str(v) for v in row]
+
+
+def result_key(agent: str, proposal_id: str, params: dict | None, fingerprint: list[str]) -> str:
+    payload = json.dumps([agent, proposal_id, params or {}, fingerprint], sort_keys=True, default=str)
+    return f"{agent}:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+
+class AgentResults:
+    def __init__(self, maxsize: int, ttl: float):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        # key -> future of the id of the job computing it
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def key_for(self, db: AsyncSession, agent: str, proposal_id: str, params: dict | None) -> str | None:
+        """Cache key for this request, or None if the agent isn't cacheable."""
+        if agent not in CACHEABLE_AGENTS:
+            return None
+        return result_key(agent, proposal_id, params, await input_fingerprint(db, proposal_id))
+
+    def cached(self, key: str) -> list | None:
+        return self.cache.get(key)
+
+    def join(self, key: str) -> asyncio.Future | None:
+        """
+        Future of the job id already computing ``key`` (the request is coalesced),
+        or None after claiming the key — the caller must then call ``started``
+        or ``abandon``.
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return future
+        self._inflight[key] = asyncio.get_running_loop().create_future()
+        return None
+
+    def started(self, key: str, job_id: str) -> None:
+        self._inflight[key].set_result(job_id)
+
+    def abandon(self, key: str, exc: BaseException) -> None:
+        """The claimant failed to start a job; coalesced waiters see its error."""
+        future = self._inflight.pop(key, None)
+        if future is None or future.done():
+            return
+        if isinstance(exc, Exception):
+            future.set_exception(exc)
+            future.exception()  # retrieved: waiters re-raise it, nobody else should log it
+        else:
+            future.cancel()
+
+    def finished(self, key: str, job_id: str, result: list | None = None) -> None:
+        """Release the key; a successful result is cached for later requests."""
+        future = self._inflight.get(key)
+        if future is not None and future.done() and future.result() == job_id:
+            del self._inflight[key]
+        if result is not None:
+            self.cache.set(key, result)
+
+    def clear(self) -> None:
+        self.cache.clear()
+        self._inflight.clear()
+
+    def stats(self) -> dict:
+        return {**self.cache.stats(), "inflight": len(self._inflight), "coalesced": self.coalesced}
+
+
+agent_results = AgentResults(
+    maxsize=settings.agent_result_cache_max_entries,
+    ttl=settings.agent_result_cache_ttl_seconds,
+)
@@ -3,16 +3,13 @@ RFP Extractor Agent — mock implementation for PoC.
 
 In production this would call an LLM agent to parse the uploaded RFP document
 and extract scope sections, requirements, deliverables, etc.
-For the PoC demo we return plausible mock data matching the Highway 401 project.
+For the PoC demo the in-process fake service (app.agents.fakes) answers with
+plausible mock data matching the Highway 401 project.
 
 The agent pattern (async job with polling) is preserved exactly as it would be
 in the real implementation so the contract is production-ready.
 """
-import uuid
-import time
-from datetime import datetime, timezone
-
-_jobs: dict[str, dict] = {}
+from app.agents.http import Emit, stream_items
 
 MOCK_SCOPE_SECTIONS = [
     {
@@ -65,32 +62,6 @@ MOCK_SCOPE_SECTIONS = [
 ]
 
 
-def create_job(proposal_id: str) -> str:
-    job_id = str(uuid.uuid4())
-    _jobs[job_id] = {
-        "job_id": job_id,
-        "proposal_id": proposal_id,
-        "status": "pending",
-        "result": None,
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "completed_at": None,
-    }
-    return job_id
-
-
-def get_job(job_id: str) -> dict | None:
-    return _jobs.get(job_id)
-
-
-def run_job(job_id: str) -> None:
-    """Synchronous mock — simulates 2s LLM processing delay."""
-    job = _jobs.get(job_id)
-    if not job:
-        return
-
-    job["status"] = "running"
-    time.sleep(2)  # Simulate LLM processing
-
-    job["status"] = "complete"
-    job["result"] = MOCK_SCOPE_SECTIONS
-    job["completed_at"] = datetime.now(timezone.utc).isoformat()
+async def run_job(proposal_id: str, params: dict, emit: Emit | None = None) -> list:
+    """Ask the RFP service to extract scope sections from the uploaded RFP, emitting each section as it arrives."""
+    return await stream_items("POST", "/rfp/extract", emit, json={"proposal_id": proposal_id})
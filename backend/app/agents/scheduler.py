@@ -0,0 +1,347 @@
+"""
+Agent scheduler.
+
+Agent runs are coroutines making HTTP calls through the shared client in
+app.agents.http, so they run directly on the event loop, each bounded by its
+type's timeout (``agent_timeouts``, else ``agent_job_timeout_seconds``) and
+cancellable via ``scheduler.cancel``.
+Each agent type has a concurrency cap; jobs beyond it wait in a per-type
+priority queue ordered by the proposal's submission deadline (soonest first,
+then FIFO).  Waiting jobs across all types are bounded by ``max_queue`` —
+``submit`` raises ``QueueFull`` past that and the route answers 429.
+
+Jobs started with a ``result_key`` (see app.agents.results) release it when
+they finish, caching a successful result for identical later requests.
+
+Status changes are pushed into the proposal's websocket room as
+``job_progress`` / ``job_complete`` messages so clients don't have to poll.
+Items an agent emits while running are pushed straight away as ``job_partial``
+messages (``offset`` + ``items``) and saved as the job's partial ``result``
+at most every ``PARTIAL_FLUSH_SECONDS``.
+
+A job cancelled through another worker is only marked cancelled in the store;
+the worker running it notices when a partial-result write is refused, or when
+it re-reads the job every ``agent_cancel_check_seconds``, and cancels its run.
+
+``run_reaper`` periodically marks jobs that stayed unfinished for longer than
+``agent_job_stale_seconds`` without belonging to this process (their worker
+died) as errors, and evicts jobs past their retention.  ``outcomes`` counts how
+jobs ended.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import date, datetime, timezone
+from typing import Awaitable, Callable
+
+from app.agents import cv_fetcher, rfp_extractor, relevant_projects_fetcher, deliverables_fetcher, drawings_fetcher, projects_search
+from app.agents.jobs import TERMINAL_STATUSES, job_store
+from app.agents.results import agent_results
+from app.config import settings
+from app.websockets.manager import manager
+
+# Agent type stored on each job -> module exposing async run_job(proposal_id, params, emit) -> list
+AGENTS = {
+    "cv_fetcher": cv_fetcher,
+    "rfp_extractor": rfp_extractor,
+    "relevant_projects_fetcher": relevant_projects_fetcher,
+    "deliverables_fetcher": deliverables_fetcher,
+    "drawings_fetcher": drawings_fetcher,
+    "projects_search": projects_search,
+}
+
+logger = logging.getLogger(__name__)
+
+# complete / error / timeout / cancelled / abandoned, for /api/metrics/
+outcomes: Counter = Counter()
+
+# Minimum seconds between job-store writes of a running job's partial result
+PARTIAL_FLUSH_SECONDS = 0.5
+
+
+class QueueFull(Exception):
+    pass
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def job_timeout(agent: str) -> float:
+    return settings.agent_timeouts.get(agent, settings.agent_job_timeout_seconds)
+
+
+async def publish_job_event(job: dict, event: str, **fields) -> None:
+    """Push a job status change to everyone viewing the job's proposal."""
+    if job.get("proposal_id"):
+        await manager.broadcast(
+            job["proposal_id"],
+            {"type": event, "job_id": job["job_id"], "agent": job["agent"], **fields},
+        )
+
+
+async def _finish(job: dict, **fields) -> bool:
+    """Record the job's final state; False if it had already finished (e.g. cancelled)."""
+    fields["completed_at"] = _now_iso()
+    if job.get("result_key"):
+        agent_results.finished(job["result_key"], job["job_id"], fields.get("result"))
+    if not await job_store.update(job["job_id"], **fields):
+        return False
+    await publish_job_event(job, "job_complete", **{"result": None, "error": None, **fields})
+    return True
+
+
+class _PartialResult:
+    """Items a running job has emitted so far."""
+
+    def __init__(self, job: dict, task: asyncio.Task):
+        self.job = job
+        # The job's run, cancelled if the store says the job already finished
+        self.task = task
+        self.items: list = []
+        self._flushed = 0.0
+
+    async def emit(self, items: list) -> None:
+        offset = len(self.items)
+        self.items.extend(items)
+        await publish_job_event(self.job, "job_partial", status="running", offset=offset, items=items)
+        now = time.monotonic()
+        if now - self._flushed >= PARTIAL_FLUSH_SECONDS:
+            self._flushed = now
+            if not await job_store.update(self.job["job_id"], result=list(self.items)):
+                self.task.cancel()
+
+
+async def _watch_cancel(job: dict, task: asyncio.Task) -> None:
+    """Cancel ``task`` once the stored job has finished (cancelled through another worker)."""
+    while True:
+        await asyncio.sleep(settings.agent_cancel_check_seconds)
+        stored = await job_store.get(job["job_id"])
+        if stored is None or stored["status"] in TERMINAL_STATUSES:
+            task.cancel()
+            return
+
+
+async def execute_job(job: dict) -> None:
+    """Run one job under the agent timeout, recording its progress in the job store."""
+    await job_store.update(job["job_id"], status="running")
+    await publish_job_event(job, "job_progress", status="running")
+    timeout = job_timeout(job["agent"])
+    task = asyncio.current_task()
+    partial = _PartialResult(job, task)
+    watcher = asyncio.create_task(_watch_cancel(job, task))
+    try:
+        try:
+            result = await asyncio.wait_for(
+                AGENTS[job["agent"]].run_job(job.get("proposal_id"), job.get("params") or {}, partial.emit),
+                timeout,
+            )
+        finally:
+            # Before recording: the watcher would take our own final status for a cancel
+            watcher.cancel()
+    except asyncio.TimeoutError:
+        await _record(job, "timeout", status="error", error=f"Timed out after {timeout:g}s")
+        return
+    except asyncio.CancelledError:
+        await _record(job, "cancelled", status="error", error="Cancelled")
+        raise
+    except Exception as exc:
+        await _record(job, "error", status="error", error=str(exc))
+        return
+    await _record(job, "complete", status="complete", result=result)
+
+
+async def _record(job: dict, outcome: str, **fields) -> None:
+    if await _finish(job, **fields):
+        outcomes[outcome] += 1
+
+
+async def drop_job(job: dict) -> None:
+    """Record a job that was removed from the queue before it ever ran."""
+    await _record(job, "cancelled", status="error", error="Cancelled")
+
+
+class _Timing:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def stats(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class AgentScheduler:
+    def __init__(
+        self,
+        execute: Callable[[dict], Awaitable[None]],
+        caps: dict[str, int],
+        default_cap: int,
+        max_queue: int,
+        drop: Callable[[dict], Awaitable[None]] | None = None,
+    ):
+        self.execute = execute
+        self.drop = drop
+        self.caps = caps
+        self.default_cap = default_cap
+        self.max_queue = max_queue
+        self._queues: dict[str, list] = defaultdict(list)
+        self._running: dict[str, int] = defaultdict(int)
+        self._seq = itertools.count()
+        self._tasks: dict[str, asyncio.Task] = {}
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.queue_wait = _Timing()
+        self.run_time = _Timing()
+
+    def cap(self, agent: str) -> int:
+        return self.caps.get(agent, self.default_cap)
+
+    def queued(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    def accepting(self, agent: str) -> bool:
+        return self._running[agent] < self.cap(agent) or self.queued() < self.max_queue
+
+    def submit(self, job: dict, deadline: date | None = None) -> None:
+        """Start ``job`` now if its type has a free slot, otherwise queue it by deadline."""
+        agent = job["agent"]
+        enqueued_at = time.monotonic()
+        if self._running[agent] < self.cap(agent):
+            self.submitted += 1
+            self._start(job, enqueued_at)
+            return
+        if self.queued() >= self.max_queue:
+            self.rejected += 1
+            raise QueueFull(f"{self.queued()} agent jobs already waiting")
+        self.submitted += 1
+        priority = deadline.toordinal() if deadline else sys.maxsize
+        heapq.heappush(self._queues[agent], (priority, next(self._seq), enqueued_at, job))
+
+    def _start(self, job: dict, enqueued_at: float) -> None:
+        self._running[job["agent"]] += 1
+        self.queue_wait.add(time.monotonic() - enqueued_at)
+        job_id = job["job_id"]
+        task = asyncio.create_task(self._run(job))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+
+    async def _run(self, job: dict) -> None:
+        agent = job["agent"]
+        started = time.monotonic()
+        try:
+            await self.execute(job)
+        finally:
+            self.run_time.add(time.monotonic() - started)
+            self.completed += 1
+            self._running[agent] -= 1
+            queue = self._queues[agent]
+            if queue:
+                _, _, enqueued_at, next_job = heapq.heappop(queue)
+                self._start(next_job, enqueued_at)
+
+    def owns(self, job_id: str) -> bool:
+        """Whether the job is running or waiting in this scheduler."""
+        return job_id in self._tasks or any(
+            entry[3]["job_id"] == job_id for queue in self._queues.values() for entry in queue
+        )
+
+    def cancel(self, job_id: str) -> bool:
+        """Drop a waiting job or cancel a running one.  False if the job isn't here."""
+        task = self._tasks.get(job_id)
+        if task is not None:
+            task.cancel()
+            return True
+        for queue in self._queues.values():
+            for i, entry in enumerate(queue):
+                if entry[3]["job_id"] == job_id:
+                    queue.pop(i)
+                    heapq.heapify(queue)
+                    self._dropped(entry[3])
+                    return True
+        return False
+
+    async def shutdown(self) -> None:
+        """Cancel everything still running or waiting (process exit)."""
+        for queue in self._queues.values():
+            while queue:
+                self._dropped(heapq.heappop(queue)[3])
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _dropped(self, job: dict) -> None:
+        if self.drop is not None:
+            task = asyncio.create_task(self.drop(job))
+            self._tasks[job["job_id"]] = task
+            task.add_done_callback(lambda _: self._tasks.pop(job["job_id"], None))
+
+    def stats(self) -> dict:
+        agents = sorted(set(self._queues) | set(self._running))
+        return {
+            "max_queue": self.max_queue,
+            "queued": self.queued(),
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "queue_wait": self.queue_wait.stats(),
+            "run_time": self.run_time.stats(),
+            "by_agent": {
+                a: {"cap": self.cap(a), "running": self._running[a], "queued": len(self._queues[a])}
+                for a in agents
+            },
+        }
+
+
+scheduler = AgentScheduler(
+    execute_job,
+    caps=settings.agent_concurrency,
+    default_cap=settings.agent_default_concurrency,
+    max_queue=settings.agent_max_queue,
+    drop=drop_job,
+)
+
+
+async def cancel_job(job: dict) -> None:
+    """
+    Cancel a pending or running job.  One held by another worker is marked
+    cancelled in the store directly; that worker then cancels its run (see
+    ``_watch_cancel``), and a result it still produces is ignored.
+    """
+    if not scheduler.cancel(job["job_id"]):
+        await _record(job, "cancelled", status="error", error="Cancelled")
+
+
+async def reap_jobs() -> dict:
+    """Fail jobs abandoned by a dead worker and evict expired ones."""
+    abandoned = 0
+    for job in await job_store.unfinished(settings.agent_job_stale_seconds):
+        if scheduler.owns(job["job_id"]):
+            continue
+        await _record(job, "abandoned", status="error", error="Abandoned: the worker running this job stopped")
+        abandoned += 1
+    return {"abandoned": abandoned, "evicted": await job_store.evict_expired()}
+
+
+async def run_reaper(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await reap_jobs()
+        except Exception:
+            logger.exception("Agent job reaper failed")
@@ -0,0 +1,53 @@
+"""
+Per-process caches in front of token decoding and the ``users`` lookup.
+
+Every authenticated request decodes its bearer token and loads the user it
+names.  Both results are cached briefly: decoded payloads by token string (never
+past the token's own ``exp``) and user rows by ``sub``.  User entries are
+dropped whenever a User is updated or deleted through the ORM; other workers
+pick up changes when their short TTL lapses.
+"""
+import time
+import uuid
+
+from sqlalchemy import event, inspect
+
+from app.cache import TTLCache
+from app.config import settings
+from app.models.user import User
+
+token_cache = TTLCache(maxsize=settings.auth_token_cache_max_entries, ttl=settings.auth_cache_ttl_seconds)
+user_cache = TTLCache(maxsize=settings.auth_user_cache_max_entries, ttl=settings.auth_cache_ttl_seconds)
+
+
+def cache_payload(token: str, payload: dict) -> None:
+    ttl = settings.auth_cache_ttl_seconds
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        ttl = min(ttl, exp - time.time())
+    if ttl > 0:
+        token_cache.set(token, payload, ttl=ttl)
+
+
+def cache_user(user: User) -> None:
+    user_cache.set(str(user.id), {c.key: getattr(user, c.key) for c in inspect(User).column_attrs})
+
+
+def cached_user(user_id: str) -> User | None:
+    """A fresh transient User built from the cached row, so requests never share an instance."""
+    data = user_cache.get(user_id)
+    return User(**data) if data else None
+
+
+def invalidate_user(user_id: uuid.UUID | str) -> None:
+    user_cache.delete(str(user_id))
+
+
+def stats() -> dict:
+    return {"tokens": token_cache.stats(), "users": user_cache.stats()}
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_change(mapper, connection, target: User) -> None:
+    invalidate_user(target.id)
@@ -3,6 +3,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from app.auth.cache import cache_payload, cache_user, cached_user, token_cache
 from app.auth.jwt import decode_token
 from app.db.session import get_db
 from app.models.user import User
@@ -14,16 +15,24 @@ async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(bearer),
     db: AsyncSession = Depends(get_db),
 ) -> User:
-    try:
-        payload = decode_token(credentials.credentials)
-        user_id: str = payload.get("sub")
-        if not user_id:
+    token = credentials.credentials
+    payload = token_cache.get(token)
+    if payload is None:
+        try:
+            payload = decode_token(token)
+        except JWTError:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
-    except JWTError:
+        cache_payload(token, payload)
+    user_id: str = payload.get("sub")
+    if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
 
+    user = cached_user(user_id)
+    if user:
+        return user
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+    cache_user(user)
     return user
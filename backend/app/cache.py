@@ -0,0 +1,77 @@
+"""
+In-process caching primitives.
+
+``TTLCache`` is a size-bounded LRU whose entries also expire after a TTL.  It
+is the default backend wherever the app caches something; anything exposing
+the same ``get`` / ``set`` / ``delete`` / ``clear`` methods (``CacheBackend``)
+can be swapped in, e.g. a Redis-backed implementation shared by all workers.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Protocol
+
+_MISSING = object()
+
+
+class CacheBackend(Protocol):
+    def get(self, key: Hashable, default: Any = None) -> Any: ...
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None: ...
+    def delete(self, key: Hashable) -> None: ...
+    def clear(self) -> None: ...
+
+
+class TTLCache:
+    """
+    LRU cache bounded by ``maxsize`` entries, each expiring ``ttl`` seconds after it was set.
+
+    Not thread-safe: every user runs on the event loop and no method awaits.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -6,6 +6,65 @@ class Settings(BaseSettings):
     secret_key: str = "dev-secret-key-change-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 480
+    # Per-worker connection pool (see app.db.session)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
+    # Prepared-statement caches per connection (SQLAlchemy's adapter and asyncpg's);
+    # 0 disables both (e.g. behind pgbouncer in transaction mode)
+    db_statement_cache_size: int = 100
+    # Per-process by default: also how long other workers may serve a dashboard after a write
+    dashboard_cache_ttl_seconds: float = 30.0
+    dashboard_cache_max_entries: int = 1024
+    auth_cache_ttl_seconds: float = 30.0
+    # Agent job store: "database" (agent_jobs table) or "sqlite" (local file)
+    agent_job_store: str = "database"
+    agent_job_store_path: str = "agent_jobs.sqlite3"
+    agent_job_ttl_seconds: float = 86400.0
+    # Agent scheduler: per-type caps, waiting-job bound, per-job timeout
+    agent_default_concurrency: int = 2
+    agent_concurrency: dict[str, int] = {}
+    agent_max_queue: int = 50
+    agent_job_timeout_seconds: float = 120.0
+    agent_timeouts: dict[str, float] = {}
+    # Reaper: unfinished jobs older than this were lost by a dead worker
+    agent_reaper_interval_seconds: float = 60.0
+    agent_job_stale_seconds: float = 3600.0
+    # Running jobs re-read their status this often to notice cancels from other workers
+    agent_cancel_check_seconds: float = 2.0
+    # CV lookups: parallel per-name calls with timeout/retry, name -> CV cache
+    agent_cv_concurrency: int = 8
+    agent_cv_call_timeout_seconds: float = 10.0
+    agent_cv_retries: int = 2
+    agent_cv_cache_ttl_seconds: float = 3600.0
+    agent_cv_cache_max_entries: int = 2048
+    # Cached results of proposal-only agents, keyed by an input fingerprint
+    agent_result_cache_ttl_seconds: float = 600.0
+    agent_result_cache_max_entries: int = 512
+    # Agent HTTP client; no base URL = in-process fakes (app.agents.fakes)
+    agent_api_base_url: str = ""
+    agent_http_timeout_seconds: float = 30.0
+    agent_http_connect_timeout_seconds: float = 5.0
+    agent_http_max_connections: int = 100
+    agent_http_max_keepalive: int = 20
+    agent_fake_latency_seconds: float = 2.0
+    auth_user_cache_max_entries: int = 1024
+    auth_token_cache_max_entries: int = 4096
+    # WebSocket fan-out: per-connection send queue; full queue or slow send = eviction
+    ws_send_queue_size: int = 256
+    ws_send_timeout_seconds: float = 5.0
+    # Presence changes in a room are collected this long and sent as one diff
+    ws_presence_debounce_seconds: float = 0.1
+    # Client edits in a room are batched this long; latest value per field wins
+    ws_edit_batch_seconds: float = 0.05
+    # Cross-worker rooms: "memory" (single worker) or "postgres" (LISTEN/NOTIFY)
+    ws_broadcast_backend: str = "memory"
+    ws_broadcast_channel: str = "proposal_ws"
+    # Workers announce themselves this often; members of one silent for the timeout are dropped
+    ws_heartbeat_seconds: float = 5.0
+    ws_peer_timeout_seconds: float = 20.0
 
     class Config:
         env_file = ".env"
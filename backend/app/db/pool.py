@@ -0,0 +1,104 @@
+"""
+Connection-pool instrumentation.
+
+``InstrumentedPool`` times every checkout (queue wait, new connections and
+pre-ping included) and attributes it to the endpoint in ``current_endpoint``,
+which the HTTP middleware in app.main sets per request.  ``pool_metrics`` keeps
+per-endpoint counters for checkouts, wait time, connections in use at checkout,
+overflow connections opened and checkout timeouts.
+"""
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+# Label for whatever is using the pool right now; "-" outside requests (startup, agents)
+current_endpoint: ContextVar[str] = ContextVar("current_endpoint", default="-")
+
+
+class PoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: dict[str, dict] = {}
+
+    def _entry(self, endpoint: str) -> dict:
+        return self._endpoints.setdefault(endpoint, {
+            "checkouts": 0,
+            "wait_ms_total": 0.0,
+            "wait_ms_max": 0.0,
+            "in_use_max": 0,
+            "overflows": 0,
+            "timeouts": 0,
+        })
+
+    def record_checkout(self, endpoint: str, wait: float, in_use: int) -> None:
+        wait_ms = wait * 1000
+        with self._lock:
+            e = self._entry(endpoint)
+            e["checkouts"] += 1
+            e["wait_ms_total"] += wait_ms
+            e["wait_ms_max"] = max(e["wait_ms_max"], wait_ms)
+            e["in_use_max"] = max(e["in_use_max"], in_use)
+
+    def record_overflow(self, endpoint: str) -> None:
+        with self._lock:
+            self._entry(endpoint)["overflows"] += 1
+
+    def record_timeout(self, endpoint: str) -> None:
+        with self._lock:
+            self._entry(endpoint)["timeouts"] += 1
+
+    def snapshot(self, pool: Pool | None = None) -> dict:
+        with self._lock:
+            endpoints = {
+                name: {
+                    **e,
+                    "wait_ms_total": round(e["wait_ms_total"], 3),
+                    "wait_ms_max": round(e["wait_ms_max"], 3),
+                    "wait_ms_avg": round(e["wait_ms_total"] / e["checkouts"], 3) if e["checkouts"] else 0.0,
+                }
+                for name, e in sorted(self._endpoints.items())
+            }
+        out = {"endpoints": endpoints}
+        if pool is not None and hasattr(pool, "checkedout"):
+            out["pool"] = {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+            }
+        return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedPoolMixin:
+    """Records checkout timing and overflow into ``pool_metrics``; mix into a QueuePool subclass."""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            conn = super().connect()
+        except exc.TimeoutError:
+            pool_metrics.record_timeout(current_endpoint.get())
+            raise
+        pool_metrics.record_checkout(current_endpoint.get(), time.perf_counter() - start, self.checkedout())
+        return conn
+
+    def _inc_overflow(self) -> bool:
+        opened = super()._inc_overflow()
+        # _overflow counts up from -pool_size, so > 0 means past the base pool
+        if opened and self._overflow > 0:
+            pool_metrics.record_overflow(current_endpoint.get())
+        return opened
+
+
+class InstrumentedPool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
@@ -0,0 +1,79 @@
+"""
+Pricing aggregation pushed down into Postgres.
+
+``hours_by_phase`` is a JSONB object of phase -> hours.  On Postgres we expand it
+with a LATERAL ``jsonb_each_text`` and GROUP BY (wbs_id, team, phase), so building
+the financial summary reads a handful of aggregate rows instead of hydrating
+every ``PricingRow``.  Other dialects (SQLite in tests, mock sessions) fall back
+to summing in Python.
+"""
+import uuid
+from typing import NamedTuple
+
+from sqlalchemy import select, func, cast, Numeric, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.pricing import PricingRow
+from app.models.people import ProposedPerson
+
+
+def is_postgres(db: AsyncSession) -> bool:
+    dialect = getattr(getattr(db, "bind", None), "dialect", None)
+    return getattr(dialect, "name", None) == "postgresql"
+
+
+class BreakdownRow(NamedTuple):
+    wbs_id: uuid.UUID | None
+    team: str | None
+    phase: str
+    hours: float
+    billing: float
+    cost: float
+    burdened: float
+
+
+def row_breakdown(row: PricingRow, person: ProposedPerson | None) -> list[BreakdownRow]:
+    """Per-phase amounts for a single pricing row, in the same shape as pricing_breakdown."""
+    rate = float(row.hourly_rate or 0)
+    cost_rate = float(row.cost_rate or 0)
+    burdened_rate = float(person.burdened_rate or 0) if person else 0.0
+    team = person.team if person else None
+    out = []
+    for phase, value in (row.hours_by_phase or {}).items():
+        h = float(value)
+        out.append(BreakdownRow(row.wbs_id, team, phase, h, h * rate, h * cost_rate, h * burdened_rate))
+    return out
+
+
+async def pricing_breakdown(proposal_id: uuid.UUID, db: AsyncSession) -> list[BreakdownRow]:
+    """Pricing amounts grouped by (wbs_id, team, phase) for one proposal."""
+    if not is_postgres(db):
+        result = await db.execute(
+            select(PricingRow, ProposedPerson)
+            .outerjoin(ProposedPerson, PricingRow.person_id == ProposedPerson.id)
+            .where(PricingRow.proposal_id == proposal_id)
+        )
+        return [b for row, person in result.all() for b in row_breakdown(row, person)]
+
+    phases = func.jsonb_each_text(PricingRow.hours_by_phase).table_valued("key", "value").lateral("phase")
+    h = cast(func.nullif(phases.c.value, ""), Numeric)
+    result = await db.execute(
+        select(
+            PricingRow.wbs_id,
+            ProposedPerson.team,
+            phases.c.key,
+            func.coalesce(func.sum(h), 0),
+            func.coalesce(func.sum(h * func.coalesce(PricingRow.hourly_rate, 0)), 0),
+            func.coalesce(func.sum(h * func.coalesce(PricingRow.cost_rate, 0)), 0),
+            func.coalesce(func.sum(h * func.coalesce(ProposedPerson.burdened_rate, 0)), 0),
+        )
+        .select_from(PricingRow)
+        .join(phases, true())
+        .outerjoin(ProposedPerson, PricingRow.person_id == ProposedPerson.id)
+        .where(PricingRow.proposal_id == proposal_id)
+        .group_by(PricingRow.wbs_id, ProposedPerson.team, phases.c.key)
+    )
+    return [
+        BreakdownRow(wbs_id, team, phase, float(hours), float(billing), float(cost), float(burdened))
+        for wbs_id, team, phase, hours, billing, cost, burdened in result.all()
+    ]
@@ -0,0 +1,65 @@
+"""
+WBS rollup tree.
+
+A WBS item's total is its own direct pricing plus the totals of its children,
+where a child is any item whose code is one segment longer (``1.2`` -> ``1.2.3``).
+If an intermediate code is missing the chain stops there.  ``WBSTree`` indexes
+codes once so each ancestor path is O(tree depth); the rolled-up per-node totals
+themselves are persisted in ``proposal_financials`` (see app.finance.summary).
+"""
+import uuid
+from typing import Iterable
+
+
+def parent_code(code: str) -> str | None:
+    parts = code.split(".")
+    return ".".join(parts[:-1]) if len(parts) > 1 else None
+
+
+class WBSTree:
+    """Code index for one proposal's WBS items, answering ancestor-path lookups."""
+
+    def __init__(self, items: Iterable):
+        self._code: dict[uuid.UUID, str] = {}
+        self._by_code: dict[str, uuid.UUID] = {}
+        self._children: dict[uuid.UUID, list[uuid.UUID]] | None = None
+        # Sort by WBS code (then id) so a duplicated code resolves to the same item every time
+        for item in sorted(items, key=lambda i: (i.wbs_code, str(i.id))):
+            self._code[item.id] = item.wbs_code
+            self._by_code[item.wbs_code] = item.id
+
+    def __contains__(self, item_id: uuid.UUID) -> bool:
+        return item_id in self._code
+
+    def ids(self) -> list[uuid.UUID]:
+        return list(self._code)
+
+    def parent(self, item_id: uuid.UUID) -> uuid.UUID | None:
+        code = self._code.get(item_id)
+        p = parent_code(code) if code else None
+        return self._by_code.get(p) if p else None
+
+    def children(self, item_id: uuid.UUID) -> list[uuid.UUID]:
+        """Ids whose parent is ``item_id``."""
+        if self._children is None:
+            self._children = {}
+            for child_id in self._code:
+                parent_id = self.parent(child_id)
+                if parent_id is not None:
+                    self._children.setdefault(parent_id, []).append(child_id)
+        return self._children.get(item_id, [])
+
+    def ancestors(self, item_id: uuid.UUID) -> list[uuid.UUID]:
+        """Ids from the item's parent up to the root of its chain."""
+        chain: list[uuid.UUID] = []
+        parent_id = self.parent(item_id)
+        while parent_id and parent_id not in chain:
+            chain.append(parent_id)
+            parent_id = self.parent(parent_id)
+        return chain
+
+    def path(self, item_id: uuid.UUID | None) -> list[uuid.UUID]:
+        """[item, parent, grandparent, ...]; empty for unknown or null ids."""
+        if item_id is None or item_id not in self._code:
+            return []
+        return [item_id, *self.ancestors(item_id)]
@@ -0,0 +1,329 @@
+"""
+Materialized per-proposal financial summary (``proposal_financials``).
+
+Buckets are keyed by (scope, key):
+
+    ("proposal", "")          whole-proposal totals, read by the dashboard
+    ("phase", <phase>)        per phase in hours_by_phase
+    ("team", <team or "">)    per ProposedPerson.team ("" = unassigned)
+    ("wbs", <wbs item id>)    rolled-up totals for a WBS node and its descendants
+
+Single pricing-row writes apply a delta to the row's buckets (its WBS node plus
+ancestor path) inside the caller's transaction.  WBS structure changes (an item
+added, removed or re-coded) re-roll only the WBS buckets from their stored
+values: a node's own pricing is its bucket minus its children's, which doesn't
+depend on the tree.  Changes that touch many rows at once (person rates/team)
+rebuild the proposal's summary from pricing_rows with set-based queries.  ``check_financials`` compares the stored
+summary with a fresh computation.
+
+Every writer (``apply_delta``, ``rebuild_financials``, ``ensure_financials``)
+first takes a transaction-scoped advisory lock on the proposal, so a rebuild
+can't interleave with a concurrent delta: the delta lands either entirely
+before the rebuild's read or after its rewrite.
+"""
+import uuid
+from decimal import Decimal
+from typing import Callable, Iterable
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.finance.aggregate import BreakdownRow, is_postgres, pricing_breakdown, row_breakdown
+from app.finance.rollup import WBSTree, parent_code
+from app.models.pricing import PricingRow
+from app.models.people import ProposedPerson
+from app.models.proposal_financial import ProposalFinancial
+from app.models.wbs import WBSItem
+
+SCOPE_PROPOSAL = "proposal"
+SCOPE_PHASE = "phase"
+SCOPE_TEAM = "team"
+SCOPE_WBS = "wbs"
+
+Bucket = tuple[str, str]
+# [hours, billing, cost, burdened]
+Amounts = list[float]
+Buckets = dict[Bucket, Amounts]
+
+# Amounts below this are treated as equal by the consistency checker
+TOLERANCE = 0.01
+
+
+def fold(groups: Iterable[BreakdownRow], wbs_path: Callable[[uuid.UUID | None], list[uuid.UUID]]) -> Buckets:
+    """Fold (wbs_id, team, phase) groups into summary buckets."""
+    buckets: Buckets = {}
+
+    def add(bucket: Bucket, g: BreakdownRow):
+        amounts = buckets.setdefault(bucket, [0.0, 0.0, 0.0, 0.0])
+        amounts[0] += g.hours
+        amounts[1] += g.billing
+        amounts[2] += g.cost
+        amounts[3] += g.burdened
+
+    for g in groups:
+        add((SCOPE_PROPOSAL, ""), g)
+        add((SCOPE_PHASE, g.phase), g)
+        add((SCOPE_TEAM, g.team or ""), g)
+        for node_id in wbs_path(g.wbs_id):
+            add((SCOPE_WBS, str(node_id)), g)
+    return buckets
+
+
+async def load_wbs_tree(db: AsyncSession, proposal_id: uuid.UUID) -> WBSTree:
+    """Ids and codes of every WBS item in the proposal, indexed for ancestor lookups."""
+    result = await db.execute(
+        select(WBSItem.id, WBSItem.wbs_code).where(WBSItem.proposal_id == proposal_id)
+    )
+    return WBSTree(result.all())
+
+
+async def compute_financials(db: AsyncSession, proposal_id: uuid.UUID) -> Buckets:
+    """Compute every bucket from scratch from pricing_rows and wbs_items."""
+    tree = await load_wbs_tree(db, proposal_id)
+    buckets = fold(await pricing_breakdown(proposal_id, db), tree.path)
+    buckets.setdefault((SCOPE_PROPOSAL, ""), [0.0, 0.0, 0.0, 0.0])
+    # Every WBS node gets a bucket so reads never have to special-case "no pricing"
+    for item_id in tree.ids():
+        buckets.setdefault((SCOPE_WBS, str(item_id)), [0.0, 0.0, 0.0, 0.0])
+    return buckets
+
+
+def lock_key(proposal_id: uuid.UUID) -> int:
+    """Advisory lock key for a proposal's summary: the first 8 bytes of its id."""
+    return int.from_bytes(proposal_id.bytes[:8], "big", signed=True)
+
+
+async def lock_financials(db: AsyncSession, proposal_id: uuid.UUID) -> None:
+    """Serialize summary writers for this proposal until the caller's transaction ends."""
+    if is_postgres(db):
+        await db.execute(select(func.pg_advisory_xact_lock(lock_key(proposal_id))))
+
+
+def _dec(value: float) -> Decimal:
+    return Decimal(str(round(value, 4)))
+
+
+async def _upsert(db: AsyncSession, proposal_id: uuid.UUID, buckets: Buckets, increment: bool) -> None:
+    if not buckets:
+        return
+    stmt = insert(ProposalFinancial).values([
+        {
+            "proposal_id": proposal_id,
+            "scope": scope,
+            "key": key,
+            "hours": _dec(a[0]),
+            "billing": _dec(a[1]),
+            "cost": _dec(a[2]),
+            "burdened": _dec(a[3]),
+        }
+        for (scope, key), a in buckets.items()
+    ])
+    table = ProposalFinancial.__table__
+    columns = ("hours", "billing", "cost", "burdened")
+    if increment:
+        set_ = {c: table.c[c] + stmt.excluded[c] for c in columns}
+    else:
+        set_ = {c: stmt.excluded[c] for c in columns}
+    await db.execute(
+        stmt.on_conflict_do_update(constraint="uq_proposal_financials_bucket", set_=set_)
+    )
+
+
+async def rebuild_financials(db: AsyncSession, proposal_id: uuid.UUID) -> Buckets:
+    """Replace the proposal's summary with a fresh computation (caller commits)."""
+    await lock_financials(db, proposal_id)
+    await db.flush()
+    buckets = await compute_financials(db, proposal_id)
+    await db.execute(delete(ProposalFinancial).where(ProposalFinancial.proposal_id == proposal_id))
+    await _upsert(db, proposal_id, buckets, increment=False)
+    return buckets
+
+
+async def ensure_financials(db: AsyncSession, proposal_id: uuid.UUID) -> bool:
+    """Build the summary if this proposal has none yet.  Returns True if it was built."""
+    stmt = select(ProposalFinancial.id).where(
+        ProposalFinancial.proposal_id == proposal_id,
+        ProposalFinancial.scope == SCOPE_PROPOSAL,
+    )
+    if (await db.execute(stmt)).scalar_one_or_none() is not None:
+        return False
+    # Re-check under the lock: a concurrent request may have just built it
+    await lock_financials(db, proposal_id)
+    if (await db.execute(stmt)).scalar_one_or_none() is not None:
+        return False
+    await rebuild_financials(db, proposal_id)
+    return True
+
+
+async def wbs_path(db: AsyncSession, proposal_id: uuid.UUID, wbs_id: uuid.UUID | None) -> list[uuid.UUID]:
+    """[wbs_id, parent, grandparent, ...] — stops at the first missing parent code."""
+    if wbs_id is None:
+        return []
+    result = await db.execute(
+        select(WBSItem.wbs_code).where(WBSItem.id == wbs_id, WBSItem.proposal_id == proposal_id)
+    )
+    code = result.scalar_one_or_none()
+    if code is None:
+        return []
+    prefixes = []
+    p = parent_code(code)
+    while p:
+        prefixes.append(p)
+        p = parent_code(p)
+    if not prefixes:
+        return [wbs_id]
+    result = await db.execute(
+        select(WBSItem.wbs_code, WBSItem.id).where(
+            WBSItem.proposal_id == proposal_id,
+            WBSItem.wbs_code.in_(prefixes),
+        )
+    )
+    by_code = {c: i for c, i in result.all()}
+    path = [wbs_id]
+    for prefix in prefixes:
+        if prefix not in by_code:
+            break
+        path.append(by_code[prefix])
+    return path
+
+
+async def row_buckets(
+    db: AsyncSession, proposal_id: uuid.UUID, row: PricingRow, person: ProposedPerson | None
+) -> Buckets:
+    """Buckets a single pricing row contributes to, in its current state."""
+    path = await wbs_path(db, proposal_id, row.wbs_id)
+    return fold(row_breakdown(row, person), lambda _: path)
+
+
+def rows_buckets(
+    rows: Iterable[tuple[PricingRow, ProposedPerson | None]], tree: WBSTree
+) -> Buckets:
+    """Buckets a set of pricing rows contribute to, resolving WBS paths from a loaded tree."""
+    return fold((b for row, person in rows for b in row_breakdown(row, person)), tree.path)
+
+
+def reroll_wbs(stored: Buckets, before: WBSTree, after: WBSTree) -> Buckets:
+    """
+    WBS buckets for the ``after`` tree, from buckets stored for the ``before``
+    tree.  Nodes new in ``after`` have no pricing of their own yet; pricing of
+    nodes gone from ``after`` no longer counts toward any WBS bucket.
+    """
+    zero = [0.0, 0.0, 0.0, 0.0]
+
+    def bucket(item_id: uuid.UUID) -> Amounts:
+        return stored.get((SCOPE_WBS, str(item_id)), zero)
+
+    own: dict[uuid.UUID, Amounts] = {}
+    for item_id in before.ids():
+        amounts = list(bucket(item_id))
+        for child_id in before.children(item_id):
+            amounts = [a - c for a, c in zip(amounts, bucket(child_id))]
+        own[item_id] = amounts
+
+    totals: Buckets = {}
+
+    def total(item_id: uuid.UUID) -> Amounts:
+        key = (SCOPE_WBS, str(item_id))
+        if key not in totals:
+            amounts = list(own.get(item_id, zero))
+            for child_id in after.children(item_id):
+                amounts = [a + c for a, c in zip(amounts, total(child_id))]
+            totals[key] = amounts
+        return totals[key]
+
+    for item_id in after.ids():
+        total(item_id)
+    return totals
+
+
+async def begin_wbs_change(db: AsyncSession, proposal_id: uuid.UUID) -> WBSTree:
+    """Lock the summary and return the WBS tree before an item is added, removed or re-coded."""
+    await lock_financials(db, proposal_id)
+    await ensure_financials(db, proposal_id)
+    return await load_wbs_tree(db, proposal_id)
+
+
+async def finish_wbs_change(db: AsyncSession, proposal_id: uuid.UUID, before: WBSTree) -> Buckets:
+    """
+    Re-roll the WBS buckets after the change (caller commits).  Only buckets
+    whose totals moved are written.  Returns every WBS bucket.
+    """
+    await db.flush()
+    after = await load_wbs_tree(db, proposal_id)
+    stored = await load_financials(db, proposal_id, scope=SCOPE_WBS)
+    buckets = reroll_wbs(stored, before, after)
+    changed = {
+        bucket: amounts for bucket, amounts in buckets.items()
+        if bucket not in stored or any(abs(a - s) > 1e-9 for a, s in zip(amounts, stored[bucket]))
+    }
+    await _upsert(db, proposal_id, changed, increment=False)
+    removed = [key for scope, key in stored if (scope, key) not in buckets]
+    if removed:
+        await db.execute(
+            delete(ProposalFinancial).where(
+                ProposalFinancial.proposal_id == proposal_id,
+                ProposalFinancial.scope == SCOPE_WBS,
+                ProposalFinancial.key.in_(removed),
+            )
+        )
+    return buckets
+
+
+def diff(before: Buckets | None, after: Buckets | None) -> Buckets:
+    """after - before, dropping buckets with no change."""
+    out: Buckets = {}
+    for bucket, amounts in (after or {}).items():
+        out[bucket] = list(amounts)
+    for bucket, amounts in (before or {}).items():
+        target = out.setdefault(bucket, [0.0, 0.0, 0.0, 0.0])
+        for i in range(4):
+            target[i] -= amounts[i]
+    return {b: a for b, a in out.items() if any(abs(v) > 1e-9 for v in a)}
+
+
+async def apply_delta(db: AsyncSession, proposal_id: uuid.UUID, delta: Buckets) -> None:
+    """Increment stored buckets by delta (caller commits)."""
+    await lock_financials(db, proposal_id)
+    await _upsert(db, proposal_id, delta, increment=True)
+
+
+async def load_financials(
+    db: AsyncSession,
+    proposal_id: uuid.UUID,
+    scope: str | None = None,
+    keys: Iterable[str] | None = None,
+) -> Buckets:
+    """Stored buckets for a proposal (optionally one scope / some keys), building them on first read."""
+    if await ensure_financials(db, proposal_id):
+        await db.commit()
+    stmt = select(
+        ProposalFinancial.scope,
+        ProposalFinancial.key,
+        ProposalFinancial.hours,
+        ProposalFinancial.billing,
+        ProposalFinancial.cost,
+        ProposalFinancial.burdened,
+    ).where(ProposalFinancial.proposal_id == proposal_id)
+    if scope is not None:
+        stmt = stmt.where(ProposalFinancial.scope == scope)
+    if keys is not None:
+        stmt = stmt.where(ProposalFinancial.key.in_(list(keys)))
+    result = await db.execute(stmt)
+    return {
+        (s, k): [float(h), float(b), float(c), float(bu)]
+        for s, k, h, b, c, bu in result.all()
+    }
+
+
+async def check_financials(db: AsyncSession, proposal_id: uuid.UUID) -> list[dict]:
+    """Buckets whose stored amounts differ from a fresh computation."""
+    stored = await load_financials(db, proposal_id)
+    expected = await compute_financials(db, proposal_id)
+    mismatches = []
+    for bucket in sorted(set(stored) | set(expected)):
+        s = stored.get(bucket, [0.0, 0.0, 0.0, 0.0])
+        e = expected.get(bucket, [0.0, 0.0, 0.0, 0.0])
+        if any(abs(a - b) > TOLERANCE for a, b in zip(s, e)):
+            mismatches.append({"scope": bucket[0], "key": bucket[1], "stored": s, "expected": e})
+    return mismatches
@@ -1,13 +1,22 @@
+import asyncio
 import json
 import os
+import re
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Query
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, Query
 from fastapi.middleware.cors import CORSMiddleware
-from app.routes import auth, proposals, wbs, pricing, people, scope, schedule, deliverables, drawings, agents, relevant_projects, dashboard, templates, disciplines, compliance, client_history, projects, lessons
+from app.routes import auth, proposals, wbs, pricing, people, scope, schedule, deliverables, drawings, agents, relevant_projects, dashboard, templates, disciplines, compliance, client_history, projects, lessons, financials, metrics
 from app.db.session import AsyncSessionLocal
 from app.db.seed import seed_users, seed_templates, seed_demo_proposal
 from app.websockets.manager import manager
+from app.websockets.encoding import available as encoding_available
+from app.websockets.pubsub import build_backend
 from app.auth.jwt import decode_token
+from app.routes.dashboard import dashboard_cache
+from app.db.pool import current_endpoint
+from app.agents.http import close_client
+from app.agents.scheduler import run_reaper, scheduler
+from app.config import settings
 
 
 @asynccontextmanager
@@ -16,7 +25,13 @@ async def lifespan(app: FastAPI):
         await seed_users(db)
         await seed_templates(db)
         await seed_demo_proposal(db)
+    await manager.start(build_backend())
+    reaper = asyncio.create_task(run_reaper(settings.agent_reaper_interval_seconds))
     yield
+    reaper.cancel()
+    await scheduler.shutdown()
+    await manager.stop()
+    await close_client()
 
 
 app = FastAPI(title="WSP Proposal Tool", version="0.1.0", lifespan=lifespan)
@@ -31,6 +46,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Any write under /api/proposals/{id} may change that proposal's dashboard
+_PROPOSAL_PATH = re.compile(r"^/api/proposals/([0-9a-fA-F-]{36})(?:/|$)")
+_WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+_ID_SEGMENT = re.compile(r"/[0-9a-fA-F-]{36}(?=/|$)")
+
+
+@app.middleware("http")
+async def label_pool_checkouts(request: Request, call_next):
+    # Path with ids collapsed, so pool metrics group by endpoint rather than by URL
+    current_endpoint.set(f"{request.method} {_ID_SEGMENT.sub('/{id}', request.url.path)}")
+    return await call_next(request)
+
+
+@app.middleware("http")
+async def invalidate_dashboard_on_write(request: Request, call_next):
+    response = await call_next(request)
+    if request.method in _WRITE_METHODS:
+        match = _PROPOSAL_PATH.match(request.url.path)
+        if match:
+            dashboard_cache.invalidate(match.group(1).lower())
+    return response
+
+
 app.include_router(auth.router)
 app.include_router(proposals.router)
 app.include_router(wbs.router)
@@ -49,6 +89,8 @@ app.include_router(client_history.router)
 app.include_router(agents.router)
 app.include_router(projects.router)
 app.include_router(lessons.router)
+app.include_router(financials.router)
+app.include_router(metrics.router)
 
 
 @app.websocket("/ws/proposals/{proposal_id}")
@@ -57,12 +99,18 @@ async def proposal_ws(
     proposal_id: str,
     token: str = Query(...),
     tab: str = Query("wbs"),
+    encoding: str = Query("json"),
 ):
     # Authenticate via token query param (browsers can't set WS headers)
     payload = decode_token(token)
     user_name = (payload.get("name") or payload.get("sub", "unknown")) if payload else "unknown"
 
-    await manager.connect(ws, proposal_id, user_name, tab)
+    # Frame encoding for this client: json, compact or msgpack (app.websockets.encoding)
+    if not encoding_available(encoding):
+        await ws.close(code=1008)
+        return
+
+    await manager.connect(ws, proposal_id, user_name, tab, encoding)
     try:
         while True:
             raw = await ws.receive_text()
@@ -70,17 +118,23 @@ async def proposal_ws(
                 msg = json.loads(raw)
             except ValueError:
                 continue
+            if not isinstance(msg, dict):
+                continue
 
             # Handle tab-change notification
             if msg.get("type") == "tab_change":
                 await manager.update_tab(ws, msg.get("tab", "wbs"))
                 continue
 
-            # Broadcast data-change to all other clients in the room
+            # Batch the data-change for all other clients in the room
+            dashboard_cache.invalidate(proposal_id.lower())
             msg["updated_by"] = user_name
-            await manager.broadcast(proposal_id, msg, exclude=ws)
+            manager.queue_edit(proposal_id, msg, sender=ws)
 
     except WebSocketDisconnect:
+        pass
+    finally:
+        # Any error: don't leave the outbox task running or a ghost in presence
         manager.disconnect(ws)
 
 
@@ -13,6 +13,8 @@ from app.models.compliance import ComplianceItem, ComplianceStatus
 from app.models.client_outreach import ClientOutreach
 from app.models.project import Project
 from app.models.lesson import Lesson
+from app.models.proposal_financial import ProposalFinancial
+from app.models.agent_job import AgentJob
 
 __all__ = [
     "User", "UserRole",
@@ -30,4 +32,6 @@ __all__ = [
     "ClientOutreach",
     "Project",
     "Lesson",
+    "ProposalFinancial",
+    "AgentJob",
 ]
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, Text, DateTime, func
+from sqlalchemy.dialects.postgresql import JSONB
+from app.db.base import Base
+
+
+class AgentJob(Base):
+    """
+    One agent run (CV fetch, RFP extraction, ...).  Shared by every worker so a
+    poll can land on any process; rows are evicted after ``agent_job_ttl_seconds``.
+    """
+    __tablename__ = "agent_jobs"
+
+    id = Column(String, primary_key=True)
+    agent = Column(String, nullable=False)
+    proposal_id = Column(String, nullable=True, index=True)
+    status = Column(String, nullable=False, default="pending")
+    params = Column(JSONB, nullable=False, default=dict)
+    result = Column(JSONB, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
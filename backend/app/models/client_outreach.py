@@ -1,6 +1,6 @@
 import uuid
 import enum
-from sqlalchemy import Column, String, Text, Date, ForeignKey, DateTime, func
+from sqlalchemy import Column, String, Text, Date, ForeignKey, DateTime, func, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import Base
 
@@ -16,6 +16,9 @@ class OutreachType(str, enum.Enum):
 
 class ClientOutreach(Base):
     __tablename__ = "client_outreach"
+    __table_args__ = (
+        Index("ix_client_outreach_proposal_date", "proposal_id", "outreach_date"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     proposal_id = Column(UUID(as_uuid=True), ForeignKey("proposals.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -1,6 +1,6 @@
 import uuid
 import enum
-from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, func
+from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, func, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import Base
 
@@ -14,6 +14,9 @@ class ComplianceStatus(str, enum.Enum):
 
 class ComplianceItem(Base):
     __tablename__ = "compliance_items"
+    __table_args__ = (
+        Index("ix_compliance_items_proposal_category_order", "proposal_id", "category", "order_index"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     proposal_id = Column(UUID(as_uuid=True), ForeignKey("proposals.id", ondelete="CASCADE"), nullable=False, index=True)
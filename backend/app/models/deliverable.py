@@ -1,6 +1,6 @@
 import uuid
 import enum
-from sqlalchemy import Column, String, Text, Date, ForeignKey, DateTime, Enum, func
+from sqlalchemy import Column, String, Text, Date, ForeignKey, DateTime, Enum, func, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import Base
 
@@ -21,10 +21,13 @@ class DeliverableStatus(str, enum.Enum):
 
 class Deliverable(Base):
     __tablename__ = "deliverables"
+    __table_args__ = (
+        Index("ix_deliverables_proposal_ref", "proposal_id", "deliverable_ref", "updated_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     proposal_id = Column(UUID(as_uuid=True), ForeignKey("proposals.id", ondelete="CASCADE"), nullable=False, index=True)
-    wbs_id = Column(UUID(as_uuid=True), ForeignKey("wbs_items.id", ondelete="SET NULL"), nullable=True)
+    wbs_id = Column(UUID(as_uuid=True), ForeignKey("wbs_items.id", ondelete="SET NULL"), nullable=True, index=True)
     deliverable_ref = Column(String)
     title = Column(String, nullable=False)
     type = Column(Enum(DeliverableType), default=DeliverableType.other)
@@ -1,6 +1,6 @@
 import uuid
 import enum
-from sqlalchemy import Column, String, Integer, Text, Enum, DateTime, ForeignKey, func
+from sqlalchemy import Column, String, Integer, Text, Enum, DateTime, ForeignKey, func, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import Base
 
@@ -14,6 +14,9 @@ class DisciplineStatus(str, enum.Enum):
 
 class ProposalDiscipline(Base):
     __tablename__ = "proposal_disciplines"
+    __table_args__ = (
+        Index("ix_proposal_disciplines_proposal_order", "proposal_id", "order_index"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     proposal_id = Column(UUID(as_uuid=True), ForeignKey("proposals.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -1,6 +1,6 @@
 import uuid
 import enum
-from sqlalchemy import Column, String, Date, ForeignKey, DateTime, Enum, func
+from sqlalchemy import Column, String, Date, ForeignKey, DateTime, Enum, func, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import Base
 
@@ -20,10 +20,13 @@ class DrawingStatus(str, enum.Enum):
 
 class Drawing(Base):
     __tablename__ = "drawings"
+    __table_args__ = (
+        Index("ix_drawings_proposal_number", "proposal_id", "drawing_number", "updated_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     proposal_id = Column(UUID(as_uuid=True), ForeignKey("proposals.id", ondelete="CASCADE"), nullable=False, index=True)
-    wbs_id = Column(UUID(as_uuid=True), ForeignKey("wbs_items.id", ondelete="SET NULL"), nullable=True)
+    wbs_id = Column(UUID(as_uuid=True), ForeignKey("wbs_items.id", ondelete="SET NULL"), nullable=True, index=True)
     deliverable_id = Column(UUID(as_uuid=True), ForeignKey("deliverables.id", ondelete="SET NULL"), nullable=True)
     drawing_number = Column(String)
     title = Column(String, nullable=False)
@@ -1,11 +1,14 @@
 import uuid
-from sqlalchemy import Column, String, Integer, Numeric, ForeignKey, DateTime, func
+from sqlalchemy import Column, String, Integer, Numeric, ForeignKey, DateTime, func, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import Base
 
 
 class ProposedPerson(Base):
     __tablename__ = "proposed_people"
+    __table_args__ = (
+        Index("ix_proposed_people_proposal_updated", "proposal_id", "updated_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     proposal_id = Column(UUID(as_uuid=True), ForeignKey("proposals.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -1,16 +1,19 @@
 import uuid
-from sqlalchemy import Column, Numeric, ForeignKey, DateTime, func
+from sqlalchemy import Column, Numeric, ForeignKey, DateTime, func, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from app.db.base import Base
 
 
 class PricingRow(Base):
     __tablename__ = "pricing_rows"
+    __table_args__ = (
+        Index("ix_pricing_rows_proposal_updated", "proposal_id", "updated_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     proposal_id = Column(UUID(as_uuid=True), ForeignKey("proposals.id", ondelete="CASCADE"), nullable=False, index=True)
-    wbs_id = Column(UUID(as_uuid=True), ForeignKey("wbs_items.id", ondelete="SET NULL"), nullable=True)
-    person_id = Column(UUID(as_uuid=True), ForeignKey("proposed_people.id", ondelete="SET NULL"), nullable=True)
+    wbs_id = Column(UUID(as_uuid=True), ForeignKey("wbs_items.id", ondelete="SET NULL"), nullable=True, index=True)
+    person_id = Column(UUID(as_uuid=True), ForeignKey("proposed_people.id", ondelete="SET NULL"), nullable=True, index=True)
     hourly_rate = Column(Numeric(10, 2), default=0)
     cost_rate = Column(Numeric(10, 2), default=0)
     hours_by_phase = Column(JSONB, default=dict)
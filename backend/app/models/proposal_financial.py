@@ -0,0 +1,28 @@
+import uuid
+from sqlalchemy import Column, String, Numeric, ForeignKey, DateTime, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base import Base
+
+
+class ProposalFinancial(Base):
+    """
+    Pre-aggregated pricing totals for one bucket of a proposal.
+
+    scope/key: ("proposal", "") | ("phase", phase name) | ("team", team or "")
+    | ("wbs", wbs item id).  WBS buckets hold rolled-up totals (item + descendants).
+    Maintained on write by app.finance.summary; rebuildable from pricing_rows.
+    """
+    __tablename__ = "proposal_financials"
+    __table_args__ = (
+        UniqueConstraint("proposal_id", "scope", "key", name="uq_proposal_financials_bucket"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    proposal_id = Column(UUID(as_uuid=True), ForeignKey("proposals.id", ondelete="CASCADE"), nullable=False, index=True)
+    scope = Column(String, nullable=False)
+    key = Column(String, nullable=False, default="")
+    hours = Column(Numeric(16, 4), nullable=False, default=0)
+    billing = Column(Numeric(16, 4), nullable=False, default=0)
+    cost = Column(Numeric(16, 4), nullable=False, default=0)
+    burdened = Column(Numeric(16, 4), nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,11 +1,14 @@
 import uuid
-from sqlalchemy import Column, String, Text, Numeric, ForeignKey, DateTime, func
+from sqlalchemy import Column, String, Text, Numeric, ForeignKey, DateTime, func, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from app.db.base import Base
 
 
 class RelevantProject(Base):
     __tablename__ = "relevant_projects"
+    __table_args__ = (
+        Index("ix_relevant_projects_proposal_updated", "proposal_id", "updated_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     proposal_id = Column(UUID(as_uuid=True), ForeignKey("proposals.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -1,15 +1,18 @@
 import uuid
-from sqlalchemy import Column, String, Boolean, Date, ForeignKey, DateTime, func
+from sqlalchemy import Column, String, Boolean, Date, ForeignKey, DateTime, func, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import Base
 
 
 class ScheduleItem(Base):
     __tablename__ = "schedule_items"
+    __table_args__ = (
+        Index("ix_schedule_items_proposal_start", "proposal_id", "start_date", "updated_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     proposal_id = Column(UUID(as_uuid=True), ForeignKey("proposals.id", ondelete="CASCADE"), nullable=False, index=True)
-    wbs_id = Column(UUID(as_uuid=True), ForeignKey("wbs_items.id", ondelete="SET NULL"), nullable=True)
+    wbs_id = Column(UUID(as_uuid=True), ForeignKey("wbs_items.id", ondelete="SET NULL"), nullable=True, index=True)
     task_name = Column(String, nullable=False)
     start_date = Column(Date)
     end_date = Column(Date)
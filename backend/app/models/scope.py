@@ -1,11 +1,14 @@
 import uuid
-from sqlalchemy import Column, String, Text, Integer, ForeignKey, DateTime, func
+from sqlalchemy import Column, String, Text, Integer, ForeignKey, DateTime, func, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import Base
 
 
 class ScopeSection(Base):
     __tablename__ = "scope_sections"
+    __table_args__ = (
+        Index("ix_scope_sections_proposal_order", "proposal_id", "order_index"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     proposal_id = Column(UUID(as_uuid=True), ForeignKey("proposals.id", ondelete="CASCADE"), nullable=False, index=True)
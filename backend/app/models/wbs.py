@@ -1,11 +1,14 @@
 import uuid
-from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, func
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, func, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import Base
 
 
 class WBSItem(Base):
     __tablename__ = "wbs_items"
+    __table_args__ = (
+        Index("ix_wbs_items_proposal_order", "proposal_id", "order_index", "wbs_code"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     proposal_id = Column(UUID(as_uuid=True), ForeignKey("proposals.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -7,16 +7,77 @@ caller polls GET /api/agents/jobs/{job_id} for status + result.
 This pattern is preserved for the real implementation where agent calls
 may take 10–60 seconds (LLM calls, HR system lookups, document generation).
 """
-import asyncio
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.auth.deps import get_current_user
+from app.db.session import get_db
+from app.models.proposal import Proposal
 from app.models.user import User
-from app.agents import cv_fetcher, rfp_extractor, relevant_projects_fetcher, deliverables_fetcher, drawings_fetcher, projects_search
+from app.agents.jobs import TERMINAL_STATUSES, job_store
+from app.agents.results import agent_results
+from app.agents.scheduler import QueueFull, cancel_job, publish_job_event, scheduler
 
 router = APIRouter(prefix="/api/agents", tags=["agents"])
 
+MAX_BATCH_JOBS = 100
+
+
+async def _submission_deadline(db: AsyncSession, proposal_id: str) -> date | None:
+    try:
+        pid = UUID(proposal_id)
+    except ValueError:
+        return None
+    result = await db.execute(select(Proposal.submission_deadline).where(Proposal.id == pid))
+    return result.scalar_one_or_none()
+
+
+async def start_job(db: AsyncSession, agent: str, proposal_id: str, params: dict | None = None) -> dict:
+    """
+    Create a job and hand it to the scheduler; 429 when the agent queue is full.
+    Cacheable agents answer from a cached result, or with the id of an identical
+    job that is already pending or running.
+    """
+    key = await agent_results.key_for(db, agent, proposal_id, params)
+    if key is not None:
+        result = agent_results.cached(key)
+        if result is not None:
+            job = await job_store.create(agent, proposal_id, params, result=result)
+            await publish_job_event(job, "job_complete", status="complete", result=result, error=None,
+                                    completed_at=job["completed_at"])
+            return {"job_id": job["job_id"], "status": job["status"]}
+        running = agent_results.join(key)
+        if running is not None:
+            return {"job_id": await running, "status": "pending"}
+        try:
+            job = await _submit(db, agent, proposal_id, params, key)
+        except BaseException as exc:
+            agent_results.abandon(key, exc)
+            raise
+    else:
+        job = await _submit(db, agent, proposal_id, params, None)
+    return {"job_id": job["job_id"], "status": "pending"}
+
+
+async def _submit(db: AsyncSession, agent: str, proposal_id: str, params: dict | None, key: str | None) -> dict:
+    if not scheduler.accepting(agent):
+        raise HTTPException(429, "Agent queue is full, try again shortly", headers={"Retry-After": "5"})
+    deadline = await _submission_deadline(db, proposal_id)
+    job = await job_store.create(agent, proposal_id, params)
+    try:
+        scheduler.submit(job, deadline)
+    except QueueFull:
+        await job_store.update(job["job_id"], status="error", error="Agent queue is full")
+        raise HTTPException(429, "Agent queue is full, try again shortly", headers={"Retry-After": "5"})
+    if key is not None:
+        job["result_key"] = key
+        agent_results.started(key, job["job_id"])
+    return job
+
 
 class CVFetchRequest(BaseModel):
     proposal_id: str
@@ -47,6 +108,7 @@ class JobStatusOut(BaseModel):
     job_id: str
     status: str       # pending | running | complete | error
     result: Optional[list] = None
+    error: Optional[str] = None
     created_at: str
     completed_at: Optional[str] = None
 
@@ -54,100 +116,128 @@ class JobStatusOut(BaseModel):
 @router.post("/cv-fetch", status_code=202)
 async def start_cv_fetch(
     body: CVFetchRequest,
+    db: AsyncSession = Depends(get_db),
     _: User = Depends(get_current_user),
 ):
     """
     Kick off a CV fetch for one or more employee names.
     Returns job_id immediately; poll /api/agents/jobs/{job_id} for results.
     """
-    job_id = cv_fetcher.create_job(body.proposal_id, body.names)
-    # Run mock synchronously in a thread pool so the endpoint returns fast
-    asyncio.get_event_loop().run_in_executor(None, cv_fetcher.run_job, job_id)
-    return {"job_id": job_id, "status": "pending"}
+    return await start_job(db, "cv_fetcher", body.proposal_id, {"names": body.names})
 
 
 @router.post("/rfp-extract", status_code=202)
 async def start_rfp_extract(
     body: RFPExtractRequest,
+    db: AsyncSession = Depends(get_db),
     _: User = Depends(get_current_user),
 ):
     """
     Kick off RFP extraction to pull scope sections from an RFP document.
     Returns job_id immediately; poll /api/agents/jobs/{job_id} for results.
     """
-    job_id = rfp_extractor.create_job(body.proposal_id)
-    asyncio.get_event_loop().run_in_executor(None, rfp_extractor.run_job, job_id)
-    return {"job_id": job_id, "status": "pending"}
+    return await start_job(db, "rfp_extractor", body.proposal_id)
 
 
 @router.post("/relevant-projects-fetch", status_code=202)
 async def start_relevant_projects_fetch(
     body: RelevantProjectsFetchRequest,
+    db: AsyncSession = Depends(get_db),
     _: User = Depends(get_current_user),
 ):
     """
     Kick off relevant projects fetch based on RFP requirements.
     Returns job_id immediately; poll /api/agents/jobs/{job_id} for results.
     """
-    job_id = relevant_projects_fetcher.create_job(body.proposal_id)
-    asyncio.get_event_loop().run_in_executor(None, relevant_projects_fetcher.run_job, job_id)
-    return {"job_id": job_id, "status": "pending"}
+    return await start_job(db, "relevant_projects_fetcher", body.proposal_id)
 
 
 @router.post("/deliverables-fetch", status_code=202)
 async def start_deliverables_fetch(
     body: DeliverablesFetchRequest,
+    db: AsyncSession = Depends(get_db),
     _: User = Depends(get_current_user),
 ):
     """
     Kick off deliverables extraction from RFP document.
     Returns job_id immediately; poll /api/agents/jobs/{job_id} for results.
     """
-    job_id = deliverables_fetcher.create_job(body.proposal_id)
-    asyncio.get_event_loop().run_in_executor(None, deliverables_fetcher.run_job, job_id)
-    return {"job_id": job_id, "status": "pending"}
+    return await start_job(db, "deliverables_fetcher", body.proposal_id)
 
 
 @router.post("/drawings-fetch", status_code=202)
 async def start_drawings_fetch(
     body: DrawingsFetchRequest,
+    db: AsyncSession = Depends(get_db),
     _: User = Depends(get_current_user),
 ):
     """
     Kick off drawing list extraction from RFP/WBS.
     Returns job_id immediately; poll /api/agents/jobs/{job_id} for results.
     """
-    job_id = drawings_fetcher.create_job(body.proposal_id)
-    asyncio.get_event_loop().run_in_executor(None, drawings_fetcher.run_job, job_id)
-    return {"job_id": job_id, "status": "pending"}
+    return await start_job(db, "drawings_fetcher", body.proposal_id)
 
 
 @router.post("/projects-search", status_code=202)
 async def start_projects_search(
     body: ProjectsSearchRequest,
+    db: AsyncSession = Depends(get_db),
     _: User = Depends(get_current_user),
 ):
     """
     Kick off a search of WSP's master project database for relevant projects.
     Returns job_id immediately; poll /api/agents/jobs/{job_id} for results.
     """
-    job_id = projects_search.create_job(body.proposal_id)
-    asyncio.get_event_loop().run_in_executor(None, projects_search.run_job, job_id)
-    return {"job_id": job_id, "status": "pending"}
+    return await start_job(db, "projects_search", body.proposal_id)
 
 
-@router.get("/jobs/{job_id}", response_model=JobStatusOut)
-async def get_job_status(
-    job_id: str,
-    _: User = Depends(get_current_user),
-):
-    job = cv_fetcher.get_job(job_id) or rfp_extractor.get_job(job_id) or relevant_projects_fetcher.get_job(job_id) or deliverables_fetcher.get_job(job_id) or drawings_fetcher.get_job(job_id) or projects_search.get_job(job_id)
-    if not job:
-        raise HTTPException(404, "Job not found")
+def _to_out(job: dict) -> JobStatusOut:
     return JobStatusOut(
         job_id=job["job_id"],
         status=job["status"],
         result=job.get("result"),
+        error=job.get("error"),
         created_at=job["created_at"],
         completed_at=job.get("completed_at"),
     )
+
+
+@router.get("/jobs", response_model=List[JobStatusOut])
+async def get_jobs_status(
+    ids: str = Query(..., description="Comma-separated job ids"),
+    _: User = Depends(get_current_user),
+):
+    """
+    Status of several jobs in one request, so a page running a few agents polls
+    once per cycle.  Unknown or expired ids are left out of the response.
+    """
+    job_ids = [i for i in (part.strip() for part in ids.split(",")) if i]
+    if len(job_ids) > MAX_BATCH_JOBS:
+        raise HTTPException(400, f"At most {MAX_BATCH_JOBS} job ids per request")
+    jobs = await job_store.get_many(job_ids)
+    return [_to_out(jobs[i]) for i in dict.fromkeys(job_ids) if i in jobs]
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusOut)
+async def get_job_status(
+    job_id: str,
+    _: User = Depends(get_current_user),
+):
+    job = await job_store.get(job_id)
+    if not job:
+        raise HTTPException(404, "Job not found")
+    return _to_out(job)
+
+
+@router.delete("/jobs/{job_id}", status_code=204)
+async def cancel_agent_job(
+    job_id: str,
+    _: User = Depends(get_current_user),
+):
+    """Cancel a pending or running job; it finishes with status error / "Cancelled"."""
+    job = await job_store.get(job_id)
+    if not job:
+        raise HTTPException(404, "Job not found")
+    if job["status"] in TERMINAL_STATUSES:
+        raise HTTPException(409, "Job has already finished")
+    await cancel_job(job)
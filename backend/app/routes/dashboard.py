@@ -1,9 +1,14 @@
+import hashlib
+import uuid
 from datetime import date
 from uuid import UUID
-from fastapi import APIRouter, Depends
-from sqlalchemy import select, func
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy import select, func, literal, and_
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import CacheBackend, TTLCache
+from app.config import settings
 from app.db.session import get_db
 from app.auth.deps import get_current_user
 from app.models.user import User
@@ -19,85 +24,194 @@ from app.models.relevant_project import RelevantProject
 from app.models.discipline import ProposalDiscipline
 from app.models.compliance import ComplianceItem
 from app.schemas.dashboard import DashboardOut
+from app.models.proposal_financial import ProposalFinancial
+from app.finance.summary import SCOPE_PROPOSAL, load_financials
 
 router = APIRouter(prefix="/api/proposals/{proposal_id}/dashboard", tags=["dashboard"])
 
+# Tab count label -> model counted by proposal_id
+COUNTED_MODELS = {
+    "wbs_count": WBSItem,
+    "pricing_count": PricingRow,
+    "people_count": ProposedPerson,
+    "schedule_count": ScheduleItem,
+    "deliverables_count": Deliverable,
+    "drawings_count": Drawing,
+    "scope_count": ScopeSection,
+    "relevant_projects_count": RelevantProject,
+    "disciplines_count": ProposalDiscipline,
+    "compliance_count": ComplianceItem,
+}
+
+
+def dashboard_stats_query(proposal_id: UUID):
+    """
+    One statement returning everything the dashboard reads: proposal timeline
+    fields, the financial summary's proposal bucket, every tab count and the
+    schedule date range.  Tab counts and the schedule range are scalar
+    subqueries; proposal and summary are LEFT JOINed onto a one-row anchor so a
+    missing proposal still yields a row.
+    """
+    anchor = select(literal(proposal_id, PG_UUID(as_uuid=True)).label("id")).subquery("anchor")
+    counts = [
+        select(func.count()).where(model.proposal_id == anchor.c.id).scalar_subquery().label(label)
+        for label, model in COUNTED_MODELS.items()
+    ]
+    schedule_range = [
+        select(func.min(ScheduleItem.start_date))
+        .where(ScheduleItem.proposal_id == anchor.c.id)
+        .scalar_subquery()
+        .label("schedule_start"),
+        select(func.max(ScheduleItem.end_date))
+        .where(ScheduleItem.proposal_id == anchor.c.id)
+        .scalar_subquery()
+        .label("schedule_end"),
+    ]
+    return (
+        select(
+            Proposal.id.label("proposal_id"),
+            Proposal.target_dlm,
+            Proposal.kickoff_date,
+            Proposal.red_review_date,
+            Proposal.gold_review_date,
+            Proposal.submission_deadline,
+            Proposal.check_in_meetings,
+            ProposalFinancial.hours.label("total_hours"),
+            ProposalFinancial.billing.label("total_billing"),
+            ProposalFinancial.cost.label("total_cost"),
+            ProposalFinancial.burdened.label("total_burdened"),
+            *counts,
+            *schedule_range,
+        )
+        .select_from(anchor)
+        .outerjoin(Proposal, Proposal.id == anchor.c.id)
+        .outerjoin(
+            ProposalFinancial,
+            and_(
+                ProposalFinancial.proposal_id == anchor.c.id,
+                ProposalFinancial.scope == SCOPE_PROPOSAL,
+                ProposalFinancial.key == "",
+            ),
+        )
+    )
+
+
+class DashboardCache:
+    """
+    Serialized DashboardOut + ETag per proposal.
+
+    Entries are dropped by any write to the proposal (see the invalidation
+    middleware in app.main) and by websocket edits.  A per-proposal generation
+    token, kept in the backend next to the entry, stops a read that raced with
+    a write from caching stale data, and entries are tied to the day they were
+    computed since days_remaining moves.
+
+    Invalidation only reaches the workers sharing the backend.  With the default
+    per-process ``TTLCache`` a write drops this worker's entry; other workers
+    keep serving theirs (and its ETag) until ``dashboard_cache_ttl_seconds``
+    lapses.  Plug in a backend shared by all workers to make writes visible
+    everywhere at once.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+
+    def use_backend(self, backend: CacheBackend) -> None:
+        self.backend = backend
+
+    def generation(self, proposal_id: UUID | str) -> str | None:
+        # A fresh token per write rather than a counter: no read-modify-write
+        # between workers, and a token evicted early only skips one cache fill
+        return self.backend.get(("generation", str(proposal_id)))
+
+    def get(self, proposal_id: UUID | str) -> tuple[str, bytes] | None:
+        entry = self.backend.get(str(proposal_id))
+        if not entry:
+            return None
+        day, etag, body = entry
+        if day != date.today().isoformat():
+            return None
+        return etag, body
+
+    def put(self, proposal_id: UUID | str, body: bytes, generation: str | None) -> tuple[str, bytes]:
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        if self.generation(proposal_id) == generation:
+            self.backend.set(str(proposal_id), (date.today().isoformat(), etag, body))
+        return etag, body
+
+    def invalidate(self, proposal_id: UUID | str) -> None:
+        key = str(proposal_id)
+        self.backend.set(("generation", key), uuid.uuid4().hex)
+        self.backend.delete(key)
+
+
+dashboard_cache = DashboardCache(
+    TTLCache(maxsize=settings.dashboard_cache_max_entries, ttl=settings.dashboard_cache_ttl_seconds)
+)
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [t.strip() for t in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
 
 @router.get("/", response_model=DashboardOut)
 async def get_dashboard(
     proposal_id: UUID,
+    request: Request,
     db: AsyncSession = Depends(get_db),
     _: User = Depends(get_current_user),
 ):
-    # Proposal for target_dlm + timeline
-    prop_result = await db.execute(select(Proposal).where(Proposal.id == proposal_id))
-    proposal = prop_result.scalar_one_or_none()
-    target_dlm = float(proposal.target_dlm or 3.0) if proposal else 3.0
+    generation = dashboard_cache.generation(proposal_id)
+    cached = dashboard_cache.get(proposal_id)
+    if cached is None:
+        out = await build_dashboard(proposal_id, db)
+        cached = dashboard_cache.put(proposal_id, out.model_dump_json().encode(), generation)
+    etag, body = cached
+
+    # no-cache: browsers keep the body but revalidate with If-None-Match every time
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def build_dashboard(proposal_id: UUID, db: AsyncSession) -> DashboardOut:
+    # Single round trip for proposal, financial totals, tab counts and schedule range
+    stats = (await db.execute(dashboard_stats_query(proposal_id))).one()
+    exists = stats.proposal_id is not None
+    target_dlm = float(stats.target_dlm or 3.0) if exists else 3.0
 
     # Timeline fields
-    kickoff_date = str(proposal.kickoff_date) if proposal and proposal.kickoff_date else None
-    red_review_date = str(proposal.red_review_date) if proposal and proposal.red_review_date else None
-    gold_review_date = str(proposal.gold_review_date) if proposal and proposal.gold_review_date else None
-    submission_deadline = str(proposal.submission_deadline) if proposal and proposal.submission_deadline else None
-    check_in_meetings = proposal.check_in_meetings if proposal and proposal.check_in_meetings else []
+    kickoff_date = str(stats.kickoff_date) if stats.kickoff_date else None
+    red_review_date = str(stats.red_review_date) if stats.red_review_date else None
+    gold_review_date = str(stats.gold_review_date) if stats.gold_review_date else None
+    submission_deadline = str(stats.submission_deadline) if stats.submission_deadline else None
+    check_in_meetings = stats.check_in_meetings or []
     days_remaining = None
-    if proposal and proposal.submission_deadline:
-        delta = proposal.submission_deadline - date.today()
+    if stats.submission_deadline:
+        delta = stats.submission_deadline - date.today()
         days_remaining = delta.days
 
-    # Pricing rows with person join for burdened_rate
-    pricing_result = await db.execute(
-        select(PricingRow, ProposedPerson.burdened_rate)
-        .outerjoin(ProposedPerson, PricingRow.person_id == ProposedPerson.id)
-        .where(PricingRow.proposal_id == proposal_id)
-    )
-    pricing_data = pricing_result.all()
-
-    total_billing = 0.0
-    total_cost = 0.0
-    total_burdened = 0.0
-    total_hours = 0.0
-    for row, burdened_rate in pricing_data:
-        phases = row.hours_by_phase or {}
-        h = sum(float(v) for v in phases.values())
-        total_hours += h
-        total_billing += h * float(row.hourly_rate or 0)
-        total_cost += h * float(row.cost_rate or 0)
-        total_burdened += h * float(burdened_rate or 0)
+    # Pricing totals from the materialized financial summary (built on first read)
+    if exists and stats.total_hours is None:
+        buckets = await load_financials(db, proposal_id, scope=SCOPE_PROPOSAL)
+        total_hours, total_billing, total_cost, total_burdened = buckets.get(
+            (SCOPE_PROPOSAL, ""), [0.0, 0.0, 0.0, 0.0]
+        )
+    else:
+        total_hours = float(stats.total_hours or 0)
+        total_billing = float(stats.total_billing or 0)
+        total_cost = float(stats.total_cost or 0)
+        total_burdened = float(stats.total_burdened or 0)
 
     net_margin = total_billing - total_cost
     margin_pct = (net_margin / total_billing * 100) if total_billing > 0 else 0.0
     achieved_dlm = (total_billing / total_cost) if total_cost > 0 else 0.0
 
-    # Counts
-    async def count_table(model, field="proposal_id"):
-        result = await db.execute(
-            select(func.count()).where(getattr(model, field) == proposal_id)
-        )
-        return result.scalar() or 0
-
-    wbs_count = await count_table(WBSItem)
-    pricing_count = len(pricing_data)
-    people_count = await count_table(ProposedPerson)
-    schedule_count = await count_table(ScheduleItem)
-    deliverables_count = await count_table(Deliverable)
-    drawings_count = await count_table(Drawing)
-    scope_count = await count_table(ScopeSection)
-    rp_count = await count_table(RelevantProject)
-
-    disciplines_count = await count_table(ProposalDiscipline)
-    compliance_count = await count_table(ComplianceItem)
-
-    # Schedule date range
-    sched_result = await db.execute(
-        select(
-            func.min(ScheduleItem.start_date),
-            func.max(ScheduleItem.end_date),
-        ).where(ScheduleItem.proposal_id == proposal_id)
-    )
-    sched_row = sched_result.one()
-    schedule_start = str(sched_row[0]) if sched_row[0] else None
-    schedule_end = str(sched_row[1]) if sched_row[1] else None
+    counts = {label: getattr(stats, label) or 0 for label in COUNTED_MODELS}
 
     return DashboardOut(
         total_billing=round(total_billing, 2),
@@ -107,24 +221,15 @@ async def get_dashboard(
         margin_pct=round(margin_pct, 1),
         achieved_dlm=round(achieved_dlm, 2),
         target_dlm=target_dlm,
-        team_size=people_count,
+        team_size=counts["people_count"],
         total_hours=round(total_hours, 1),
-        schedule_start=schedule_start,
-        schedule_end=schedule_end,
+        schedule_start=str(stats.schedule_start) if stats.schedule_start else None,
+        schedule_end=str(stats.schedule_end) if stats.schedule_end else None,
         kickoff_date=kickoff_date,
         red_review_date=red_review_date,
         gold_review_date=gold_review_date,
         submission_deadline=submission_deadline,
         check_in_meetings=check_in_meetings,
         days_remaining=days_remaining,
-        wbs_count=wbs_count,
-        pricing_count=pricing_count,
-        people_count=people_count,
-        schedule_count=schedule_count,
-        deliverables_count=deliverables_count,
-        drawings_count=drawings_count,
-        scope_count=scope_count,
-        relevant_projects_count=rp_count,
-        disciplines_count=disciplines_count,
-        compliance_count=compliance_count,
+        **counts,
     )
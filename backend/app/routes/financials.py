@@ -0,0 +1,66 @@
+from uuid import UUID
+from typing import List, Optional
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db
+from app.auth.deps import get_current_user
+from app.finance.summary import check_financials, load_financials, rebuild_financials
+from app.models.user import User
+from app.schemas.financials import FinancialBucketOut, FinancialsCheckOut
+
+router = APIRouter(prefix="/api/proposals/{proposal_id}/financials", tags=["financials"])
+
+
+def _bucket_out(bucket: tuple[str, str], amounts: list[float]) -> FinancialBucketOut:
+    scope, key = bucket
+    hours, billing, cost, burdened = amounts
+    return FinancialBucketOut(
+        scope=scope,
+        key=key,
+        hours=round(hours, 2),
+        billing=round(billing, 2),
+        cost=round(cost, 2),
+        burdened=round(burdened, 2),
+    )
+
+
+@router.get("/", response_model=List[FinancialBucketOut])
+async def list_financials(
+    proposal_id: UUID,
+    scope: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    _: User = Depends(get_current_user),
+):
+    """Pre-aggregated totals per proposal, phase, team and WBS node."""
+    buckets = await load_financials(db, proposal_id, scope=scope)
+    return [_bucket_out(b, a) for b, a in sorted(buckets.items())]
+
+
+@router.get("/check", response_model=FinancialsCheckOut)
+async def check(
+    proposal_id: UUID,
+    repair: bool = False,
+    db: AsyncSession = Depends(get_db),
+    _: User = Depends(get_current_user),
+):
+    """Compare the stored summary against pricing_rows; ?repair=true rebuilds it on mismatch."""
+    mismatches = await check_financials(db, proposal_id)
+    rebuilt = False
+    if mismatches and repair:
+        await rebuild_financials(db, proposal_id)
+        await db.commit()
+        rebuilt = True
+    return FinancialsCheckOut(consistent=not mismatches, mismatches=mismatches, rebuilt=rebuilt)
+
+
+@router.post("/rebuild", response_model=List[FinancialBucketOut])
+async def rebuild(
+    proposal_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    _: User = Depends(get_current_user),
+):
+    """Recompute the proposal's summary from scratch."""
+    buckets = await rebuild_financials(db, proposal_id)
+    await db.commit()
+    return [_bucket_out(b, a) for b, a in sorted(buckets.items())]
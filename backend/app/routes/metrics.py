@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends
+
+from app.agents import cv_fetcher
+from app.agents.results import agent_results
+from app.agents.scheduler import outcomes, scheduler
+from app.auth import cache as auth_cache
+from app.auth.deps import get_current_user
+from app.db.pool import pool_metrics
+from app.db.session import engine
+from app.models.user import User
+from app.routes.dashboard import dashboard_cache
+from app.websockets.manager import manager
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"])
+
+
+@router.get("/")
+async def get_metrics(_: User = Depends(get_current_user)):
+    """Per-process cache counters; each worker reports its own."""
+    return {
+        "auth_cache": auth_cache.stats(),
+        "dashboard_cache": getattr(dashboard_cache.backend, "stats", dict)(),
+        "db_pool": pool_metrics.snapshot(engine.pool),
+        "agents": {**scheduler.stats(), "outcomes": dict(outcomes)},
+        "agent_results": agent_results.stats(),
+        "cv_cache": cv_fetcher.cv_cache.stats(),
+        "websockets": manager.stats(),
+    }
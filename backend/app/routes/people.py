@@ -1,18 +1,36 @@
 from uuid import UUID
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
 from app.auth.deps import get_current_user
+from app.finance.summary import rebuild_financials
 from app.models.people import ProposedPerson
 from app.models.pricing import PricingRow
 from app.models.user import User
-from app.schemas.people import PersonCreate, PersonUpdate, PersonOut
+from app.schemas.people import PersonCreate, PersonUpdate, PersonOut, RerateRequest, RerateOut
 
 router = APIRouter(prefix="/api/proposals/{proposal_id}/people", tags=["people"])
 
+# Person rates copied onto their pricing rows; burdened_rate is read through the join
+CASCADED_RATES = ("hourly_rate", "cost_rate")
+
+
+async def _cascade_rates(db: AsyncSession, person_filter, values: dict) -> int:
+    """Copy rate changes onto every pricing row of the matching people in one UPDATE."""
+    rates = {k: v for k, v in values.items() if k in CASCADED_RATES}
+    if not rates:
+        return 0
+    result = await db.execute(
+        update(PricingRow)
+        .where(PricingRow.person_id.in_(select(ProposedPerson.id).where(*person_filter)))
+        .values(**rates)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
 
 @router.get("/", response_model=List[PersonOut])
 async def list_people(
@@ -46,6 +64,39 @@ async def create_person(
     return person
 
 
+@router.post("/rerate", response_model=RerateOut)
+async def rerate_people(
+    proposal_id: UUID,
+    body: RerateRequest,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Apply a rate card to every person in a team and/or WSP role, and to their pricing rows."""
+    rates = body.model_dump(exclude_unset=True, exclude={"team", "wsp_role"})
+    if body.team is None and body.wsp_role is None:
+        raise HTTPException(400, "Specify a team or wsp_role to re-rate")
+    if not rates:
+        raise HTTPException(400, "Specify at least one rate")
+
+    person_filter = [ProposedPerson.proposal_id == proposal_id]
+    if body.team is not None:
+        person_filter.append(ProposedPerson.team == body.team)
+    if body.wsp_role is not None:
+        person_filter.append(ProposedPerson.wsp_role == body.wsp_role)
+
+    people_result = await db.execute(
+        update(ProposedPerson)
+        .where(*person_filter)
+        .values(**rates, updated_by=user.id)
+        .execution_options(synchronize_session=False)
+    )
+    pricing_rows_updated = await _cascade_rates(db, person_filter, rates)
+    if people_result.rowcount:
+        await rebuild_financials(db, proposal_id)
+    await db.commit()
+    return RerateOut(people_updated=people_result.rowcount, pricing_rows_updated=pricing_rows_updated)
+
+
 @router.patch("/{person_id}", response_model=PersonOut)
 async def update_person(
     proposal_id: UUID,
@@ -69,16 +120,11 @@ async def update_person(
     person.updated_by = user.id
 
     # Cascade rate changes to all pricing rows referencing this person
-    rate_fields = {"hourly_rate", "cost_rate"}
-    if rate_fields & updates.keys():
-        pricing_result = await db.execute(
-            select(PricingRow).where(PricingRow.person_id == person_id)
-        )
-        for row in pricing_result.scalars().all():
-            if "hourly_rate" in updates:
-                row.hourly_rate = person.hourly_rate
-            if "cost_rate" in updates:
-                row.cost_rate = person.cost_rate
+    await _cascade_rates(db, [ProposedPerson.id == person_id], updates)
+
+    # Rates and team feed every bucket this person's rows touch
+    if {*CASCADED_RATES, "burdened_rate", "team"} & updates.keys():
+        await rebuild_financials(db, proposal_id)
 
     await db.commit()
     await db.refresh(person)
@@ -101,4 +147,6 @@ async def delete_person(
     if not person:
         raise HTTPException(404, "Person not found")
     await db.delete(person)
+    # Their pricing rows lose team / burdened rate (person_id is SET NULL)
+    await rebuild_financials(db, proposal_id)
     await db.commit()
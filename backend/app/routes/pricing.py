@@ -1,15 +1,21 @@
 from uuid import UUID
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
 from app.auth.deps import get_current_user
+from app.finance.summary import (
+    SCOPE_WBS, apply_delta, diff, ensure_financials, load_financials, load_wbs_tree,
+    lock_financials, row_buckets, rows_buckets,
+)
 from app.models.pricing import PricingRow
 from app.models.people import ProposedPerson
 from app.models.user import User
-from app.schemas.pricing import PricingRowCreate, PricingRowUpdate, PricingRowOut
+from app.schemas.pricing import (
+    PricingRowCreate, PricingRowUpdate, PricingRowOut, PricingBatch, PricingBatchOut, WBSTotalsOut,
+)
 
 router = APIRouter(prefix="/api/proposals/{proposal_id}/pricing", tags=["pricing"])
 
@@ -36,6 +42,44 @@ def _to_out(row: PricingRow, person: ProposedPerson | None = None) -> PricingRow
     )
 
 
+async def _get_person(db: AsyncSession, person_id: UUID | None) -> ProposedPerson | None:
+    if not person_id:
+        return None
+    result = await db.execute(select(ProposedPerson).where(ProposedPerson.id == person_id))
+    return result.scalar_one_or_none()
+
+
+def _new_row(proposal_id: UUID, body: PricingRowCreate, person: ProposedPerson | None, user: User) -> PricingRow:
+    # Auto-fill rates from person if person_id provided and rates not overridden
+    billing_rate = body.hourly_rate
+    cost_rate = body.cost_rate
+    if person:
+        if billing_rate == 0:
+            billing_rate = float(person.hourly_rate or 0)
+        if cost_rate == 0:
+            cost_rate = float(person.cost_rate or 0)
+    return PricingRow(
+        proposal_id=proposal_id,
+        wbs_id=body.wbs_id,
+        person_id=body.person_id,
+        hourly_rate=billing_rate,
+        cost_rate=cost_rate,
+        hours_by_phase=body.hours_by_phase,
+        updated_by=user.id,
+    )
+
+
+def _apply_update(row: PricingRow, updates: dict, person: ProposedPerson | None, user: User) -> None:
+    """Apply a PricingRowUpdate dump; ``person`` is the row's person after the update."""
+    # If person changed, refresh both rates from new person
+    if "person_id" in updates and person:
+        updates["hourly_rate"] = float(person.hourly_rate or 0)
+        updates["cost_rate"] = float(person.cost_rate or 0)
+    for field, value in updates.items():
+        setattr(row, field, value)
+    row.updated_by = user.id
+
+
 @router.get("/", response_model=List[PricingRowOut])
 async def list_pricing(
     proposal_id: UUID,
@@ -68,31 +112,11 @@ async def create_pricing(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    # Auto-fill rates from person if person_id provided and rates not overridden
-    billing_rate = body.hourly_rate
-    cost_rate = body.cost_rate
-    person = None
-    if body.person_id:
-        ppl_result = await db.execute(
-            select(ProposedPerson).where(ProposedPerson.id == body.person_id)
-        )
-        person = ppl_result.scalar_one_or_none()
-        if person:
-            if billing_rate == 0:
-                billing_rate = float(person.hourly_rate or 0)
-            if cost_rate == 0:
-                cost_rate = float(person.cost_rate or 0)
-
-    row = PricingRow(
-        proposal_id=proposal_id,
-        wbs_id=body.wbs_id,
-        person_id=body.person_id,
-        hourly_rate=billing_rate,
-        cost_rate=cost_rate,
-        hours_by_phase=body.hours_by_phase,
-        updated_by=user.id,
-    )
+    person = await _get_person(db, body.person_id)
+    await ensure_financials(db, proposal_id)
+    row = _new_row(proposal_id, body, person, user)
     db.add(row)
+    await apply_delta(db, proposal_id, await row_buckets(db, proposal_id, row, person))
     await db.commit()
     await db.refresh(row)
     return _to_out(row, person)
@@ -106,6 +130,8 @@ async def update_pricing(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
+    # Before reading the row: its old state is what the delta is taken against
+    await lock_financials(db, proposal_id)
     result = await db.execute(
         select(PricingRow).where(
             PricingRow.id == row_id, PricingRow.proposal_id == proposal_id
@@ -116,31 +142,16 @@ async def update_pricing(
         raise HTTPException(404, "Pricing row not found")
 
     updates = body.model_dump(exclude_unset=True)
+    await ensure_financials(db, proposal_id)
+    person = await _get_person(db, row.person_id)
+    before = await row_buckets(db, proposal_id, row, person)
 
-    # If person changed, refresh both rates from new person
-    if "person_id" in updates and updates["person_id"]:
-        ppl_result = await db.execute(
-            select(ProposedPerson).where(ProposedPerson.id == updates["person_id"])
-        )
-        person = ppl_result.scalar_one_or_none()
-        if person:
-            updates["hourly_rate"] = float(person.hourly_rate or 0)
-            updates["cost_rate"] = float(person.cost_rate or 0)
-
-    for field, value in updates.items():
-        setattr(row, field, value)
-    row.updated_by = user.id
+    if "person_id" in updates:
+        person = await _get_person(db, updates["person_id"])
+    _apply_update(row, updates, person, user)
+    await apply_delta(db, proposal_id, diff(before, await row_buckets(db, proposal_id, row, person)))
     await db.commit()
     await db.refresh(row)
-
-    # Load person for response
-    person = None
-    if row.person_id:
-        ppl_result = await db.execute(
-            select(ProposedPerson).where(ProposedPerson.id == row.person_id)
-        )
-        person = ppl_result.scalar_one_or_none()
-
     return _to_out(row, person)
 
 
@@ -151,6 +162,7 @@ async def delete_pricing(
     db: AsyncSession = Depends(get_db),
     _: User = Depends(get_current_user),
 ):
+    await lock_financials(db, proposal_id)
     result = await db.execute(
         select(PricingRow).where(
             PricingRow.id == row_id, PricingRow.proposal_id == proposal_id
@@ -159,5 +171,89 @@ async def delete_pricing(
     row = result.scalar_one_or_none()
     if not row:
         raise HTTPException(404, "Pricing row not found")
+    await ensure_financials(db, proposal_id)
+    person = await _get_person(db, row.person_id)
+    await apply_delta(db, proposal_id, diff(await row_buckets(db, proposal_id, row, person), None))
     await db.delete(row)
     await db.commit()
+
+
+@router.post("/batch", response_model=PricingBatchOut)
+async def batch_pricing(
+    proposal_id: UUID,
+    body: PricingBatch,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """
+    Apply many pricing-grid creates/updates/deletes in one transaction (e.g. a
+    block pasted from Excel).  Existing rows, people and the WBS tree are each
+    loaded with a single query and the financial summary gets one combined delta.
+    """
+    update_bodies = {u.id: u for u in body.update}
+    if update_bodies.keys() & set(body.delete):
+        raise HTTPException(400, "A pricing row cannot be both updated and deleted")
+    existing_ids = set(update_bodies) | set(body.delete)
+    await lock_financials(db, proposal_id)
+    rows: dict[UUID, PricingRow] = {}
+    if existing_ids:
+        result = await db.execute(
+            select(PricingRow).where(
+                PricingRow.id.in_(existing_ids), PricingRow.proposal_id == proposal_id
+            )
+        )
+        rows = {r.id: r for r in result.scalars().all()}
+    missing = existing_ids - rows.keys()
+    if missing:
+        raise HTTPException(404, f"Pricing rows not found: {', '.join(sorted(map(str, missing)))}")
+
+    # Every person referenced before or after the batch, in one query
+    person_ids = {r.person_id for r in rows.values() if r.person_id}
+    person_ids |= {c.person_id for c in body.create if c.person_id}
+    person_ids |= {u.person_id for u in body.update if u.person_id}
+    people: dict[UUID, ProposedPerson] = {}
+    if person_ids:
+        ppl_result = await db.execute(
+            select(ProposedPerson).where(ProposedPerson.id.in_(person_ids))
+        )
+        people = {p.id: p for p in ppl_result.scalars().all()}
+
+    await ensure_financials(db, proposal_id)
+    tree = await load_wbs_tree(db, proposal_id)
+    before = rows_buckets(((r, people.get(r.person_id)) for r in rows.values()), tree)
+
+    created = [_new_row(proposal_id, c, people.get(c.person_id), user) for c in body.create]
+    db.add_all(created)
+    updated = []
+    for row_id, update in update_bodies.items():
+        row = rows[row_id]
+        updates = update.model_dump(exclude_unset=True, exclude={"id"})
+        _apply_update(row, updates, people.get(updates.get("person_id", row.person_id)), user)
+        updated.append(row)
+    if body.delete:
+        await db.execute(
+            delete(PricingRow).where(
+                PricingRow.id.in_(body.delete), PricingRow.proposal_id == proposal_id
+            )
+        )
+
+    after = rows_buckets(((r, people.get(r.person_id)) for r in [*created, *updated]), tree)
+    delta = diff(before, after)
+    await apply_delta(db, proposal_id, delta)
+    await db.commit()
+
+    touched = [key for scope, key in delta if scope == SCOPE_WBS]
+    wbs_totals = []
+    if touched:
+        buckets = await load_financials(db, proposal_id, scope=SCOPE_WBS, keys=touched)
+        wbs_totals = [
+            WBSTotalsOut(wbs_id=UUID(key), total_hours=a[0], total_cost=a[1], total_cost_internal=a[2])
+            for (_, key), a in sorted(buckets.items())
+        ]
+
+    return PricingBatchOut(
+        created=[_to_out(r, people.get(r.person_id)) for r in created],
+        updated=[_to_out(r, people.get(r.person_id)) for r in updated],
+        deleted=list(body.delete),
+        wbs_totals=wbs_totals,
+    )
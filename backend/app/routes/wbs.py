@@ -6,78 +6,17 @@ from app.models.wbs import WBSItem
 from app.models.user import User
 from app.schemas.wbs import WBSItemCreate, WBSItemUpdate, WBSItemOut
 from app.auth.deps import get_current_user
+from app.finance.summary import SCOPE_WBS, begin_wbs_change, finish_wbs_change, load_financials
 from typing import List
 import uuid
 
 router = APIRouter(prefix="/api/proposals/{proposal_id}/wbs", tags=["wbs"])
 
 
-def _compute_wbs_totals(
-    items: list[WBSItem],
-    pricing_hours: dict[uuid.UUID, float],
-    pricing_cost: dict[uuid.UUID, float],
-    pricing_cost_internal: dict[uuid.UUID, float],
-) -> dict[uuid.UUID, tuple[float, float, float]]:
-    """
-    For each WBS item, return (total_hours, total_cost, total_cost_internal) including all descendants.
-    pricing_hours/pricing_cost/pricing_cost_internal are keyed by wbs_id (direct only).
-    Rollup: a parent's total = sum of its own direct pricing + all children's totals.
-    """
-    # Sort by WBS code so parents always come before children
-    sorted_items = sorted(items, key=lambda i: i.wbs_code)
-    code_to_id = {i.wbs_code: i.id for i in sorted_items}
-
-    # Start with direct pricing totals [hours, billing_cost, internal_cost]
-    totals: dict[uuid.UUID, list[float]] = {
-        i.id: [
-            pricing_hours.get(i.id, 0.0),
-            pricing_cost.get(i.id, 0.0),
-            pricing_cost_internal.get(i.id, 0.0),
-        ]
-        for i in sorted_items
-    }
-
-    # Roll up in reverse order (children first)
-    for item in reversed(sorted_items):
-        parts = item.wbs_code.split(".")
-        if len(parts) > 1:
-            parent_code = ".".join(parts[:-1])
-            parent_id = code_to_id.get(parent_code)
-            if parent_id:
-                totals[parent_id][0] += totals[item.id][0]
-                totals[parent_id][1] += totals[item.id][1]
-                totals[parent_id][2] += totals[item.id][2]
-
-    return {k: (v[0], v[1], v[2]) for k, v in totals.items()}
-
-
-async def _build_pricing_maps(
-    proposal_id: uuid.UUID, db: AsyncSession
-) -> tuple[dict[uuid.UUID, float], dict[uuid.UUID, float], dict[uuid.UUID, float]]:
-    """Return (hours_by_wbs_id, billing_cost_by_wbs_id, internal_cost_by_wbs_id) from direct pricing rows."""
-    from app.models.pricing import PricingRow
-
-    result = await db.execute(
-        select(PricingRow).where(
-            PricingRow.proposal_id == proposal_id,
-            PricingRow.wbs_id.isnot(None),
-        )
-    )
-    rows = result.scalars().all()
-
-    hours_map: dict[uuid.UUID, float] = {}
-    cost_map: dict[uuid.UUID, float] = {}
-    cost_internal_map: dict[uuid.UUID, float] = {}
-    for row in rows:
-        phases = row.hours_by_phase or {}
-        h = sum(float(v) for v in phases.values())
-        billing = h * float(row.hourly_rate or 0)
-        internal = h * float(row.cost_rate or 0)
-        hours_map[row.wbs_id] = hours_map.get(row.wbs_id, 0.0) + h
-        cost_map[row.wbs_id] = cost_map.get(row.wbs_id, 0.0) + billing
-        cost_internal_map[row.wbs_id] = cost_internal_map.get(row.wbs_id, 0.0) + internal
-
-    return hours_map, cost_map, cost_internal_map
+def _totals(buckets: dict, item_id: uuid.UUID) -> tuple[float, float, float]:
+    """(hours, billing, internal cost) for a WBS node from its financial summary bucket."""
+    amounts = buckets.get((SCOPE_WBS, str(item_id)))
+    return (amounts[0], amounts[1], amounts[2]) if amounts else (0.0, 0.0, 0.0)
 
 
 def _to_out(item: WBSItem, total_hours: float, total_cost: float, total_cost_internal: float) -> WBSItemOut:
@@ -107,10 +46,8 @@ async def list_wbs(
     )
     items = result.scalars().all()
 
-    hours_map, cost_map, cost_internal_map = await _build_pricing_maps(proposal_id, db)
-    totals = _compute_wbs_totals(items, hours_map, cost_map, cost_internal_map)
-
-    return [_to_out(i, *totals.get(i.id, (0.0, 0.0, 0.0))) for i in items]
+    buckets = await load_financials(db, proposal_id, scope=SCOPE_WBS)
+    return [_to_out(i, *_totals(buckets, i.id)) for i in items]
 
 
 @router.post("/", response_model=WBSItemOut, status_code=201)
@@ -120,11 +57,14 @@ async def create_wbs_item(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    # A new code can adopt existing children: re-roll the WBS buckets around it
+    before = await begin_wbs_change(db, proposal_id)
     item = WBSItem(**body.model_dump(), proposal_id=proposal_id, updated_by=current_user.id)
     db.add(item)
+    buckets = await finish_wbs_change(db, proposal_id, before)
     await db.commit()
     await db.refresh(item)
-    return _to_out(item, 0.0, 0.0, 0.0)
+    return _to_out(item, *_totals(buckets, item.id))
 
 
 @router.patch("/{item_id}", response_model=WBSItemOut)
@@ -141,20 +81,22 @@ async def update_wbs_item(
     item = result.scalar_one_or_none()
     if not item:
         raise HTTPException(status_code=404)
-    for field, value in body.model_dump(exclude_none=True).items():
+    updates = body.model_dump(exclude_none=True)
+    # Only a re-code changes the tree; other edits read the node's stored bucket
+    recode = updates.get("wbs_code", item.wbs_code) != item.wbs_code
+    if recode:
+        before = await begin_wbs_change(db, proposal_id)
+    for field, value in updates.items():
         setattr(item, field, value)
     item.updated_by = current_user.id
-    await db.commit()
+    if recode:
+        buckets = await finish_wbs_change(db, proposal_id, before)
+        await db.commit()
+    else:
+        await db.commit()
+        buckets = await load_financials(db, proposal_id, scope=SCOPE_WBS, keys=[str(item.id)])
     await db.refresh(item)
-
-    # Recompute totals after update
-    all_items_result = await db.execute(
-        select(WBSItem).where(WBSItem.proposal_id == proposal_id)
-    )
-    all_items = all_items_result.scalars().all()
-    hours_map, cost_map, cost_internal_map = await _build_pricing_maps(proposal_id, db)
-    totals = _compute_wbs_totals(all_items, hours_map, cost_map, cost_internal_map)
-    return _to_out(item, *totals.get(item.id, (0.0, 0.0, 0.0)))
+    return _to_out(item, *_totals(buckets, item.id))
 
 
 @router.delete("/{item_id}", status_code=204)
@@ -170,7 +112,9 @@ async def delete_wbs_item(
     item = result.scalar_one_or_none()
     if not item:
         raise HTTPException(status_code=404)
+    before = await begin_wbs_change(db, proposal_id)
     await db.delete(item)
+    await finish_wbs_change(db, proposal_id, before)
     await db.commit()
 
 
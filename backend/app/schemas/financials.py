@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+
+
+class FinancialBucketOut(BaseModel):
+    scope: str    # proposal | phase | team | wbs
+    key: str
+    hours: float
+    billing: float
+    cost: float
+    burdened: float
+
+
+class FinancialMismatchOut(BaseModel):
+    scope: str
+    key: str
+    stored: list[float]
+    expected: list[float]
+
+
+class FinancialsCheckOut(BaseModel):
+    consistent: bool
+    mismatches: list[FinancialMismatchOut] = []
+    rebuilt: bool = False
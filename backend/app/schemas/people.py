@@ -45,3 +45,17 @@ class PersonOut(BaseModel):
     cv_path: Optional[str]
 
     model_config = {"from_attributes": True}
+
+
+class RerateRequest(BaseModel):
+    """Rate card for every person matching ``team`` and/or ``wsp_role``."""
+    team: Optional[str] = None
+    wsp_role: Optional[str] = None
+    cost_rate: Optional[Decimal] = None
+    burdened_rate: Optional[Decimal] = None
+    hourly_rate: Optional[Decimal] = None
+
+
+class RerateOut(BaseModel):
+    people_updated: int
+    pricing_rows_updated: int
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from pydantic import BaseModel
 
@@ -34,3 +34,29 @@ class PricingRowOut(BaseModel):
     total_cost_internal: float
 
     model_config = {"from_attributes": True}
+
+
+class PricingBatchRowUpdate(PricingRowUpdate):
+    id: UUID
+
+
+class PricingBatch(BaseModel):
+    """Creates, updates and deletes applied together in one transaction."""
+    create: List[PricingRowCreate] = []
+    update: List[PricingBatchRowUpdate] = []
+    delete: List[UUID] = []
+
+
+class WBSTotalsOut(BaseModel):
+    wbs_id: UUID
+    total_hours: float
+    total_cost: float
+    total_cost_internal: float
+
+
+class PricingBatchOut(BaseModel):
+    created: List[PricingRowOut]
+    updated: List[PricingRowOut]
+    deleted: List[UUID]
+    # Rolled-up totals for every WBS node whose totals the batch touched
+    wbs_totals: List[WBSTotalsOut]
@@ -0,0 +1,103 @@
+"""
+Wire encodings for proposal WebSocket frames, chosen per connection with the
+``encoding`` query parameter on ``/ws/proposals/{proposal_id}``:
+
+    json      plain ``json.dumps`` text (the default)
+    compact   JSON text with dictionary keys (``"table"`` -> ``"b"``)
+    msgpack   binary msgpack frames with dictionary keys
+
+For compact and msgpack the first frame is the dictionary itself, not
+abbreviated: ``{"type": "keys", "keys": {code: key}}``.  Keys are replaced at
+every depth; a key that already looks like a code, or starts with ``~``, is
+sent with a ``~`` prefix.  Clients always send plain JSON text.
+
+Compression is separate: uvicorn negotiates permessage-deflate with clients
+that offer it (``--ws-per-message-deflate``, on by default), for every
+encoding.
+"""
+import json
+import string
+
+import msgpack
+
+# Most frequent keys in room traffic: edits, batches, presence, job events
+KEYS = (
+    "type", "table", "row_id", "field", "value", "updated_by", "tab", "updates",
+    "members", "set", "left", "job_id", "agent", "status", "result", "error",
+    "offset", "items", "proposal_id", "id", "name", "description", "code",
+    "employee_name", "employee_id", "requested_name", "hours", "rate", "cost",
+)
+CODES = tuple((string.ascii_lowercase + string.ascii_uppercase)[:len(KEYS)])
+_ENCODE = dict(zip(KEYS, CODES))
+_DECODE = dict(zip(CODES, KEYS))
+
+ENCODINGS = ("json", "compact", "msgpack")
+
+
+def available(encoding: str) -> bool:
+    return encoding in ENCODINGS
+
+
+def abbreviate(value):
+    if isinstance(value, dict):
+        out = {}
+        for key, item in value.items():
+            if key in _ENCODE:
+                key = _ENCODE[key]
+            elif key in _DECODE or key.startswith("~"):
+                key = "~" + key
+            out[key] = abbreviate(item)
+        return out
+    if isinstance(value, list):
+        return [abbreviate(item) for item in value]
+    return value
+
+
+def expand(value):
+    """Inverse of ``abbreviate`` (tests, benchmarks and non-browser clients)."""
+    if isinstance(value, dict):
+        return {
+            (key[1:] if key.startswith("~") else _DECODE.get(key, key)): expand(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [expand(item) for item in value]
+    return value
+
+
+def encode(message: dict, encoding: str) -> str | bytes:
+    if encoding == "json":
+        return json.dumps(message)
+    if encoding == "compact":
+        return json.dumps(abbreviate(message), separators=(",", ":"))
+    return msgpack.packb(abbreviate(message))
+
+
+def decode(frame: str | bytes, encoding: str) -> dict:
+    if encoding == "json":
+        return json.loads(frame)
+    if encoding == "compact":
+        return expand(json.loads(frame))
+    return expand(msgpack.unpackb(frame))
+
+
+def key_frame(encoding: str) -> str | bytes | None:
+    """The dictionary frame a connection gets first, or None for plain JSON."""
+    if encoding == "json":
+        return None
+    message = {"type": "keys", "keys": _DECODE}
+    return json.dumps(message) if encoding == "compact" else msgpack.packb(message)
+
+
+class EncodedMessage:
+    """One message, encoded at most once per encoding in use."""
+
+    def __init__(self, message: dict):
+        self.message = message
+        self._frames: dict[str, str | bytes] = {}
+
+    def frame(self, encoding: str) -> str | bytes:
+        frame = self._frames.get(encoding)
+        if frame is None:
+            frame = self._frames[encoding] = encode(self.message, encoding)
+        return frame
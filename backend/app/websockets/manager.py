@@ -1,86 +1,374 @@
 import json
 import asyncio
+import logging
+import time
+import uuid
 from typing import Dict, Set
 from fastapi import WebSocket
 
+from app.config import settings
+from app.websockets.encoding import EncodedMessage, encode, key_frame
+from app.websockets.pubsub import BroadcastBackend, InMemoryBroadcast
+
+logger = logging.getLogger(__name__)
+
+# Close code for evicted slow consumers ("try again later"); the client reconnects
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class _Outbox:
+    """
+    Bounded send queue for one connection, drained by its own writer task so a
+    slow socket only ever delays itself.
+    """
+
+    def __init__(self, ws: WebSocket, on_fail):
+        self.ws = ws
+        self.queue: asyncio.Queue[str | bytes] = asyncio.Queue(maxsize=settings.ws_send_queue_size)
+        self._on_fail = on_fail
+        self.task = asyncio.create_task(self._write())
+
+    def put(self, payload: str | bytes) -> bool:
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    async def _write(self):
+        while True:
+            payload = await self.queue.get()
+            try:
+                send = self.ws.send_text(payload) if isinstance(payload, str) else self.ws.send_bytes(payload)
+                await asyncio.wait_for(send, settings.ws_send_timeout_seconds)
+            except Exception:
+                self._on_fail(self.ws)
+                return
+            finally:
+                self.queue.task_done()
+
 
 class ConnectionManager:
     """
     Manages WebSocket connections grouped by proposal_id rooms.
     Broadcasts field-level edits to all connected clients in a room.
     Message shape: { table, row_id, field, value, updated_by, tab }
+
+    Broadcasting only queues the encoded payload (encoded once per wire
+    encoding in use, see app.websockets.encoding) on each connection's outbox;
+    per-connection writer tasks do the sends.  A connection whose queue fills
+    up or whose send exceeds ``ws_send_timeout_seconds`` is evicted as a slow
+    consumer.
+
+    Rooms span workers: everything sent to a room is also published on the
+    broadcast backend (app.websockets.pubsub) as ``{origin, room, message}``,
+    and each worker delivers other workers' messages to its own sockets.
+    Workers also publish a heartbeat every ``ws_heartbeat_seconds``; members of
+    a worker not heard from for ``ws_peer_timeout_seconds`` (it crashed rather
+    than stopping) are dropped from presence.
+
+    Presence is a per-room map of member id (one per connection, unique across
+    workers) -> [user_name, tab], updated in place as members join, leave or
+    switch tabs, and as other workers report changes.  A new connection gets
+    the whole map::
+
+        {"type": "presence", "members": {id: [user_name, tab]}}
+
+    and everyone else gets the changes, collected per room for
+    ``ws_presence_debounce_seconds`` and sent as one diff::
+
+        {"type": "presence_diff", "set": {id: [user_name, tab]}, "left": [id]}
+
+    so a burst of n joins costs each member one frame, not n full maps.
+
+    Field edits from clients (``queue_edit``) are batched per room for
+    ``ws_edit_batch_seconds``, keeping only the latest value per
+    ``(table, row_id, field)``, and go out as one frame::
+
+        {"type": "batch", "updates": [{table, row_id, field, value, ...}]}
+
+    Senders don't get their own updates back.
     """
 
-    def __init__(self):
+    def __init__(self, backend: BroadcastBackend | None = None):
         # proposal_id -> set of active WebSocket connections
         self._rooms: Dict[str, Set[WebSocket]] = {}
-        # websocket -> (proposal_id, user_name, active_tab)
+        # websocket -> (proposal_id, user_name, active_tab, member_id)
         self._meta: Dict[WebSocket, tuple] = {}
+        self._outboxes: Dict[WebSocket, _Outbox] = {}
+        # websocket -> wire encoding (app.websockets.encoding)
+        self._encodings: Dict[WebSocket, str] = {}
+        # proposal_id -> member_id -> [user_name, tab], members on every worker
+        self._presence: Dict[str, Dict[str, list]] = {}
+        # proposal_id -> member_id -> [user_name, tab] or None (left), not yet sent
+        self._presence_changes: Dict[str, Dict[str, list | None]] = {}
+        self._presence_flushes: Dict[str, asyncio.Task] = {}
+        # proposal_id -> edit key -> (message, sending websocket), not yet sent
+        self._edits: Dict[str, Dict[tuple, tuple]] = {}
+        self._edit_flushes: Dict[str, asyncio.Task] = {}
+        self.origin = uuid.uuid4().hex
+        self._member_seq = 0
+        # Other workers' origin[:12] (their member id prefix) -> when last heard from
+        self._peers: Dict[str, float] = {}
+        self._heartbeat: asyncio.Task | None = None
+        self.backend: BroadcastBackend = backend or InMemoryBroadcast()
+        self.messages_queued = 0
+        self.presence_frames = 0
+        self.edits_in = 0
+        self.edit_frames_out = 0
+        # Frames the same edits would have cost sent one by one
+        self.edit_frames_unbatched = 0
+        self.slow_evictions = 0
+
+    async def start(self, backend: BroadcastBackend | None = None):
+        """Subscribe to the broadcast backend and ask other workers for their presence."""
+        if backend is not None:
+            self.backend = backend
+        await self.backend.start(self._receive)
+        await self._publish(None, hello=True)
+        self._heartbeat = asyncio.create_task(self._beat())
+
+    async def stop(self):
+        """Withdraw this worker's members from every room, then unsubscribe."""
+        if self._heartbeat:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+        for proposal_id in list(self._rooms):
+            left = [meta[3] for meta in self._local_meta(proposal_id)]
+            await self._publish(proposal_id, presence={"set": {}, "left": left})
+        await self.backend.stop()
+
+    async def _publish(self, proposal_id: str | None, **body):
+        await self.backend.publish(json.dumps({"origin": self.origin, "room": proposal_id, **body}))
+
+    async def _beat(self):
+        while True:
+            await asyncio.sleep(settings.ws_heartbeat_seconds)
+            try:
+                await self._publish(None, heartbeat=True)
+            except Exception:
+                logger.warning("Presence heartbeat failed", exc_info=True)
+            self.expire_peers()
+
+    def expire_peers(self, now: float | None = None) -> int:
+        """Drop members of workers silent for ``ws_peer_timeout_seconds``; returns how many."""
+        cutoff = (time.monotonic() if now is None else now) - settings.ws_peer_timeout_seconds
+        silent = {prefix for prefix, heard in self._peers.items() if heard < cutoff}
+        if not silent:
+            return 0
+        for prefix in silent:
+            del self._peers[prefix]
+        dropped = 0
+        for proposal_id, members in list(self._presence.items()):
+            left = [member_id for member_id in members if member_id.split(".", 1)[0] in silent]
+            if not left:
+                continue
+            for member_id in left:
+                del members[member_id]
+            if not members:
+                self._presence.pop(proposal_id, None)
+            self._send_presence_diff(proposal_id, {"set": {}, "left": left})
+            dropped += len(left)
+        return dropped
 
-    async def connect(self, ws: WebSocket, proposal_id: str, user_name: str, tab: str = "wbs"):
+    async def _receive(self, payload: str):
+        """Handle a message another worker published."""
+        envelope = json.loads(payload)
+        if envelope["origin"] == self.origin:
+            return
+        self._peers[envelope["origin"][:12]] = time.monotonic()
+        proposal_id = envelope["room"]
+        if envelope.get("heartbeat"):
+            return
+        if envelope.get("hello"):
+            # A worker just started: tell it who is connected here
+            for room in list(self._rooms):
+                members = {meta[3]: [meta[1], meta[2]] for meta in self._local_meta(room)}
+                await self._publish(room, presence={"set": members, "left": []})
+        elif "presence" in envelope:
+            # Already coalesced by the sending worker
+            diff = envelope["presence"]
+            members = self._presence.setdefault(proposal_id, {})
+            members.update(diff["set"])
+            for member_id in diff["left"]:
+                members.pop(member_id, None)
+            if not members:
+                self._presence.pop(proposal_id, None)
+            self._send_presence_diff(proposal_id, diff)
+        else:
+            self._send_room(proposal_id, envelope["message"])
+
+    async def connect(
+        self, ws: WebSocket, proposal_id: str, user_name: str, tab: str = "wbs", encoding: str = "json"
+    ):
+        """Join the room; ``encoding`` (app.websockets.encoding) applies to every frame sent to ``ws``."""
         await ws.accept()
         if proposal_id not in self._rooms:
             self._rooms[proposal_id] = set()
         self._rooms[proposal_id].add(ws)
-        self._meta[ws] = (proposal_id, user_name, tab)
-        await self._broadcast_presence(proposal_id)
+        self._member_seq += 1
+        member_id = f"{self.origin[:12]}.{self._member_seq}"
+        self._meta[ws] = (proposal_id, user_name, tab, member_id)
+        self._encodings[ws] = encoding
+        self._outboxes[ws] = _Outbox(ws, self._evict)
+        keys = key_frame(encoding)
+        if keys is not None:
+            self._put(ws, keys)
+        self._set_presence(proposal_id, member_id, [user_name, tab])
+        snapshot = {"type": "presence", "members": self._presence[proposal_id]}
+        if self._put(ws, encode(snapshot, encoding)):
+            self.presence_frames += 1
 
     def disconnect(self, ws: WebSocket):
         meta = self._meta.pop(ws, None)
         if not meta:
             return
+        self._encodings.pop(ws, None)
+        outbox = self._outboxes.pop(ws, None)
+        if outbox and outbox.task is not asyncio.current_task():
+            outbox.task.cancel()
         proposal_id = meta[0]
         room = self._rooms.get(proposal_id, set())
         room.discard(ws)
         if not room:
             self._rooms.pop(proposal_id, None)
-        # Fire-and-forget presence update
-        asyncio.create_task(self._broadcast_presence(proposal_id))
+        self._set_presence(proposal_id, meta[3], None)
+
+    def _evict(self, ws: WebSocket):
+        """Drop a connection that can't keep up; closing it makes the client reconnect."""
+        if ws not in self._meta:
+            return
+        self.slow_evictions += 1
+        self.disconnect(ws)
+        asyncio.create_task(self._close(ws))
+
+    @staticmethod
+    async def _close(ws: WebSocket):
+        try:
+            await asyncio.wait_for(ws.close(code=SLOW_CONSUMER_CLOSE_CODE), settings.ws_send_timeout_seconds)
+        except Exception:
+            pass
 
     async def update_tab(self, ws: WebSocket, tab: str):
         meta = self._meta.get(ws)
-        if meta:
-            proposal_id, user_name, _ = meta
-            self._meta[ws] = (proposal_id, user_name, tab)
-            await self._broadcast_presence(proposal_id)
+        if meta and meta[2] != tab:
+            proposal_id, user_name, _, member_id = meta
+            self._meta[ws] = (proposal_id, user_name, tab, member_id)
+            self._set_presence(proposal_id, member_id, [user_name, tab])
+
+    def _local_meta(self, proposal_id: str) -> list[tuple]:
+        return [self._meta[ws] for ws in list(self._rooms.get(proposal_id, ())) if ws in self._meta]
+
+    def _set_presence(self, proposal_id: str, member_id: str, value: list | None):
+        """Apply a local member change now; tell the room (and other workers) after the debounce window."""
+        members = self._presence.setdefault(proposal_id, {})
+        if value is None:
+            members.pop(member_id, None)
+            if not members:
+                self._presence.pop(proposal_id, None)
+        else:
+            members[member_id] = value
+        self._presence_changes.setdefault(proposal_id, {})[member_id] = value
+        if proposal_id not in self._presence_flushes:
+            self._presence_flushes[proposal_id] = asyncio.create_task(self._flush_presence(proposal_id))
+
+    async def _flush_presence(self, proposal_id: str):
+        try:
+            await asyncio.sleep(settings.ws_presence_debounce_seconds)
+        finally:
+            self._presence_flushes.pop(proposal_id, None)
+            changes = self._presence_changes.pop(proposal_id, {})
+        diff = {
+            "set": {member_id: value for member_id, value in changes.items() if value is not None},
+            "left": [member_id for member_id, value in changes.items() if value is None],
+        }
+        self._send_presence_diff(proposal_id, diff)
+        await self._publish(proposal_id, presence=diff)
+
+    def _send_presence_diff(self, proposal_id: str, diff: dict):
+        room = self._rooms.get(proposal_id)
+        if room:
+            self.presence_frames += len(room)
+            self._send_room(proposal_id, {"type": "presence_diff", **diff})
+
+    def _put(self, ws: WebSocket, payload: str | bytes) -> bool:
+        outbox = self._outboxes.get(ws)
+        if outbox is None:
+            return False
+        if not outbox.put(payload):
+            self._evict(ws)
+            return False
+        self.messages_queued += 1
+        return True
+
+    def _send_room(self, proposal_id: str, message: dict, exclude: WebSocket | None = None):
+        encoded = EncodedMessage(message)
+        for ws in list(self._rooms.get(proposal_id, ())):
+            if ws is not exclude:
+                self._put(ws, encoded.frame(self._encodings[ws]))
 
     async def broadcast(self, proposal_id: str, message: dict, exclude: WebSocket | None = None):
-        """Send a data-change message to all connections in the room."""
-        room = self._rooms.get(proposal_id, set())
-        dead: list[WebSocket] = []
-        payload = json.dumps(message)
-        for ws in list(room):
-            if ws is exclude:
-                continue
-            try:
-                await ws.send_text(payload)
-            except Exception:
-                dead.append(ws)
-        for ws in dead:
-            self.disconnect(ws)
+        """Send a data-change message to all connections in the room, on every worker."""
+        self._send_room(proposal_id, message, exclude)
+        await self._publish(proposal_id, message=message)
 
-    async def _broadcast_presence(self, proposal_id: str):
-        """Broadcast current user-tab presence to all in the room."""
-        room = self._rooms.get(proposal_id, set())
-        if not room:
-            return
-        # Build presence map: tab -> list of user names
-        presence: Dict[str, list] = {}
-        for ws in list(room):
-            meta = self._meta.get(ws)
-            if meta:
-                _, user_name, tab = meta
-                presence.setdefault(tab, []).append(user_name)
-
-        payload = json.dumps({"type": "presence", "presence": presence})
-        dead: list[WebSocket] = []
-        for ws in list(room):
-            try:
-                await ws.send_text(payload)
-            except Exception:
-                dead.append(ws)
-        for ws in dead:
-            self.disconnect(ws)
+    def queue_edit(self, proposal_id: str, message: dict, sender: WebSocket | None = None):
+        """Add a client's edit to the room's next batch; a later edit of the same field replaces it."""
+        self.edits_in += 1
+        self.edit_frames_unbatched += len(self._rooms.get(proposal_id, ())) - (sender is not None)
+        if all(k in message for k in ("table", "row_id", "field")):
+            # Client-supplied, so possibly lists or objects: compare as strings
+            key = tuple(str(message[k]) for k in ("table", "row_id", "field"))
+        else:
+            # Not a field edit (e.g. a row insert): never coalesced
+            key = (self.edits_in,)
+        edits = self._edits.setdefault(proposal_id, {})
+        # Re-insert so the batch keeps the order of each field's latest edit
+        edits.pop(key, None)
+        edits[key] = (message, sender)
+        if proposal_id not in self._edit_flushes:
+            self._edit_flushes[proposal_id] = asyncio.create_task(self._flush_edits(proposal_id))
+
+    async def _flush_edits(self, proposal_id: str):
+        try:
+            await asyncio.sleep(settings.ws_edit_batch_seconds)
+        finally:
+            self._edit_flushes.pop(proposal_id, None)
+            edits = list(self._edits.pop(proposal_id, {}).values())
+        batch = {"type": "batch", "updates": [message for message, _ in edits]}
+        encoded = EncodedMessage(batch)
+        senders = {sender for _, sender in edits if sender is not None}
+        for ws in list(self._rooms.get(proposal_id, ())):
+            if ws in senders:
+                updates = [message for message, sender in edits if sender is not ws]
+                own = {"type": "batch", "updates": updates}
+                sent = bool(updates) and self._put(ws, encode(own, self._encodings[ws]))
+            else:
+                sent = self._put(ws, encoded.frame(self._encodings[ws]))
+            self.edit_frames_out += sent
+        await self._publish(proposal_id, message=batch)
+
+    async def drain(self):
+        """Wait for pending batches and queued messages to be sent (tests, benchmarks, shutdown)."""
+        await asyncio.gather(
+            *list(self._edit_flushes.values()), *list(self._presence_flushes.values()), return_exceptions=True
+        )
+        await asyncio.gather(*(outbox.queue.join() for outbox in list(self._outboxes.values())))
+
+    def stats(self) -> dict:
+        depths = [outbox.queue.qsize() for outbox in self._outboxes.values()]
+        return {
+            "rooms": len(self._rooms),
+            "connections": len(self._outboxes),
+            "messages_queued": self.messages_queued,
+            "slow_evictions": self.slow_evictions,
+            "max_queue_depth": max(depths, default=0),
+            "broadcast_backend": type(self.backend).__name__,
+            "presence_frames": self.presence_frames,
+            "edits_in": self.edits_in,
+            "edit_frames_out": self.edit_frames_out,
+            "edit_frames_unbatched": self.edit_frames_unbatched,
+        }
 
 
 # Singleton shared across the app
@@ -0,0 +1,218 @@
+"""
+Broadcast backends that carry room messages between API workers.
+
+Each worker's ``ConnectionManager`` only holds its own sockets.  Every message
+it sends to a room is also published here, and every worker subscribed to the
+backend delivers it to its local members of that room, so a room spans all
+workers and hosts.
+
+``InMemoryBroadcast``   instances sharing a hub (a list) see each other's
+                        messages; one instance alone is a single-worker no-op.
+                        Used in tests and for ``uvicorn --workers 1``.
+``PostgresBroadcast``   LISTEN/NOTIFY on ``ws_broadcast_channel`` through a
+                        dedicated asyncpg connection (not the SQLAlchemy pool).
+
+Payloads are strings.  NOTIFY payloads are limited to 8000 bytes, so larger
+messages (job results) are split into numbered chunks and reassembled by the
+receivers; notifications from one session arrive in order.
+"""
+import asyncio
+import logging
+import uuid
+from typing import Awaitable, Callable, Protocol
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+Receive = Callable[[str], Awaitable[None]]
+
+# Largest NOTIFY payload we send; the server limit is 8000 bytes
+NOTIFY_CHUNK_SIZE = 7900
+# Seconds between attempts to re-establish a lost LISTEN connection
+RECONNECT_SECONDS = 2.0
+
+
+class BroadcastBackend(Protocol):
+    async def start(self, receive: Receive) -> None: ...
+    async def publish(self, payload: str) -> None: ...
+    async def stop(self) -> None: ...
+
+
+class InMemoryBroadcast:
+    """Delivers to the other backends sharing ``hub``."""
+
+    def __init__(self, hub: list | None = None):
+        self.hub = hub if hub is not None else []
+        self._receive: Receive | None = None
+
+    async def start(self, receive: Receive) -> None:
+        self._receive = receive
+        self.hub.append(self)
+
+    async def publish(self, payload: str) -> None:
+        if self._receive is None:
+            # Not started, or stopped: like a lost connection, nothing goes out
+            return
+        for other in list(self.hub):
+            if other is not self and other._receive is not None:
+                await other._receive(payload)
+
+    async def stop(self) -> None:
+        if self in self.hub:
+            self.hub.remove(self)
+        self._receive = None
+
+
+def _asyncpg_dsn(url: str) -> str:
+    return url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+def split_payload(payload: str, size: int = NOTIFY_CHUNK_SIZE) -> list[str]:
+    """
+    ``payload`` as NOTIFY-sized strings.  Short payloads go as-is (they are JSON,
+    so start with ``{``); long ones become ``<id>:<index>:<total>:<part>``.
+    Payloads are ASCII (``json.dumps`` escapes the rest), so characters = bytes.
+    """
+    if len(payload) <= size:
+        return [payload]
+    message_id = uuid.uuid4().hex
+    parts = [payload[i:i + size] for i in range(0, len(payload), size)]
+    return [f"{message_id}:{i}:{len(parts)}:{part}" for i, part in enumerate(parts)]
+
+
+class ChunkAssembler:
+    """Reassembles ``split_payload`` chunks; returns whole payloads."""
+
+    def __init__(self, max_pending: int = 256):
+        self.max_pending = max_pending
+        self._pending: dict[str, list] = {}
+
+    def add(self, chunk: str) -> str | None:
+        if chunk.startswith("{"):
+            return chunk
+        message_id, index, total, part = chunk.split(":", 3)
+        parts = self._pending.get(message_id)
+        if parts is None:
+            if len(self._pending) >= self.max_pending:
+                # A sender died mid-message; forget its oldest partial payload
+                self._pending.pop(next(iter(self._pending)))
+            parts = self._pending[message_id] = [None] * int(total)
+        parts[int(index)] = part
+        if any(p is None for p in parts):
+            return None
+        del self._pending[message_id]
+        return "".join(parts)
+
+
+class PostgresBroadcast:
+    """
+    LISTEN/NOTIFY on one dedicated connection.  Publishing is queued and sent by
+    a writer task, so a broadcast never waits on the database; notifications
+    are queued too and handled in order by a reader task.  While the
+    connection is down, messages for other workers are dropped (local delivery
+    is unaffected) and it is re-established every ``RECONNECT_SECONDS``.
+    """
+
+    def __init__(self, dsn: str, channel: str):
+        self.dsn = dsn
+        self.channel = channel
+        self._receive: Receive | None = None
+        self._conn = None
+        self._outgoing: asyncio.Queue[str] = asyncio.Queue(maxsize=settings.ws_send_queue_size * 4)
+        self._incoming: asyncio.Queue[str] = asyncio.Queue()
+        self._assembler = ChunkAssembler()
+        self._task: asyncio.Task | None = None
+        self._reader: asyncio.Task | None = None
+        self._reconnecting: asyncio.Task | None = None
+        self.dropped = 0
+
+    async def start(self, receive: Receive) -> None:
+        self._receive = receive
+        self._reader = asyncio.create_task(self._read())
+        await self._connect()
+        self._task = asyncio.create_task(self._write())
+
+    async def _connect(self) -> None:
+        import asyncpg
+
+        conn = await asyncpg.connect(self.dsn, statement_cache_size=0)
+        conn.add_termination_listener(self._on_lost)
+        await conn.add_listener(self.channel, self._on_notify)
+        self._conn = conn
+
+    def _on_lost(self, _conn) -> None:
+        self._conn = None
+        if self._receive is not None and self._reconnecting is None:
+            self._reconnecting = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        try:
+            while self._conn is None:
+                await asyncio.sleep(RECONNECT_SECONDS)
+                try:
+                    await self._connect()
+                except Exception:
+                    logger.warning("Broadcast LISTEN connection failed; retrying", exc_info=True)
+        finally:
+            self._reconnecting = None
+
+    def _on_notify(self, _conn, _pid, _channel, chunk: str) -> None:
+        payload = self._assembler.add(chunk)
+        if payload is not None:
+            self._incoming.put_nowait(payload)
+
+    async def _read(self) -> None:
+        while True:
+            payload = await self._incoming.get()
+            try:
+                if self._receive is not None:
+                    await self._receive(payload)
+            except Exception:
+                logger.warning("Broadcast message handling failed", exc_info=True)
+
+    async def publish(self, payload: str) -> None:
+        for chunk in split_payload(payload):
+            try:
+                self._outgoing.put_nowait(chunk)
+            except asyncio.QueueFull:
+                self.dropped += 1
+
+    async def _write(self) -> None:
+        while True:
+            chunk = await self._outgoing.get()
+            try:
+                if self._conn is None:
+                    self.dropped += 1
+                else:
+                    await self._conn.execute("SELECT pg_notify($1, $2)", self.channel, chunk)
+            except Exception:
+                self.dropped += 1
+                logger.warning("Broadcast NOTIFY failed", exc_info=True)
+            finally:
+                self._outgoing.task_done()
+
+    async def stop(self) -> None:
+        if self._task:
+            # Let the last messages (e.g. presence departures) go out first
+            try:
+                await asyncio.wait_for(self._outgoing.join(), settings.ws_send_timeout_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._task.cancel()
+            self._task = None
+        self._receive = None
+        if self._reader:
+            self._reader.cancel()
+            self._reader = None
+        if self._reconnecting:
+            self._reconnecting.cancel()
+        if self._conn is not None and not self._conn.is_closed():
+            await self._conn.close()
+        self._conn = None
+
+
+def build_backend() -> BroadcastBackend:
+    if settings.ws_broadcast_backend == "postgres":
+        return PostgresBroadcast(_asyncpg_dsn(settings.async_database_url), settings.ws_broadcast_channel)
+    return InMemoryBroadcast()
@@ -0,0 +1,115 @@
+"""
+CV name matching: linear scans vs. NameIndex over a large staff directory.
+
+Builds a synthetic directory (default 50,000 employees) and resolves batches of
+requested names the way a CV fetch does: exact names, single surnames or first
+names (token matches), and misspellings (fuzzy).  The linear matcher is the
+scan ``cv_fetcher.match_cv`` used before the index: exact pass, then token
+containment pass, each over the whole directory.
+
+    python -m benchmarks.bench_cv_index
+    python -m benchmarks.bench_cv_index --staff 100000 --batch 30 --batches 20
+
+Run from backend/.
+"""
+import argparse
+import random
+import statistics
+import time
+
+from app.agents.cv_index import NameIndex
+
+FIRST = [
+    "sarah", "james", "priya", "tom", "anika", "wei", "olivia", "liam", "noah", "emma", "mohammed", "fatima",
+    "lucas", "chloe", "arjun", "mei", "daniel", "grace", "kofi", "amara", "mateo", "sofia", "hiroshi", "yuki",
+    "ethan", "zara", "oscar", "ines", "raj", "leila", "henry", "isla", "samuel", "nina", "david", "hannah",
+]
+SYLLABLES = ["ka", "ren", "tor", "mi", "son", "vel", "an", "dra", "lo", "ber", "chi", "fitz", "gar", "ok", "afor",
+             "nair", "sh", "ma", "ley", "wood", "ton", "ri", "el", "zen", "ham", "bro", "ck", "ste", "in"]
+
+
+def synthetic_directory(size: int, rng: random.Random) -> list[dict]:
+    surnames = sorted({"".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))) for _ in range(size // 4)})
+    return [
+        {
+            "employee_id": f"WSP-{i:06d}",
+            "employee_name": f"{rng.choice(FIRST).title()} {rng.choice(surnames).title()}",
+        }
+        for i in range(size)
+    ]
+
+
+def misspell(name: str, rng: random.Random) -> str:
+    i = rng.randrange(1, len(name) - 1)
+    return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+
+
+def requested_names(directory: list[dict], count: int, rng: random.Random) -> list[str]:
+    names = []
+    for _ in range(count):
+        full = rng.choice(directory)["employee_name"]
+        kind = rng.random()
+        if kind < 0.6:
+            names.append(full)
+        elif kind < 0.85:
+            names.append(full.split()[-1])
+        else:
+            names.append(misspell(full, rng))
+    return names
+
+
+def linear_match(directory: list[dict], name: str) -> dict | None:
+    name_lower = name.lower()
+    candidate = next((cv for cv in directory if cv["employee_name"].lower() == name_lower), None)
+    if not candidate:
+        candidate = next(
+            (cv for cv in directory if any(part in name_lower for part in cv["employee_name"].lower().split())),
+            None,
+        )
+    return candidate
+
+
+def time_batches(match, batches: list[list[str]]) -> list[float]:
+    samples = []
+    for names in batches:
+        start = time.perf_counter()
+        for name in names:
+            match(name)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--staff", type=int, default=50_000)
+    parser.add_argument("--batch", type=int, default=30, help="names per CV fetch")
+    parser.add_argument("--batches", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    directory = synthetic_directory(args.staff, rng)
+    batches = [requested_names(directory, args.batch, rng) for _ in range(args.batches)]
+
+    start = time.perf_counter()
+    index = NameIndex(directory)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    index.upsert([{"employee_id": "WSP-000000", "employee_name": "Renamed Person"}])
+    refresh_ms = (time.perf_counter() - start) * 1000
+
+    linear = time_batches(lambda n: linear_match(directory, n), batches)
+    indexed = time_batches(index.match, batches)
+
+    print(f"directory: {len(directory)} employees, {args.batches} batches of {args.batch} names")
+    print(f"index build: {build_ms:.1f} ms, single-entry refresh: {refresh_ms:.3f} ms")
+    print(f"{'matcher':>8} {'p50 ms/batch':>13} {'max ms/batch':>13} {'us/name':>9}")
+    for label, samples in (("linear", linear), ("index", indexed)):
+        p50 = statistics.median(samples) * 1000
+        print(f"{label:>8} {p50:>13.2f} {max(samples) * 1000:>13.2f} {p50 * 1000 / args.batch:>9.1f}")
+    print(f"speedup: {statistics.median(linear) / statistics.median(indexed):.0f}x")
+
+
+if __name__ == "__main__":
+    main()
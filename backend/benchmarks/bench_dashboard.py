@@ -0,0 +1,136 @@
+"""
+Dashboard latency vs. database round-trip time.
+
+Compares the previous dashboard query pattern (proposal lookup, pricing scan,
+ten sequential COUNT(*)s and a schedule range query) with the single combined
+``dashboard_stats_query``.  Every ``execute`` is delayed by a simulated network
+RTT, so the gap between the two grows with round trips x RTT.
+
+    python -m benchmarks.bench_dashboard                      # stub DB, RTT only
+    python -m benchmarks.bench_dashboard --database <proposal_id>  # against settings.database_url
+
+Run from backend/.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from sqlalchemy import select, func
+
+from app.models.proposal import Proposal
+from app.models.pricing import PricingRow
+from app.models.people import ProposedPerson
+from app.models.schedule import ScheduleItem
+from app.routes.dashboard import COUNTED_MODELS, build_dashboard
+
+
+class _StubRow:
+    def __getattr__(self, name):
+        return None
+
+    def __getitem__(self, index):
+        return None
+
+
+class _StubResult:
+    def one(self):
+        return _StubRow()
+
+    def all(self):
+        return []
+
+    def scalar(self):
+        return 0
+
+    def scalar_one_or_none(self):
+        return None
+
+
+class RTTSession:
+    """Wraps a session (or stands in for one) adding ``rtt`` seconds to every execute."""
+
+    def __init__(self, rtt: float, inner=None):
+        self.rtt = rtt
+        self.inner = inner
+        self.round_trips = 0
+
+    async def execute(self, *args, **kwargs):
+        self.round_trips += 1
+        await asyncio.sleep(self.rtt)
+        if self.inner is None:
+            return _StubResult()
+        return await self.inner.execute(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+
+async def legacy_dashboard(proposal_id, db):
+    """The query sequence get_dashboard issued before the combined statement."""
+    await db.execute(select(Proposal).where(Proposal.id == proposal_id))
+    (await db.execute(
+        select(PricingRow, ProposedPerson.burdened_rate)
+        .outerjoin(ProposedPerson, PricingRow.person_id == ProposedPerson.id)
+        .where(PricingRow.proposal_id == proposal_id)
+    )).all()
+    for label, model in COUNTED_MODELS.items():
+        if label == "pricing_count":
+            continue
+        (await db.execute(select(func.count()).where(model.proposal_id == proposal_id))).scalar()
+    (await db.execute(
+        select(func.min(ScheduleItem.start_date), func.max(ScheduleItem.end_date))
+        .where(ScheduleItem.proposal_id == proposal_id)
+    )).one()
+
+
+async def combined_dashboard(proposal_id, db):
+    await build_dashboard(proposal_id, db)
+
+
+async def measure(fn, proposal_id, rtt, iterations, session_factory):
+    samples = []
+    trips = 0
+    for _ in range(iterations):
+        if session_factory is None:
+            db = RTTSession(rtt)
+            start = time.perf_counter()
+            await fn(proposal_id, db)
+            samples.append(time.perf_counter() - start)
+            trips = db.round_trips
+        else:
+            async with session_factory() as inner:
+                db = RTTSession(rtt, inner)
+                start = time.perf_counter()
+                await fn(proposal_id, db)
+                samples.append(time.perf_counter() - start)
+                trips = db.round_trips
+    return trips, statistics.median(samples) * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", metavar="PROPOSAL_ID", help="run against the configured database")
+    parser.add_argument("--rtt", type=float, nargs="+", default=[0.0, 1.0, 5.0, 20.0], help="simulated RTTs in ms")
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    session_factory = None
+    proposal_id = uuid.uuid4()
+    if args.database:
+        from app.db.session import AsyncSessionLocal
+        session_factory = AsyncSessionLocal
+        proposal_id = uuid.UUID(args.database)
+
+    print(f"{'rtt ms':>7} {'legacy trips':>13} {'legacy p50 ms':>14} {'combined trips':>15} {'combined p50 ms':>16} {'speedup':>8}")
+    for rtt_ms in args.rtt:
+        rtt = rtt_ms / 1000
+        lt, lp = await measure(legacy_dashboard, proposal_id, rtt, args.iterations, session_factory)
+        ct, cp = await measure(combined_dashboard, proposal_id, rtt, args.iterations, session_factory)
+        speedup = lp / cp if cp else float("inf")
+        print(f"{rtt_ms:>7.1f} {lt:>13} {lp:>14.2f} {ct:>15} {cp:>16.2f} {speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+"""
+WebSocket bandwidth per encoding, with and without permessage-deflate.
+
+Replays a synthetic editing session on a large pricing grid: batches of
+pricing_rows edits from several collaborators, presence diffs, and agent job
+events with result items.  Every frame is encoded as ``json``, ``compact`` and
+``msgpack``, then counted raw and compressed the way permessage-deflate does
+it (raw deflate with the context carried across messages, sync flush,
+trailing 4 bytes dropped).
+
+    python -m benchmarks.bench_ws_encoding
+    python -m benchmarks.bench_ws_encoding --rows 2000 --frames 5000
+
+Run from backend/.
+"""
+import argparse
+import random
+import zlib
+
+from app.websockets import encoding
+
+FIELDS = ["description", "hours", "rate", "cost", "discipline", "grade", "notes"]
+USERS = ["Sarah Chen", "James Okafor", "Priya Raman", "Tom Walsh", "Ana Souza", "Lee Morgan"]
+TABS = ["wbs", "pricing", "people", "scope", "schedule"]
+
+
+def edit(rng: random.Random, rows: int) -> dict:
+    field = rng.choice(FIELDS)
+    value = round(rng.uniform(0, 5000), 2) if field in ("hours", "rate", "cost") else f"Item {rng.randrange(10000)}"
+    return {
+        "table": "pricing_rows",
+        "row_id": f"{rng.randrange(rows):08x}-1c2d-4e5f-8a9b-{rng.randrange(16 ** 12):012x}",
+        "field": field,
+        "value": value,
+        "updated_by": rng.choice(USERS),
+        "tab": "pricing",
+    }
+
+
+def session(rng: random.Random, rows: int, frames: int) -> list[dict]:
+    messages = []
+    for _ in range(frames):
+        kind = rng.random()
+        if kind < 0.8:
+            messages.append({"type": "batch", "updates": [edit(rng, rows) for _ in range(rng.randint(1, 4))]})
+        elif kind < 0.9:
+            member = f"{rng.randrange(16 ** 12):012x}.{rng.randrange(100)}"
+            messages.append({"type": "presence_diff", "set": {member: [rng.choice(USERS), rng.choice(TABS)]}, "left": []})
+        else:
+            items = [
+                {"requested_name": name, "employee_name": name, "employee_id": f"WSP-AU-{rng.randrange(10000)}"}
+                for name in rng.sample(USERS, 3)
+            ]
+            messages.append({"type": "job_partial", "job_id": f"cv_fetcher.{rng.randrange(16 ** 32):032x}",
+                             "agent": "cv_fetcher", "status": "running", "offset": 0, "items": items})
+    return messages
+
+
+def deflated(frames: list) -> int:
+    compressor = zlib.compressobj(wbits=-15)
+    total = 0
+    for frame in frames:
+        data = frame.encode() if isinstance(frame, str) else frame
+        total += len(compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)) - 4
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    messages = session(random.Random(args.seed), args.rows, args.frames)
+    print(f"{len(messages)} frames over a {args.rows}-row pricing grid")
+    print(f"{'encoding':>9} {'raw KB':>9} {'vs json':>8} {'deflate KB':>11} {'vs json':>8}")
+    baseline = None
+    for name in encoding.ENCODINGS:
+        frames = [encoding.encode(message, name) for message in messages]
+        assert all(encoding.decode(frame, name) == message for frame, message in zip(frames, messages))
+        raw = sum(len(frame.encode() if isinstance(frame, str) else frame) for frame in frames)
+        packed = deflated(frames)
+        baseline = baseline or (raw, packed)
+        print(f"{name:>9} {raw / 1024:>9.1f} {raw / baseline[0]:>7.0%} {packed / 1024:>11.1f} {packed / baseline[0]:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+WebSocket room fan-out latency with slow consumers.
+
+A room of fake sockets (default 50) where a few are slow (each send takes
+``--slow-ms``).  Messages are broadcast at a fixed rate and we record, for
+every fast client, the time from ``broadcast`` to its ``send_text`` finishing.
+"serial" is the previous ``broadcast`` (await each send in turn); "queued" is
+``ConnectionManager`` with per-connection outboxes, which also evicts the slow
+clients once their queues fill or a send times out.
+
+    python -m benchmarks.bench_ws_fanout
+    python -m benchmarks.bench_ws_fanout --clients 50 --slow 3 --slow-ms 200 --messages 200
+
+Run from backend/.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from app.config import settings
+from app.websockets.manager import ConnectionManager
+
+
+class FakeSocket:
+    def __init__(self, delay: float, sent_at: dict, samples: list[float] | None):
+        self.delay = delay
+        self.sent_at = sent_at
+        self.samples = samples
+
+    async def accept(self):
+        pass
+
+    async def close(self, code: int = 1000):
+        pass
+
+    async def send_text(self, payload: str):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        else:
+            await asyncio.sleep(0)
+        message = json.loads(payload)
+        if self.samples is not None and "seq" in message:
+            self.samples.append(time.perf_counter() - self.sent_at[message["seq"]])
+
+
+async def serial_broadcast(sockets: list[FakeSocket], message: dict):
+    payload = json.dumps(message)
+    for ws in sockets:
+        await ws.send_text(payload)
+
+
+def room(args, sent_at: dict, samples: list[float]) -> list[FakeSocket]:
+    slow = [FakeSocket(args.slow_ms / 1000, sent_at, None) for _ in range(args.slow)]
+    fast = [FakeSocket(0, sent_at, samples) for _ in range(args.clients - args.slow)]
+    # Slow clients first: the worst case for a serial loop
+    return slow + fast
+
+
+async def run_serial(args) -> list[float]:
+    sent_at, samples = {}, []
+    sockets = room(args, sent_at, samples)
+    pending = []
+    for seq in range(args.messages):
+        sent_at[seq] = time.perf_counter()
+        # Edits keep arriving while earlier broadcasts are still sending
+        pending.append(asyncio.create_task(serial_broadcast(sockets, {"seq": seq, "table": "pricing_rows"})))
+        await asyncio.sleep(args.interval_ms / 1000)
+    await asyncio.gather(*pending)
+    return samples
+
+
+async def run_queued(args) -> tuple[list[float], dict]:
+    sent_at, samples = {}, []
+    manager = ConnectionManager()
+    for ws in room(args, sent_at, samples):
+        await manager.connect(ws, "bench", "user")
+    await manager.drain()
+    for seq in range(args.messages):
+        sent_at[seq] = time.perf_counter()
+        await manager.broadcast("bench", {"seq": seq, "table": "pricing_rows"})
+        await asyncio.sleep(args.interval_ms / 1000)
+    await manager.drain()
+    return samples, manager.stats()
+
+
+def report(label: str, samples: list[float]):
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(f"{label:>7} {len(samples):>9} {statistics.median(samples) * 1000:>9.2f} {p99 * 1000:>9.2f} {ordered[-1] * 1000:>9.2f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--slow", type=int, default=3)
+    parser.add_argument("--slow-ms", type=float, default=200.0)
+    parser.add_argument("--messages", type=int, default=100)
+    parser.add_argument("--interval-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    print(f"{args.clients} clients ({args.slow} taking {args.slow_ms:g} ms per send), "
+          f"{args.messages} messages every {args.interval_ms:g} ms, "
+          f"queue {settings.ws_send_queue_size}, send timeout {settings.ws_send_timeout_seconds:g}s")
+    print(f"{'mode':>7} {'deliveries':>9} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    report("serial", await run_serial(args))
+    samples, stats = await run_queued(args)
+    report("queued", samples)
+    print(f"slow consumers evicted: {stats['slow_evictions']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
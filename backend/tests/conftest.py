@@ -1,12 +1,22 @@
+import os
 import pytest
+import pytest_asyncio
 import uuid
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from app.auth.jwt import create_access_token
 from app.auth.deps import get_current_user
+from app.db.base import Base
 from app.db.session import get_db
 from app.main import app
+from app.models import Proposal, ProposedPerson, WBSItem
 from app.models.user import User, UserRole
 
+# Real Postgres for tests that need one (asyncpg URL); they skip without it
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
 
 # A fake user returned by the overridden dependency in all auth-guarded tests
 FAKE_USER_ID = uuid.uuid4()
@@ -46,3 +56,52 @@ def auth_headers():
     token = create_access_token({"sub": str(FAKE_USER_ID)})
     yield {"Authorization": f"Bearer {token}"}
     app.dependency_overrides.clear()
+
+
+# On the test's own loop: the engine's connections must not outlive it
+@pytest_asyncio.fixture(loop_scope="function")
+async def pg_proposal():
+    """
+    A proposal in a throwaway Postgres schema, with WBS nodes 1 and 1.1 and one
+    person, served to the routes through get_db.  Skips without TEST_DATABASE_URL.
+    """
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL not set")
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    admin = create_async_engine(TEST_DATABASE_URL)
+    async with admin.begin() as conn:
+        await conn.execute(text(f"CREATE SCHEMA {schema}"))
+    engine = create_async_engine(TEST_DATABASE_URL, connect_args={"server_settings": {"search_path": schema}})
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        async with sessions() as db:
+            db.add(User(id=FAKE_USER_ID, name="Test User", email="test@wsp.com", role=UserRole.pm, password_hash=""))
+            proposal = Proposal(proposal_number="P-TEST", title="Test proposal")
+            db.add(proposal)
+            await db.flush()
+            parent = WBSItem(proposal_id=proposal.id, wbs_code="1", order_index=0)
+            leaf = WBSItem(proposal_id=proposal.id, wbs_code="1.1", order_index=1)
+            person = ProposedPerson(
+                proposal_id=proposal.id, employee_name="Sarah Chen", team="Roads",
+                hourly_rate=200, cost_rate=90, burdened_rate=120,
+            )
+            db.add_all([parent, leaf, person])
+            await db.commit()
+
+        async def get_test_db():
+            async with sessions() as session:
+                yield session
+
+        app.dependency_overrides[get_current_user] = override_get_current_user
+        app.dependency_overrides[get_db] = get_test_db
+        yield SimpleNamespace(
+            id=proposal.id, parent_id=parent.id, leaf_id=leaf.id, person_id=person.id, sessions=sessions
+        )
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
+        async with admin.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+        await admin.dispose()
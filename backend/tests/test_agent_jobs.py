@@ -0,0 +1,277 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient, ASGITransport
+from app.agents import cv_fetcher, drawings_fetcher
+from app.agents.fakes import fake_transport
+from app.agents.http import build_client, use_client
+from app.agents.jobs import SQLiteJobStore, job_store
+from app.agents.results import agent_results, result_key
+from app.agents.scheduler import AgentScheduler, drop_job, execute_job, outcomes, reap_jobs, scheduler
+from app.config import settings
+from app.main import app
+from app.websockets.manager import manager
+
+
+@pytest.fixture
+def sqlite_jobs(tmp_path):
+    previous = job_store.backend
+    backend = SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+    job_store.use_backend(backend)
+    agent_results.clear()
+    yield backend
+    job_store.use_backend(previous)
+    agent_results.clear()
+
+
+# On the test's own loop: the socket's writer task must run while the test does
+@pytest_asyncio.fixture(loop_scope="function")
+async def room():
+    """Messages (other than presence) pushed to a socket connected to proposal p-9."""
+    sent: list[dict] = []
+
+    class FakeSocket:
+        async def accept(self):
+            pass
+
+        async def send_text(self, payload):
+            message = json.loads(payload)
+            if not message["type"].startswith("presence"):
+                sent.append(message)
+
+    ws = FakeSocket()
+    await manager.connect(ws, "p-9", "Test User")
+    yield sent
+    manager.disconnect(ws)
+    await manager.drain()
+
+
+@pytest.fixture
+def fake_agents():
+    """Shared agent client answered by the in-process fakes with a given latency."""
+    def install(latency: float = 0.0):
+        use_client(build_client(fake_transport(latency)))
+
+    install()
+    yield install
+    use_client(None)
+
+
+async def test_sqlite_store_round_trips_and_evicts(sqlite_jobs):
+    job = await job_store.create("cv_fetcher", "p-1", {"names": ["Sarah Chen"]})
+    await job_store.update(job["job_id"], status="complete", result=[{"employee_name": "Sarah Chen"}])
+
+    # A second store on the same file sees the job, as another worker would
+    stored = await SQLiteJobStore(sqlite_jobs.path).fetch(job["job_id"])
+    assert stored["status"] == "complete"
+    assert stored["params"] == {"names": ["Sarah Chen"]}
+    assert stored["result"] == [{"employee_name": "Sarah Chen"}]
+
+    evicted = await sqlite_jobs.evict(datetime.now(timezone.utc) + timedelta(seconds=1))
+    assert evicted == 1
+    assert await job_store.get(job["job_id"]) is None
+
+
+async def test_job_runs_to_completion_through_the_store(sqlite_jobs, auth_headers, fake_agents):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(
+            "/api/agents/drawings-fetch", json={"proposal_id": "p-1"}, headers=auth_headers
+        )
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+
+        for _ in range(50):
+            status = (await client.get(f"/api/agents/jobs/{job_id}", headers=auth_headers)).json()
+            if status["status"] == "complete":
+                break
+            await asyncio.sleep(0.02)
+    assert status["result"] == drawings_fetcher.MOCK_DRAWINGS
+    assert status["completed_at"] is not None
+
+
+async def test_batched_status_returns_known_jobs_in_request_order(sqlite_jobs, auth_headers):
+    first = await job_store.create("drawings_fetcher", "p-1")
+    second = await job_store.create("cv_fetcher", "p-1", {"names": []})
+    await job_store.update(first["job_id"], status="complete", result=[])
+    assert first["job_id"].startswith("drawings_fetcher.")
+
+    ids = ",".join([second["job_id"], "nonsense", first["job_id"], "cv_fetcher." + "0" * 32])
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get(f"/api/agents/jobs?ids={ids}", headers=auth_headers)
+    assert response.status_code == 200
+    assert [(j["job_id"], j["status"]) for j in response.json()] == [
+        (second["job_id"], "pending"),
+        (first["job_id"], "complete"),
+    ]
+    # Finished jobs are served from the in-process cache afterwards
+    assert job_store.finished.get(first["job_id"]) is not None
+    assert job_store.finished.get(second["job_id"]) is None
+
+
+async def test_job_events_are_pushed_to_the_proposal_room(sqlite_jobs, room, monkeypatch):
+    async def run_job(proposal_id, params, emit):
+        return [{"drawing_number": "DWG-001"}]
+
+    monkeypatch.setattr(drawings_fetcher, "run_job", run_job)
+    job = await job_store.create("drawings_fetcher", "p-9")
+    await execute_job(job)
+    await manager.drain()
+    sent = room
+
+    assert [(m["type"], m["job_id"]) for m in sent] == [
+        ("job_progress", job["job_id"]),
+        ("job_complete", job["job_id"]),
+    ]
+    assert sent[1]["status"] == "complete"
+    assert sent[1]["result"] == [{"drawing_number": "DWG-001"}]
+
+
+async def test_cv_fetcher_matches_requested_names_over_http(fake_agents):
+    cvs = await cv_fetcher.run_job("p-1", {"names": ["Sarah Chen", "Unknown Person"]})
+    assert [cv["requested_name"] for cv in cvs] == ["Sarah Chen", "Unknown Person"]
+    assert cvs[0]["employee_id"] == "WSP-AU-1042"
+
+
+async def test_slow_jobs_time_out_and_running_jobs_cancel(sqlite_jobs, fake_agents, monkeypatch):
+    fake_agents(latency=5)
+    monkeypatch.setattr(settings, "agent_job_timeout_seconds", 0.05)
+    timed_out = await job_store.create("drawings_fetcher", "p-1")
+    await execute_job(timed_out)
+    stored = await job_store.get(timed_out["job_id"])
+    assert stored["status"] == "error"
+    assert stored["error"].startswith("Timed out")
+
+    monkeypatch.setattr(settings, "agent_job_timeout_seconds", 60)
+    scheduler = AgentScheduler(execute_job, caps={}, default_cap=1, max_queue=5, drop=drop_job)
+    running = await job_store.create("drawings_fetcher", "p-1")
+    waiting = await job_store.create("drawings_fetcher", "p-1")
+    scheduler.submit(running)
+    scheduler.submit(waiting)
+    await asyncio.sleep(0.01)
+
+    assert scheduler.cancel(waiting["job_id"])
+    assert scheduler.cancel(running["job_id"])
+    assert not scheduler.cancel("drawings_fetcher." + "0" * 32)
+    for _ in range(50):
+        stored = await job_store.get(running["job_id"])
+        if stored["status"] == "error":
+            break
+        await asyncio.sleep(0.01)
+    assert stored["error"] == "Cancelled"
+    assert (await job_store.get(waiting["job_id"]))["error"] == "Cancelled"
+    stats = scheduler.stats()
+    assert stats["queued"] == 0 and stats["by_agent"]["drawings_fetcher"]["running"] == 0
+
+
+async def test_jobs_cancelled_through_another_worker_stop_here(sqlite_jobs, fake_agents, monkeypatch):
+    fake_agents(latency=5)
+    monkeypatch.setattr(settings, "agent_cancel_check_seconds", 0.02)
+    before = outcomes.copy()
+    local = AgentScheduler(execute_job, caps={}, default_cap=1, max_queue=5, drop=drop_job)
+    job = await job_store.create("drawings_fetcher", "p-1")
+    local.submit(job)
+    await asyncio.sleep(0.01)
+
+    # What cancel_job does on a worker that doesn't hold the job
+    assert await job_store.update(job["job_id"], status="error", error="Cancelled")
+    for _ in range(50):
+        if not local.owns(job["job_id"]):
+            break
+        await asyncio.sleep(0.01)
+    assert not local.owns(job["job_id"])
+    assert local.stats()["by_agent"]["drawings_fetcher"]["running"] == 0
+    # Already recorded by the other worker, so not counted again here
+    assert outcomes["cancelled"] == before["cancelled"]
+
+
+async def test_identical_requests_share_a_job_then_hit_the_cache(sqlite_jobs, auth_headers, fake_agents, room):
+    fake_agents(latency=0.05)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        async def fetch():
+            response = await client.post(
+                "/api/agents/projects-search", json={"proposal_id": "p-9"}, headers=auth_headers
+            )
+            assert response.status_code == 202
+            return response.json()
+
+        first, second = await asyncio.gather(fetch(), fetch())
+        assert first["job_id"] == second["job_id"]
+
+        for _ in range(50):
+            status = (await client.get(f"/api/agents/jobs/{first['job_id']}", headers=auth_headers)).json()
+            if status["status"] == "complete":
+                break
+            await asyncio.sleep(0.02)
+
+        third = await fetch()
+        assert third["status"] == "complete"
+        assert third["job_id"] != first["job_id"]
+        cached = (await client.get(f"/api/agents/jobs/{third['job_id']}", headers=auth_headers)).json()
+    assert cached["result"] == status["result"]
+    # Viewers hear about the cached job like any other, without waiting for a poll
+    await manager.drain()
+    pushed = [m for m in room if m["job_id"] == third["job_id"]]
+    assert [(m["type"], m["result"]) for m in pushed] == [("job_complete", status["result"])]
+    stats = agent_results.stats()
+    assert stats["coalesced"] >= 1 and stats["hits"] == 1 and stats["inflight"] == 0
+
+
+def test_result_key_changes_with_inputs():
+    base = result_key("drawings_fetcher", "p-1", {}, ["2026-01-01", "3"])
+    assert base == result_key("drawings_fetcher", "p-1", {}, ["2026-01-01", "3"])
+    assert base != result_key("drawings_fetcher", "p-1", {}, ["2026-01-02", "3"])
+    assert base != result_key("deliverables_fetcher", "p-1", {}, ["2026-01-01", "3"])
+
+
+async def test_items_stream_to_the_room_before_the_job_completes(sqlite_jobs, room, fake_agents):
+    fake_agents(latency=0.05)
+    job = await job_store.create("drawings_fetcher", "p-9")
+    await execute_job(job)
+    await manager.drain()
+    sent = room
+
+    partials = [m for m in sent if m["type"] == "job_partial"]
+    assert [m["offset"] for m in partials] == list(range(len(drawings_fetcher.MOCK_DRAWINGS)))
+    assert [item for m in partials for item in m["items"]] == drawings_fetcher.MOCK_DRAWINGS
+    assert sent[0]["type"] == "job_progress" and sent[-1]["type"] == "job_complete"
+
+
+async def test_cancel_endpoint_and_per_agent_timeout(sqlite_jobs, auth_headers, fake_agents, monkeypatch):
+    fake_agents(latency=5)
+    monkeypatch.setattr(settings, "agent_timeouts", {"deliverables_fetcher": 0.05})
+    before = outcomes.copy()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        started = await client.post("/api/agents/drawings-fetch", json={"proposal_id": "p-1"}, headers=auth_headers)
+        job_id = started.json()["job_id"]
+        await asyncio.sleep(0.01)
+        assert (await client.delete(f"/api/agents/jobs/{job_id}", headers=auth_headers)).status_code == 204
+        for _ in range(50):
+            status = (await client.get(f"/api/agents/jobs/{job_id}", headers=auth_headers)).json()
+            if status["status"] == "error":
+                break
+            await asyncio.sleep(0.01)
+        assert status["error"] == "Cancelled"
+        assert (await client.delete(f"/api/agents/jobs/{job_id}", headers=auth_headers)).status_code == 409
+        assert (await client.delete("/api/agents/jobs/drawings_fetcher." + "0" * 32, headers=auth_headers)).status_code == 404
+
+    # Only deliverables_fetcher has the short deadline
+    job = await job_store.create("deliverables_fetcher", "p-1")
+    await execute_job(job)
+    assert (await job_store.get(job["job_id"]))["error"] == "Timed out after 0.05s"
+    assert outcomes["cancelled"] - before["cancelled"] == 1
+    assert outcomes["timeout"] - before["timeout"] == 1
+
+
+async def test_reaper_fails_orphaned_jobs_and_ignores_late_results(sqlite_jobs, monkeypatch):
+    monkeypatch.setattr(settings, "agent_job_stale_seconds", 0)
+    orphan = await job_store.create("drawings_fetcher", "p-1")
+    await job_store.update(orphan["job_id"], status="running")
+
+    assert (await reap_jobs())["abandoned"] == 1
+    assert (await job_store.get(orphan["job_id"]))["error"].startswith("Abandoned")
+    # The lost worker coming back can't overwrite the final state
+    assert not await job_store.update(orphan["job_id"], status="complete", result=[])
+    assert (await reap_jobs())["abandoned"] == 0
+    assert not scheduler.owns(orphan["job_id"])
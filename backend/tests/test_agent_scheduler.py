@@ -0,0 +1,42 @@
+import asyncio
+from datetime import date
+import pytest
+from app.agents.scheduler import AgentScheduler, QueueFull
+
+
+def _job(n: int, agent: str = "cv_fetcher") -> dict:
+    return {"job_id": f"job-{n}", "agent": agent}
+
+
+async def test_caps_queue_by_deadline_and_reject_when_full():
+    started: list[str] = []
+    release = asyncio.Event()
+
+    async def execute(job):
+        started.append(job["job_id"])
+        await release.wait()
+
+    scheduler = AgentScheduler(execute, caps={"cv_fetcher": 1}, default_cap=2, max_queue=2)
+    scheduler.submit(_job(1))
+    scheduler.submit(_job(2), deadline=date(2026, 6, 1))
+    scheduler.submit(_job(3), deadline=date(2026, 4, 1))
+    with pytest.raises(QueueFull):
+        scheduler.submit(_job(4))
+    assert not scheduler.accepting("cv_fetcher")
+    # Other types still start while cv_fetcher is saturated
+    assert scheduler.accepting("drawings_fetcher")
+    scheduler.submit(_job(5, "drawings_fetcher"))
+
+    await asyncio.sleep(0)
+    assert started == ["job-1", "job-5"]
+    assert scheduler.stats()["by_agent"]["cv_fetcher"] == {"cap": 1, "running": 1, "queued": 2}
+
+    release.set()
+    for _ in range(10):
+        await asyncio.sleep(0)
+    # The queued job with the sooner deadline runs first
+    assert started == ["job-1", "job-5", "job-3", "job-2"]
+    stats = scheduler.stats()
+    assert stats["completed"] == 4
+    assert stats["rejected"] == 1
+    assert stats["queued"] == 0
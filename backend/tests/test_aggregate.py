@@ -0,0 +1,39 @@
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.dialects import postgresql
+from app.finance import aggregate
+
+
+async def test_breakdown_uses_jsonb_aggregation_on_postgres():
+    result = MagicMock()
+    result.all.return_value = []
+    session = AsyncMock()
+    session.bind = SimpleNamespace(dialect=postgresql.dialect())
+    session.execute = AsyncMock(return_value=result)
+
+    await aggregate.pricing_breakdown(uuid.uuid4(), session)
+
+    stmt = session.execute.call_args.args[0]
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "jsonb_each_text" in sql
+    assert "GROUP BY pricing_rows.wbs_id, proposed_people.team" in sql
+
+
+async def test_breakdown_falls_back_to_python_off_postgres():
+    wbs_id = uuid.uuid4()
+    rows = [
+        SimpleNamespace(wbs_id=wbs_id, hours_by_phase={"Study": 2, "Detailed": "3"}, hourly_rate=100, cost_rate=40),
+        SimpleNamespace(wbs_id=wbs_id, hours_by_phase={}, hourly_rate=100, cost_rate=40),
+    ]
+    person = SimpleNamespace(team="Roads", burdened_rate=60)
+    result = MagicMock()
+    result.all.return_value = [(row, person) for row in rows]
+    session = AsyncMock()
+    session.execute = AsyncMock(return_value=result)
+
+    groups = await aggregate.pricing_breakdown(uuid.uuid4(), session)
+    assert {(g.phase, g.hours, g.billing, g.cost, g.burdened) for g in groups} == {
+        ("Study", 2.0, 200.0, 80.0, 120.0),
+        ("Detailed", 3.0, 300.0, 120.0, 180.0),
+    }
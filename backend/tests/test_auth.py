@@ -1,6 +1,12 @@
 import pytest
+import uuid
+from unittest.mock import AsyncMock, MagicMock
 from httpx import AsyncClient, ASGITransport
+from app.auth import cache as auth_cache
+from app.auth.jwt import create_access_token
+from app.db.session import get_db
 from app.main import app
+from app.models.user import User, UserRole
 
 
 @pytest.mark.asyncio
@@ -18,3 +24,30 @@ async def test_me_without_token_returns_403():
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
         response = await ac.get("/api/auth/me")
     assert response.status_code == 403
+
+
+async def test_current_user_is_cached_until_invalidated():
+    user = User(id=uuid.uuid4(), name="Cached", email="cached@wsp.com", role=UserRole.pm, password_hash="")
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = user
+    session = AsyncMock()
+    session.execute = AsyncMock(return_value=result)
+
+    async def override():
+        yield session
+
+    app.dependency_overrides[get_db] = override
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            for _ in range(3):
+                response = await ac.get("/api/auth/me", headers=headers)
+                assert response.json()["email"] == "cached@wsp.com"
+            assert session.execute.await_count == 1
+
+            auth_cache.invalidate_user(user.id)
+            await ac.get("/api/auth/me", headers=headers)
+            assert session.execute.await_count == 2
+    finally:
+        app.dependency_overrides.clear()
+        auth_cache.invalidate_user(user.id)
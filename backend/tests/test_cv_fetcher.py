@@ -0,0 +1,104 @@
+import asyncio
+import httpx
+import pytest
+from app.agents import cv_fetcher
+from app.agents.cv_index import NameIndex
+from app.agents.http import build_client, use_client
+from app.config import settings
+
+
+@pytest.fixture
+def hr_service(monkeypatch):
+    """Fake HR match endpoint that records calls and how many overlap."""
+    monkeypatch.setattr(cv_fetcher, "RETRY_BACKOFF_SECONDS", 0)
+    state = {"calls": [], "in_flight": 0, "max_in_flight": 0, "fail": {}}
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        name = request.url.params["name"]
+        state["calls"].append(name)
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            state["in_flight"] -= 1
+        if state["fail"].get(name):
+            status = state["fail"][name].pop(0)
+            return httpx.Response(status, json={"detail": "unavailable"})
+        return httpx.Response(200, json={"cv": {"employee_name": name, "employee_id": f"E-{name}"}})
+
+    cv_fetcher.cv_cache.clear()
+    use_client(build_client(httpx.MockTransport(handle)))
+    yield state
+    use_client(None)
+    cv_fetcher.cv_cache.clear()
+
+
+async def test_names_resolve_concurrently_in_order_with_retry_and_cache(hr_service, monkeypatch):
+    monkeypatch.setattr(settings, "agent_cv_concurrency", 3)
+    names = [f"Person {i}" for i in range(8)]
+    hr_service["fail"]["Person 2"] = [503]
+    emitted: list[str] = []
+
+    async def emit(items):
+        emitted.extend(cv["requested_name"] for cv in items)
+
+    cvs = await cv_fetcher.run_job("p-1", {"names": names}, emit)
+
+    assert [cv["requested_name"] for cv in cvs] == names
+    assert sorted(emitted) == sorted(names)
+    assert 1 < hr_service["max_in_flight"] <= 3
+    assert hr_service["calls"].count("Person 2") == 2
+
+    # Same staff on another proposal: served from the name cache, case/spacing-insensitive
+    hr_service["calls"].clear()
+    again = await cv_fetcher.run_job("p-2", {"names": ["person  0", "Person 7"]})
+    assert hr_service["calls"] == []
+    assert [cv["employee_id"] for cv in again] == ["E-Person 0", "E-Person 7"]
+
+
+async def test_client_errors_are_not_retried(hr_service):
+    hr_service["fail"]["Nobody"] = [404]
+    with pytest.raises(httpx.HTTPStatusError):
+        await cv_fetcher.run_job("p-1", {"names": ["Sarah Chen", "Nobody"]})
+    assert hr_service["calls"].count("Nobody") == 1
+
+
+def test_name_index_exact_token_fuzzy_and_refresh():
+    index = NameIndex([
+        {"employee_id": "1", "employee_name": "Sarah Chen"},
+        {"employee_id": "2", "employee_name": "James Okafor"},
+        {"employee_id": "3", "employee_name": "Sarah Okafor"},
+    ])
+    assert index.match("  sarah  CHEN ")["employee_id"] == "1"
+    # Every token must match; ties go to the earliest entry
+    assert index.match("Okafor, Sarah")["employee_id"] == "3"
+    assert index.match("Okafor")["employee_id"] == "2"
+    # Misspelled surname is corrected to one that fits the first name
+    assert index.match("Sarah Okafro")["employee_id"] == "3"
+    assert index.match("Zed Quill") is None
+
+    index.upsert([{"employee_id": "2", "employee_name": "James Nkemelu"}])
+    index.remove(["3"])
+    assert index.match("Okafor") is None
+    assert index.match("Nkemelu")["employee_id"] == "2"
+    assert len(index) == 2
+
+
+def test_name_index_refreshes_names_with_a_repeated_token():
+    index = NameIndex([
+        {"employee_id": "1", "employee_name": "Anne Anne"},
+        {"employee_id": "2", "employee_name": "Lee Morgan"},
+    ])
+    index.upsert([{"employee_id": "1", "employee_name": "Anne Smith"}])
+    assert index.match("Anne Smith")["employee_id"] == "1"
+    index.upsert([{"employee_id": "2", "employee_name": "Lee Lee"}])
+    index.remove(["2"])
+    assert index.match("Lee") is None
+    assert index.match("Ane Smith")["employee_id"] == "1"
+    assert len(index) == 1
+
+
+def test_mock_hr_lookup_uses_the_index():
+    assert cv_fetcher.match_cv("Sarah Chen")["employee_id"] == "WSP-AU-1042"
+    assert cv_fetcher.match_cv("Dr. Chen")["employee_id"] == "WSP-AU-1042"
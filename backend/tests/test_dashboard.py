@@ -0,0 +1,112 @@
+import uuid
+from datetime import date, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from app.routes.dashboard import COUNTED_MODELS, build_dashboard
+
+
+def _stats(**overrides):
+    row = dict(
+        proposal_id=uuid.uuid4(),
+        target_dlm=3.0,
+        kickoff_date=None,
+        red_review_date=None,
+        gold_review_date=None,
+        submission_deadline=date.today() + timedelta(days=5),
+        check_in_meetings=None,
+        total_hours=10,
+        total_billing=1500,
+        total_cost=500,
+        total_burdened=700,
+        schedule_start=date(2026, 1, 1),
+        schedule_end=None,
+        **{label: 2 for label in COUNTED_MODELS},
+    )
+    row.update(overrides)
+    return SimpleNamespace(**row)
+
+
+async def test_dashboard_reads_everything_in_one_round_trip():
+    result = MagicMock()
+    result.one.return_value = _stats()
+    session = AsyncMock()
+    session.execute = AsyncMock(return_value=result)
+
+    out = await build_dashboard(uuid.uuid4(), session)
+
+    assert session.execute.await_count == 1
+    assert out.total_billing == 1500
+    assert out.achieved_dlm == 3.0
+    assert out.days_remaining == 5
+    assert out.schedule_start == "2026-01-01"
+    assert out.team_size == 2 and out.compliance_count == 2
+
+
+async def test_dashboard_for_missing_proposal_uses_defaults():
+    result = MagicMock()
+    result.one.return_value = _stats(
+        proposal_id=None, target_dlm=None, submission_deadline=None,
+        total_hours=None, total_billing=None, total_cost=None, total_burdened=None,
+        **{label: 0 for label in COUNTED_MODELS},
+    )
+    session = AsyncMock()
+    session.execute = AsyncMock(return_value=result)
+
+    out = await build_dashboard(uuid.uuid4(), session)
+
+    assert out.target_dlm == 3.0
+    assert out.total_billing == 0 and out.wbs_count == 0
+
+
+async def test_dashboard_etag_and_write_invalidation(auth_headers, monkeypatch):
+    from httpx import AsyncClient, ASGITransport
+    from app.main import app
+    from app.routes import dashboard
+
+    calls = []
+
+    async def fake_build(proposal_id, db):
+        calls.append(proposal_id)
+        return dashboard.DashboardOut(
+            total_billing=0, total_cost=0, total_burdened=0, net_margin=0, margin_pct=0,
+            achieved_dlm=0, target_dlm=3.0, team_size=0, total_hours=0,
+            schedule_start=None, schedule_end=None, kickoff_date=None, red_review_date=None,
+            gold_review_date=None, submission_deadline=None, days_remaining=None,
+            wbs_count=len(calls), pricing_count=0, people_count=0, schedule_count=0,
+            deliverables_count=0, drawings_count=0, scope_count=0, relevant_projects_count=0,
+        )
+
+    monkeypatch.setattr(dashboard, "build_dashboard", fake_build)
+    pid = str(uuid.uuid4())
+    url = f"/api/proposals/{pid}/dashboard/"
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        first = await ac.get(url, headers=auth_headers)
+        etag = first.headers["etag"]
+        cached = await ac.get(url, headers={**auth_headers, "If-None-Match": etag})
+        await ac.delete(f"/api/proposals/{pid}/schedule/{uuid.uuid4()}", headers=auth_headers)
+        fresh = await ac.get(url, headers={**auth_headers, "If-None-Match": etag})
+
+    assert first.status_code == 200 and first.json()["wbs_count"] == 1
+    assert cached.status_code == 304
+    assert fresh.status_code == 200 and fresh.json()["wbs_count"] == 2
+    assert len(calls) == 2
+
+
+def test_dashboard_cache_generation_lives_in_the_shared_backend():
+    from app.cache import TTLCache
+    from app.routes.dashboard import DashboardCache
+
+    shared = TTLCache()
+    first, second = DashboardCache(shared), DashboardCache(shared)
+    pid = str(uuid.uuid4())
+    first.put(pid, b"{}", first.generation(pid))
+    assert second.get(pid) is not None
+
+    # A read on one worker races with a write on another: its result is not cached
+    generation = first.generation(pid)
+    second.invalidate(pid)
+    assert first.get(pid) is None
+    first.put(pid, b"stale", generation)
+    assert second.get(pid) is None
+    first.put(pid, b"fresh", first.generation(pid))
+    assert second.get(pid)[1] == b"fresh"
@@ -0,0 +1,69 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy.dialects import postgresql
+from app.finance import aggregate
+from app.finance.summary import apply_delta, diff, fold, lock_key
+from app.main import app
+
+
+def test_fold_rolls_wbs_groups_up_the_path():
+    leaf, parent = uuid.uuid4(), uuid.uuid4()
+    groups = [
+        aggregate.BreakdownRow(leaf, "Roads", "Study", 2.0, 200.0, 80.0, 120.0),
+        aggregate.BreakdownRow(None, None, "Study", 1.0, 100.0, 40.0, 0.0),
+    ]
+    buckets = fold(groups, lambda wbs_id: [leaf, parent] if wbs_id == leaf else [])
+    assert buckets[("proposal", "")] == [3.0, 300.0, 120.0, 120.0]
+    assert buckets[("phase", "Study")] == [3.0, 300.0, 120.0, 120.0]
+    assert buckets[("team", "")] == [1.0, 100.0, 40.0, 0.0]
+    assert buckets[("wbs", str(parent))] == [2.0, 200.0, 80.0, 120.0]
+
+
+def test_diff_drops_unchanged_buckets():
+    before = {("proposal", ""): [2.0, 200.0, 80.0, 0.0], ("team", "A"): [2.0, 200.0, 80.0, 0.0]}
+    after = {("proposal", ""): [2.0, 200.0, 80.0, 0.0], ("team", "B"): [2.0, 200.0, 80.0, 0.0]}
+    assert diff(before, after) == {
+        ("team", "A"): [-2.0, -200.0, -80.0, 0.0],
+        ("team", "B"): [2.0, 200.0, 80.0, 0.0],
+    }
+
+
+async def test_summary_writers_take_the_proposal_lock_first():
+    proposal_id = uuid.uuid4()
+    session = AsyncMock()
+    session.bind = SimpleNamespace(dialect=postgresql.dialect())
+
+    await apply_delta(session, proposal_id, {("proposal", ""): [1.0, 100.0, 40.0, 0.0]})
+
+    lock, upsert = [call.args[0].compile(dialect=postgresql.dialect()) for call in session.execute.call_args_list]
+    assert "pg_advisory_xact_lock" in str(lock)
+    assert list(lock.params.values()) == [lock_key(proposal_id)]
+    assert "proposal_financials" in str(upsert)
+
+
+async def test_concurrent_pricing_writes_leave_the_summary_consistent(pg_proposal):
+    base = f"/api/proposals/{pg_proposal.id}"
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        async def create(i):
+            body = {"wbs_id": str(pg_proposal.leaf_id), "person_id": str(pg_proposal.person_id),
+                    "hours_by_phase": {"Study": i + 1}}
+            response = await client.post(f"{base}/pricing/", json=body)
+            assert response.status_code == 201
+            return response.json()["id"]
+
+        # Creates racing the first build of the summary and a full rebuild
+        *ids, rebuilt = await asyncio.gather(*(create(i) for i in range(8)), client.post(f"{base}/financials/rebuild"))
+        assert rebuilt.status_code == 200
+        responses = await asyncio.gather(
+            *(client.patch(f"{base}/pricing/{i}", json={"hours_by_phase": {"Detailed": 3}}) for i in ids[:4]),
+            *(client.delete(f"{base}/pricing/{i}") for i in ids[4:6]),
+            client.patch(f"{base}/pricing/{ids[6]}", json={"wbs_id": str(pg_proposal.parent_id)}),
+            client.post(f"{base}/financials/rebuild"),
+        )
+        assert all(r.status_code in (200, 204) for r in responses)
+        check = (await client.get(f"{base}/financials/check")).json()
+    assert check["mismatches"] == []
+    assert check["consistent"]
@@ -0,0 +1,154 @@
+"""
+Index coverage for the per-proposal list queries.
+
+The EXPLAIN checks need a real Postgres: set TEST_DATABASE_URL (asyncpg URL) to
+run them.  They seed a throwaway schema inside a transaction that is rolled
+back, so any database you can create schemas in will do.
+"""
+import importlib
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select, func, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.base import Base
+from app.models import (
+    ClientOutreach, ComplianceItem, Deliverable, Drawing, PricingRow, ProposalDiscipline,
+    ProposedPerson, RelevantProject, ScheduleItem, ScopeSection, WBSItem,
+)
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+VERSIONS = Path(__file__).resolve().parent.parent / "alembic" / "versions"
+
+PROPOSALS = 200
+WBS_PER_PROPOSAL = 40
+ROWS_PER_WBS = 5
+
+SEED = [
+    f"INSERT INTO proposals (id, proposal_number, title, status) "
+    f"SELECT gen_random_uuid(), 'P-' || g, 'Proposal ' || g, 'draft' FROM generate_series(1, {PROPOSALS}) g",
+    f"INSERT INTO wbs_items (id, proposal_id, wbs_code, order_index) "
+    f"SELECT gen_random_uuid(), p.id, '1.' || g, g FROM proposals p, generate_series(1, {WBS_PER_PROPOSAL}) g",
+    f"INSERT INTO proposed_people (id, proposal_id, employee_name, team, updated_at) "
+    f"SELECT gen_random_uuid(), p.id, 'Person ' || g, 'Team ' || (g % 5), now() - g * interval '1 minute' "
+    f"FROM proposals p, generate_series(1, {WBS_PER_PROPOSAL}) g",
+    f"INSERT INTO pricing_rows (id, proposal_id, wbs_id, person_id, hours_by_phase, updated_at) "
+    f"SELECT gen_random_uuid(), w.proposal_id, w.id, pp.id, '{{}}'::jsonb, now() - g * interval '1 minute' "
+    f"FROM wbs_items w JOIN proposed_people pp ON pp.proposal_id = w.proposal_id AND pp.employee_name = 'Person ' || w.order_index "
+    f", generate_series(1, {ROWS_PER_WBS}) g",
+    f"INSERT INTO schedule_items (id, proposal_id, wbs_id, task_name, start_date) "
+    f"SELECT gen_random_uuid(), w.proposal_id, w.id, 'Task', current_date + g FROM wbs_items w, generate_series(1, {ROWS_PER_WBS}) g",
+    f"INSERT INTO drawings (id, proposal_id, wbs_id, title, drawing_number) "
+    f"SELECT gen_random_uuid(), w.proposal_id, w.id, 'Drawing', 'D-' || g FROM wbs_items w, generate_series(1, {ROWS_PER_WBS}) g",
+    f"INSERT INTO deliverables (id, proposal_id, wbs_id, title, deliverable_ref) "
+    f"SELECT gen_random_uuid(), w.proposal_id, w.id, 'Deliverable', 'R-' || g FROM wbs_items w, generate_series(1, {ROWS_PER_WBS}) g",
+    f"INSERT INTO relevant_projects (id, proposal_id, project_name) "
+    f"SELECT gen_random_uuid(), w.proposal_id, 'Project' FROM wbs_items w, generate_series(1, {ROWS_PER_WBS}) g",
+    f"INSERT INTO scope_sections (id, proposal_id, section_name, order_index) "
+    f"SELECT gen_random_uuid(), w.proposal_id, 'Section', g FROM wbs_items w, generate_series(1, {ROWS_PER_WBS}) g",
+    f"INSERT INTO compliance_items (id, proposal_id, item_name, category, order_index) "
+    f"SELECT gen_random_uuid(), w.proposal_id, 'Item', 'Cat ' || (g % 3), g FROM wbs_items w, generate_series(1, {ROWS_PER_WBS}) g",
+    f"INSERT INTO proposal_disciplines (id, proposal_id, discipline_name, order_index) "
+    f"SELECT gen_random_uuid(), w.proposal_id, 'Discipline', g FROM wbs_items w, generate_series(1, {ROWS_PER_WBS}) g",
+    f"INSERT INTO client_outreach (id, proposal_id, outreach_date, outreach_type) "
+    f"SELECT gen_random_uuid(), w.proposal_id, current_date - g, 'call' FROM wbs_items w, generate_series(1, {ROWS_PER_WBS}) g",
+]
+
+
+def test_migration_matches_model_indexes():
+    sys.path.insert(0, str(VERSIONS))
+    try:
+        migration = importlib.import_module("o4e5f6a7b8c9_add_list_query_indexes")
+    finally:
+        sys.path.remove(str(VERSIONS))
+    declared = {
+        index.name: (table.name, [c.name for c in index.columns])
+        for table in Base.metadata.tables.values()
+        for index in table.indexes
+    }
+    for name, table, columns in migration.INDEXES:
+        assert declared.get(name) == (table, columns)
+
+
+def _cases(proposal_id, wbs_id, person_id):
+    """(statement, index it must use) — statements mirror the routes' queries."""
+    return [
+        (select(PricingRow).where(PricingRow.proposal_id == proposal_id).order_by(PricingRow.updated_at),
+         "ix_pricing_rows_proposal_updated"),
+        (select(ProposedPerson).where(ProposedPerson.proposal_id == proposal_id).order_by(ProposedPerson.updated_at),
+         "ix_proposed_people_proposal_updated"),
+        (select(RelevantProject).where(RelevantProject.proposal_id == proposal_id).order_by(RelevantProject.updated_at),
+         "ix_relevant_projects_proposal_updated"),
+        (select(ScopeSection).where(ScopeSection.proposal_id == proposal_id).order_by(ScopeSection.order_index),
+         "ix_scope_sections_proposal_order"),
+        (select(ComplianceItem).where(ComplianceItem.proposal_id == proposal_id)
+         .order_by(ComplianceItem.category, ComplianceItem.order_index),
+         "ix_compliance_items_proposal_category_order"),
+        (select(ScheduleItem).where(ScheduleItem.proposal_id == proposal_id)
+         .order_by(ScheduleItem.start_date.nulls_last(), ScheduleItem.updated_at),
+         "ix_schedule_items_proposal_start"),
+        (select(WBSItem).where(WBSItem.proposal_id == proposal_id).order_by(WBSItem.order_index, WBSItem.wbs_code),
+         "ix_wbs_items_proposal_order"),
+        (select(Drawing).where(Drawing.proposal_id == proposal_id)
+         .order_by(Drawing.drawing_number.nulls_last(), Drawing.updated_at),
+         "ix_drawings_proposal_number"),
+        (select(Deliverable).where(Deliverable.proposal_id == proposal_id)
+         .order_by(Deliverable.deliverable_ref.nulls_last(), Deliverable.updated_at),
+         "ix_deliverables_proposal_ref"),
+        (select(ProposalDiscipline).where(ProposalDiscipline.proposal_id == proposal_id)
+         .order_by(ProposalDiscipline.order_index),
+         "ix_proposal_disciplines_proposal_order"),
+        (select(ClientOutreach).where(ClientOutreach.proposal_id == proposal_id)
+         .order_by(ClientOutreach.outreach_date.desc()),
+         "ix_client_outreach_proposal_date"),
+        (select(func.count()).where(PricingRow.wbs_id == wbs_id), "ix_pricing_rows_wbs_id"),
+        (select(func.count()).where(ScheduleItem.wbs_id == wbs_id), "ix_schedule_items_wbs_id"),
+        (select(func.count()).where(Drawing.wbs_id == wbs_id), "ix_drawings_wbs_id"),
+        (select(func.count()).where(Deliverable.wbs_id == wbs_id), "ix_deliverables_wbs_id"),
+        (select(PricingRow.id).where(PricingRow.person_id == person_id), "ix_pricing_rows_person_id"),
+    ]
+
+
+def _index_names(plan: dict) -> set[str]:
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= _index_names(child)
+    return names
+
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+async def test_list_queries_use_indexes():
+    engine = create_async_engine(TEST_DATABASE_URL)
+    try:
+        async with engine.connect() as conn:
+            trans = await conn.begin()
+            await conn.execute(text("CREATE SCHEMA explain_check"))
+            await conn.execute(text("SET LOCAL search_path TO explain_check, public"))
+            await conn.run_sync(Base.metadata.create_all)
+            for statement in SEED:
+                await conn.execute(text(statement))
+            for table in Base.metadata.tables:
+                await conn.execute(text(f"ANALYZE {table}"))
+
+            proposal_id, wbs_id, person_id = (await conn.execute(text(
+                "SELECT w.proposal_id, w.id, pr.person_id FROM wbs_items w "
+                "JOIN pricing_rows pr ON pr.wbs_id = w.id LIMIT 1"
+            ))).one()
+
+            for stmt, index_name in _cases(proposal_id, wbs_id, person_id):
+                compiled = stmt.compile(conn.sync_connection)
+                params = compiled.construct_params()
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {compiled}",
+                    tuple(params[key] for key in compiled.positiontup),
+                )
+                plan = result.scalar()
+                plan = json.loads(plan) if isinstance(plan, str) else plan
+                assert index_name in _index_names(plan[0]["Plan"]), (str(compiled), plan)
+            await trans.rollback()
+    finally:
+        await engine.dispose()
@@ -0,0 +1,45 @@
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy.dialects import postgresql
+from app.db.session import get_db
+from app.main import app
+
+
+async def test_rerate_requires_a_selector(auth_headers):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(
+            f"/api/proposals/{uuid.uuid4()}/people/rerate",
+            json={"hourly_rate": 180},
+            headers=auth_headers,
+        )
+    assert response.status_code == 400
+
+
+async def test_rerate_updates_people_and_pricing_rows_set_based(auth_headers):
+    result = MagicMock()
+    result.rowcount = 3
+    result.scalar_one_or_none.return_value = uuid.uuid4()
+    session = AsyncMock()
+    session.execute = AsyncMock(return_value=result)
+
+    async def override():
+        yield session
+
+    app.dependency_overrides[get_db] = override
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(
+            f"/api/proposals/{uuid.uuid4()}/people/rerate",
+            json={"team": "Roads", "hourly_rate": 180},
+            headers=auth_headers,
+        )
+    assert response.status_code == 200
+    assert response.json() == {"people_updated": 3, "pricing_rows_updated": 3}
+
+    people_sql, pricing_sql = (
+        str(call.args[0].compile(dialect=postgresql.dialect()))
+        for call in session.execute.call_args_list[:2]
+    )
+    assert people_sql.startswith("UPDATE proposed_people SET hourly_rate=")
+    assert pricing_sql.startswith("UPDATE pricing_rows SET hourly_rate=")
+    assert "pricing_rows.person_id IN (SELECT proposed_people.id" in pricing_sql
@@ -0,0 +1,27 @@
+from unittest.mock import MagicMock
+from sqlalchemy.pool import QueuePool
+from app.db.pool import InstrumentedPoolMixin, current_endpoint, pool_metrics
+
+
+class _Pool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+def test_checkouts_and_overflow_are_attributed_to_the_endpoint():
+    pool_metrics.reset()
+    pool = _Pool(MagicMock, pool_size=1, max_overflow=1)
+    token = current_endpoint.set("GET /api/proposals/{id}/wbs/")
+    try:
+        first, second = pool.connect(), pool.connect()
+    finally:
+        current_endpoint.reset(token)
+
+    stats = pool_metrics.snapshot(pool)
+    endpoint = stats["endpoints"]["GET /api/proposals/{id}/wbs/"]
+    assert endpoint["checkouts"] == 2
+    assert endpoint["overflows"] == 1
+    assert endpoint["in_use_max"] == 2
+    assert stats["pool"]["checked_out"] == 2
+    first.close()
+    second.close()
+    pool_metrics.reset()
@@ -0,0 +1,96 @@
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from httpx import AsyncClient, ASGITransport
+from app.db.session import get_db
+from app.finance.rollup import WBSTree
+from app.main import app
+from app.models import PricingRow, ProposedPerson
+from app.routes import pricing
+
+
+async def test_batch_rejects_unknown_rows(auth_headers):
+    proposal_id, row_id = uuid.uuid4(), uuid.uuid4()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(
+            f"/api/proposals/{proposal_id}/pricing/batch",
+            json={"update": [{"id": str(row_id), "hours_by_phase": {"Study": 4}}]},
+            headers=auth_headers,
+        )
+    assert response.status_code == 404
+    assert str(row_id) in response.json()["detail"]
+
+
+async def test_batch_rejects_update_and_delete_of_same_row(auth_headers):
+    proposal_id, row_id = uuid.uuid4(), uuid.uuid4()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(
+            f"/api/proposals/{proposal_id}/pricing/batch",
+            json={"update": [{"id": str(row_id)}], "delete": [str(row_id)]},
+            headers=auth_headers,
+        )
+    assert response.status_code == 400
+
+
+async def test_batch_applies_creates_updates_and_deletes_as_one_delta(auth_headers, monkeypatch):
+    proposal_id = uuid.uuid4()
+    wbs = {code: SimpleNamespace(id=uuid.uuid4(), wbs_code=code) for code in ("1", "1.1", "2", "3")}
+    person = ProposedPerson(
+        id=uuid.uuid4(), employee_name="Sarah Chen", team="Roads", hourly_rate=200, cost_rate=90, burdened_rate=120
+    )
+    kept = PricingRow(id=uuid.uuid4(), proposal_id=proposal_id, wbs_id=wbs["1.1"].id, person_id=person.id,
+                      hourly_rate=200, cost_rate=90, hours_by_phase={"Study": 2})
+    dropped = PricingRow(id=uuid.uuid4(), proposal_id=proposal_id, wbs_id=wbs["2"].id, person_id=person.id,
+                         hourly_rate=200, cost_rate=90, hours_by_phase={"Study": 1})
+    statements = []
+
+    async def execute(stmt):
+        statements.append(str(stmt))
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = (
+            [person] if "FROM proposed_people" in statements[-1] else [kept, dropped]
+        )
+        return result
+
+    async def get_test_db():
+        session = AsyncMock()
+        session.execute = execute
+        session.add_all = lambda rows: [setattr(row, "id", uuid.uuid4()) for row in rows]
+        yield session
+
+    app.dependency_overrides[get_db] = get_test_db
+    apply_delta = AsyncMock()
+    monkeypatch.setattr(pricing, "ensure_financials", AsyncMock(return_value=False))
+    monkeypatch.setattr(pricing, "apply_delta", apply_delta)
+    monkeypatch.setattr(pricing, "load_wbs_tree", AsyncMock(return_value=WBSTree(wbs.values())))
+    monkeypatch.setattr(pricing, "load_financials", AsyncMock(
+        side_effect=lambda db, pid, scope, keys: {(scope, k): [1.0, 2.0, 3.0, 4.0] for k in keys}
+    ))
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(
+            f"/api/proposals/{proposal_id}/pricing/batch",
+            json={
+                "create": [{"wbs_id": str(wbs["1"].id), "person_id": str(person.id), "hours_by_phase": {"Study": 3}}],
+                "update": [{"id": str(kept.id), "hours_by_phase": {"Study": 5}}],
+                "delete": [str(dropped.id)],
+            },
+            headers=auth_headers,
+        )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [r["total_hours"] for r in body["created"]] == [3.0]
+    assert [r["total_hours"] for r in body["updated"]] == [5.0]
+    assert body["deleted"] == [str(dropped.id)]
+    # One lookup for every person, before and after the batch
+    assert sum("FROM proposed_people" in sql for sql in statements) == 1
+    # One combined delta: +3 created, +3 updated, -1 deleted
+    apply_delta.assert_awaited_once()
+    delta = apply_delta.await_args.args[2]
+    assert delta[("proposal", "")][0] == 5.0
+    assert {key: a[0] for (scope, key), a in delta.items() if scope == "wbs"} == {
+        str(wbs["1"].id): 6.0, str(wbs["1.1"].id): 3.0, str(wbs["2"].id): -1.0,
+    }
+    # Totals for exactly the touched WBS nodes; "3" is untouched
+    assert {t["wbs_id"] for t in body["wbs_totals"]} == {str(wbs[c].id) for c in ("1", "1.1", "2")}
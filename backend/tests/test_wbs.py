@@ -19,3 +19,28 @@ async def test_list_wbs_for_unknown_proposal_returns_empty(auth_headers):
         response = await ac.get(f"/api/proposals/{fake_id}/wbs/", headers=auth_headers)
     assert response.status_code == 200
     assert response.json() == []
+
+
+async def test_wbs_structure_changes_keep_the_summary_consistent(pg_proposal):
+    base = f"/api/proposals/{pg_proposal.id}"
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        for wbs_id, hours in [(pg_proposal.parent_id, 1), (pg_proposal.leaf_id, 2)]:
+            response = await ac.post(f"{base}/pricing/", json={
+                "wbs_id": str(wbs_id), "person_id": str(pg_proposal.person_id), "hours_by_phase": {"Study": hours},
+            })
+            assert response.status_code == 201
+
+        # An orphan, then the node that adopts it
+        orphan = (await ac.post(f"{base}/wbs/", json={"wbs_code": "1.2.1"})).json()
+        await ac.post(f"{base}/pricing/", json={"wbs_id": orphan["id"], "hours_by_phase": {"Study": 4}})
+        middle = await ac.post(f"{base}/wbs/", json={"wbs_code": "1.2"})
+        assert middle.json()["total_hours"] == 4
+
+        moved = await ac.patch(f"{base}/wbs/{orphan['id']}", json={"wbs_code": "1.1.1"})
+        assert moved.json()["total_hours"] == 4
+        assert (await ac.delete(f"{base}/wbs/{pg_proposal.leaf_id}")).status_code == 204
+
+        totals = {i["wbs_code"]: i["total_hours"] for i in (await ac.get(f"{base}/wbs/")).json()}
+        check = (await ac.get(f"{base}/financials/check")).json()
+    assert totals == {"1": 1, "1.2": 0, "1.1.1": 4}
+    assert check["mismatches"] == []
@@ -0,0 +1,73 @@
+import uuid
+from types import SimpleNamespace
+from app.finance.aggregate import BreakdownRow
+from app.finance.rollup import WBSTree
+from app.finance.summary import SCOPE_WBS, fold, reroll_wbs
+
+
+def _items(*codes):
+    return {code: SimpleNamespace(id=uuid.uuid4(), wbs_code=code) for code in codes}
+
+
+def test_path_walks_to_root():
+    items = _items("1", "1.2", "1.2.1", "2")
+    tree = WBSTree(items.values())
+    assert tree.path(items["1.2.1"].id) == [items["1.2.1"].id, items["1.2"].id, items["1"].id]
+    assert tree.path(items["2"].id) == [items["2"].id]
+
+
+def test_path_stops_at_missing_parent_code():
+    items = _items("1", "1.2.1")
+    tree = WBSTree(items.values())
+    assert tree.ancestors(items["1.2.1"].id) == []
+
+
+def test_path_for_unknown_or_null_id_is_empty():
+    tree = WBSTree(_items("1").values())
+    assert tree.path(None) == []
+    assert tree.path(uuid.uuid4()) == []
+
+
+def _wbs_buckets(groups, tree):
+    buckets = {b: a for b, a in fold(groups, tree.path).items() if b[0] == SCOPE_WBS}
+    for item_id in tree.ids():
+        buckets.setdefault((SCOPE_WBS, str(item_id)), [0.0, 0.0, 0.0, 0.0])
+    return buckets
+
+
+def _approx(buckets):
+    return {b: [round(v, 6) for v in a] for b, a in buckets.items()}
+
+
+def test_reroll_matches_a_rebuild_after_create_recode_and_delete():
+    items = _items("1", "1.1", "1.2.1", "1.2.1.1", "2")
+    by_id = {i.id: i for i in items.values()}
+    groups = [
+        BreakdownRow(items[code].id, "Roads", "Study", hours, hours * 100, hours * 40, hours * 60)
+        for code, hours in [("1", 1.0), ("1.1", 2.0), ("1.2.1", 4.0), ("1.2.1.1", 8.0), ("2", 16.0)]
+    ]
+    tree = WBSTree(by_id.values())
+    stored = _wbs_buckets(groups, tree)
+
+    # Create 1.2: adopts the orphaned 1.2.1 chain into 1
+    items["1.2"] = SimpleNamespace(id=uuid.uuid4(), wbs_code="1.2")
+    by_id[items["1.2"].id] = items["1.2"]
+    after = WBSTree(by_id.values())
+    stored, tree = reroll_wbs(stored, tree, after), after
+    assert _approx(stored) == _approx(_wbs_buckets(groups, tree))
+    assert stored[(SCOPE_WBS, str(items["1"].id))][0] == 15.0
+
+    # Re-code 1.2.1 under 2: its subtree moves with it
+    by_id[items["1.2.1"].id] = SimpleNamespace(id=items["1.2.1"].id, wbs_code="2.1")
+    after = WBSTree(by_id.values())
+    stored, tree = reroll_wbs(stored, tree, after), after
+    assert _approx(stored) == _approx(_wbs_buckets(groups, tree))
+    assert stored[(SCOPE_WBS, str(items["2"].id))][0] == 16.0 + 4.0
+
+    # Delete 1.1: its pricing no longer counts toward any WBS node
+    del by_id[items["1.1"].id]
+    after = WBSTree(by_id.values())
+    stored, tree = reroll_wbs(stored, tree, after), after
+    orphaned = [g._replace(wbs_id=None) if g.wbs_id == items["1.1"].id else g for g in groups]
+    assert _approx(stored) == _approx(_wbs_buckets(orphaned, tree))
+    assert (SCOPE_WBS, str(items["1.1"].id)) not in stored
@@ -0,0 +1,245 @@
+import asyncio
+import json
+from app.config import settings
+from app.websockets import encoding
+from app.websockets.manager import ConnectionManager
+from app.websockets.pubsub import ChunkAssembler, InMemoryBroadcast, PostgresBroadcast, split_payload
+
+
+class FakeSocket:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.received: list[dict] = []
+        self.closed_with: int | None = None
+
+    async def accept(self):
+        pass
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+    async def send_text(self, payload):
+        await asyncio.sleep(self.delay)
+        self.received.append(json.loads(payload))
+
+
+def presence(ws: FakeSocket) -> dict:
+    """tab -> user names, as a client rebuilds it from the snapshot and diffs."""
+    members: dict = {}
+    for message in ws.received:
+        if message.get("type") == "presence":
+            members = dict(message["members"])
+        elif message.get("type") == "presence_diff":
+            members.update(message["set"])
+            for member_id in message["left"]:
+                members.pop(member_id, None)
+    tabs: dict = {}
+    for user_name, tab in members.values():
+        tabs.setdefault(tab, []).append(user_name)
+    return tabs
+
+
+async def test_slow_consumer_is_evicted_without_delaying_the_room(monkeypatch):
+    monkeypatch.setattr(settings, "ws_send_queue_size", 4)
+    monkeypatch.setattr(settings, "ws_send_timeout_seconds", 0.05)
+    manager = ConnectionManager()
+    fast, slow = FakeSocket(), FakeSocket(delay=1)
+    await manager.connect(fast, "p-1", "Fast")
+    await manager.connect(slow, "p-1", "Slow")
+
+    for i in range(10):
+        await manager.broadcast("p-1", {"table": "pricing_rows", "seq": i})
+        await asyncio.sleep(0.01)
+    await manager.drain()
+
+    assert [m["seq"] for m in fast.received if "seq" in m] == list(range(10))
+    await asyncio.sleep(0.1)
+    assert slow.closed_with == 1013
+    assert manager.stats()["slow_evictions"] == 1
+    assert manager.stats()["connections"] == 1
+    manager.disconnect(fast)
+    await asyncio.sleep(0)
+
+
+async def test_rooms_span_workers_through_the_broadcast_backend():
+    hub: list = []
+    first, second = ConnectionManager(InMemoryBroadcast(hub)), ConnectionManager(InMemoryBroadcast(hub))
+    await first.start()
+    await second.start()
+    alice, bob = FakeSocket(), FakeSocket()
+    await first.connect(alice, "p-1", "Alice")
+    await first.drain()
+    await second.connect(bob, "p-1", "Bob", tab="pricing")
+
+    await first.broadcast("p-1", {"table": "pricing_rows", "row_id": "r-1", "value": 5}, exclude=alice)
+    await first.drain()
+    await second.drain()
+
+    assert [m for m in bob.received if "table" in m] == [{"table": "pricing_rows", "row_id": "r-1", "value": 5}]
+    assert not [m for m in alice.received if "table" in m]
+    assert presence(alice) == {"wbs": ["Alice"], "pricing": ["Bob"]}
+
+    # A worker shutting down withdraws its members from the other workers' rooms
+    await second.stop()
+    await first.drain()
+    assert presence(alice) == {"wbs": ["Alice"]}
+    first.disconnect(alice)
+    second.disconnect(bob)
+    await first.stop()
+    await first.drain()
+    await second.drain()
+
+
+async def test_members_of_a_crashed_worker_expire(monkeypatch):
+    monkeypatch.setattr(settings, "ws_heartbeat_seconds", 0.02)
+    monkeypatch.setattr(settings, "ws_peer_timeout_seconds", 0.2)
+    hub: list = []
+    first, second = ConnectionManager(InMemoryBroadcast(hub)), ConnectionManager(InMemoryBroadcast(hub))
+    await first.start()
+    await second.start()
+    alice, bob = FakeSocket(), FakeSocket()
+    await first.connect(alice, "p-1", "Alice")
+    await second.connect(bob, "p-1", "Bob", tab="pricing")
+    await second.drain()
+    await asyncio.sleep(0.3)
+    # Past the timeout, but heartbeats keep a live worker's members
+    assert presence(alice) == {"wbs": ["Alice"], "pricing": ["Bob"]}
+
+    # The second worker dies without stop(): it just goes quiet
+    await second.backend.stop()
+    await asyncio.sleep(0.4)
+    await first.drain()
+    assert presence(alice) == {"wbs": ["Alice"]}
+    first.disconnect(alice)
+    second.disconnect(bob)
+    await first.stop()
+    await second.stop()
+    await first.drain()
+    await second.drain()
+
+
+def test_long_notify_payloads_are_chunked_and_reassembled():
+    payload = json.dumps({"type": "job_complete", "result": ["x" * 100] * 200})
+    chunks = split_payload(payload, size=1000)
+    assert len(chunks) > 1 and all(len(c) < 1100 for c in chunks)
+    assembler = ChunkAssembler()
+    assert [assembler.add(c) for c in chunks][-1] == payload
+    assert assembler.add('{"short": 1}') == '{"short": 1}'
+
+
+async def test_notifications_are_handled_in_order_by_one_reader(monkeypatch):
+    async def connect():
+        pass
+
+    received = []
+
+    async def receive(payload):
+        if payload == '{"fail": 1}':
+            raise ValueError(payload)
+        await asyncio.sleep(0)
+        received.append(json.loads(payload)["seq"])
+
+    backend = PostgresBroadcast("postgresql://unused", "proposal_ws")
+    monkeypatch.setattr(backend, "_connect", connect)
+    await backend.start(receive)
+    backend._on_notify(None, 0, "proposal_ws", '{"fail": 1}')
+    for chunk in [*split_payload(json.dumps({"seq": 0, "pad": "x" * 50}), size=20), '{"seq": 1}']:
+        backend._on_notify(None, 0, "proposal_ws", chunk)
+    await asyncio.sleep(0.05)
+    await backend.stop()
+    assert received == [0, 1]
+
+
+async def test_presence_is_coalesced_into_diffs():
+    manager = ConnectionManager()
+    team = [FakeSocket() for _ in range(30)]
+    for i, ws in enumerate(team):
+        await manager.connect(ws, "p-1", f"User {i}")
+    await manager.update_tab(team[0], "pricing")
+    manager.disconnect(team[-1])
+    await manager.drain()
+
+    # One snapshot on joining plus one diff for the whole burst, not a map per join
+    for ws in team[:-1]:
+        assert [m["type"] for m in ws.received] == ["presence", "presence_diff"]
+        assert presence(ws) == {"pricing": ["User 0"], "wbs": [f"User {i}" for i in range(1, 29)]}
+    assert manager.stats()["presence_frames"] == 30 + 29
+
+    late = FakeSocket()
+    await manager.connect(late, "p-1", "Late")
+    await manager.drain()
+    assert len(late.received[0]["members"]) == 30
+    for ws in [*team[:-1], late]:
+        manager.disconnect(ws)
+    await manager.drain()
+
+
+async def test_edits_are_batched_per_room_keeping_the_latest_value():
+    manager = ConnectionManager()
+    typist, peer = FakeSocket(), FakeSocket()
+    await manager.connect(typist, "p-1", "Typist")
+    await manager.connect(peer, "p-1", "Peer")
+
+    for text in ["S", "Si", "Sit", "Site"]:
+        manager.queue_edit("p-1", {"table": "wbs_items", "row_id": "w-1", "field": "description", "value": text}, typist)
+    manager.queue_edit("p-1", {"table": "wbs_items", "row_id": "w-1", "field": "code", "value": "1.1"}, typist)
+    await manager.drain()
+
+    batches = [m for m in peer.received if m.get("type") == "batch"]
+    assert [[(u["field"], u["value"]) for u in b["updates"]] for b in batches] == [
+        [("description", "Site"), ("code", "1.1")]
+    ]
+    assert not [m for m in typist.received if m.get("type") == "batch"]
+    stats = manager.stats()
+    assert (stats["edits_in"], stats["edit_frames_out"], stats["edit_frames_unbatched"]) == (5, 1, 5)
+    manager.disconnect(typist)
+    manager.disconnect(peer)
+    await manager.drain()
+
+
+async def test_edits_with_non_scalar_keys_are_still_batched():
+    manager = ConnectionManager()
+    sender, peer = FakeSocket(), FakeSocket()
+    await manager.connect(sender, "p-1", "Sender")
+    await manager.connect(peer, "p-1", "Peer")
+    manager.queue_edit("p-1", {"table": "wbs_items", "row_id": ["w-1"], "field": {"x": 1}, "value": 1}, sender)
+    manager.queue_edit("p-1", {"table": "wbs_items", "row_id": ["w-1"], "field": {"x": 1}, "value": 2}, sender)
+    await manager.drain()
+
+    assert [m["updates"] for m in peer.received if m.get("type") == "batch"] == [
+        [{"table": "wbs_items", "row_id": ["w-1"], "field": {"x": 1}, "value": 2}]
+    ]
+    manager.disconnect(sender)
+    manager.disconnect(peer)
+    await manager.drain()
+
+
+async def test_compact_encoding_abbreviates_keys_per_connection():
+    class RawSocket(FakeSocket):
+        async def send_text(self, payload):
+            self.received.append(payload)
+
+    manager = ConnectionManager()
+    plain, compact = FakeSocket(), RawSocket()
+    await manager.connect(plain, "p-1", "Plain")
+    await manager.connect(compact, "p-1", "Compact", encoding="compact")
+    await manager.drain()
+    message = {"type": "job_partial", "job_id": "j-1", "items": [{"employee_name": "Sarah Chen", "a": 1, "~x": 2}]}
+    await manager.broadcast("p-1", message)
+    await manager.drain()
+
+    assert json.loads(compact.received[0]) == {"type": "keys", "keys": dict(zip(encoding.CODES, encoding.KEYS))}
+    frame = compact.received[-1]
+    assert '"type"' not in frame and len(frame) < len(json.dumps(message))
+    assert encoding.decode(frame, "compact") == message
+    assert plain.received[-1] == message
+    manager.disconnect(plain)
+    manager.disconnect(compact)
+    await manager.drain()
+
+
+def test_msgpack_encoding_round_trips():
+    message = {"type": "batch", "updates": [{"table": "pricing_rows", "row_id": "r-1", "field": "hours", "value": 7.5}]}
+    frame = encoding.encode(message, "msgpack")
+    assert isinstance(frame, bytes) and len(frame) < len(json.dumps(message))
+    assert encoding.decode(frame, "msgpack") == message
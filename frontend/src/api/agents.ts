@@ -16,6 +16,7 @@ export interface JobStatus {
   job_id: string;
   status: "pending" | "running" | "complete" | "error";
   result: CVResult[] | null;
+  error?: string | null;
   created_at: string;
   completed_at: string | null;
 }
@@ -99,4 +100,117 @@ export const agentsApi = {
 
   pollJob: (jobId: string) =>
     api.get<JobStatus>(`/api/agents/jobs/${jobId}`).then(r => r.data),
+
+  getJobs: (jobIds: string[]) =>
+    api.get<JobStatus[]>("/api/agents/jobs", { params: { ids: jobIds.join(",") } }).then(r => r.data),
+
+  cancelJob: (jobId: string) => api.delete(`/api/agents/jobs/${jobId}`),
+
+  watchJob: (jobId: string, onUpdate: JobListener) => watchJob(jobId, onUpdate),
 };
+
+// ── Job watching ──────────────────────────────────────────────────────────
+// While the proposal WebSocket is open the server pushes job_progress /
+// job_complete events, plus job_partial events carrying each result item as
+// the agent produces it (from whichever API worker runs the job); a slow
+// batched check remains only as a safety net for events missed while the
+// socket was reconnecting.  Without a socket, every watched job
+// on the page shares one batched GET /api/agents/jobs?ids=... per second.
+
+type JobListener = (job: JobStatus) => void;
+
+const JOB_POLL_INTERVAL_MS = 1000;
+const JOB_PUSH_FALLBACK_MS = 15000;
+const watchers = new Map<string, Set<JobListener>>();
+// Items received so far for running jobs, from job_partial events
+const partials = new Map<string, unknown[]>();
+let pollTimer: ReturnType<typeof setInterval> | null = null;
+let pollEvery = 0;
+let pushActive = false;
+let catchUpTimer: ReturnType<typeof setTimeout> | null = null;
+
+function notify(job: JobStatus) {
+  const listeners = watchers.get(job.job_id);
+  if (!listeners) return;
+  if (job.status === "complete" || job.status === "error") {
+    watchers.delete(job.job_id);
+    partials.delete(job.job_id);
+  }
+  listeners.forEach(listener => listener(job));
+}
+
+function syncPolling() {
+  const every = watchers.size === 0 ? 0 : pushActive ? JOB_PUSH_FALLBACK_MS : JOB_POLL_INTERVAL_MS;
+  if (every === pollEvery) return;
+  if (pollTimer) clearInterval(pollTimer);
+  pollTimer = every ? setInterval(pollWatchedJobs, every) : null;
+  pollEvery = every;
+}
+
+async function pollWatchedJobs() {
+  const ids = [...watchers.keys()];
+  if (ids.length === 0) return;
+  let jobs: JobStatus[];
+  try {
+    jobs = await agentsApi.getJobs(ids);
+  } catch {
+    return; // transient failure: try again next cycle
+  }
+  const seen = new Set(jobs.map(j => j.job_id));
+  jobs.forEach(notify);
+  // The server drops unknown/expired jobs from the response
+  ids.filter(id => !seen.has(id)).forEach(id =>
+    notify({ job_id: id, status: "error", result: null, error: "Job not found", created_at: "", completed_at: null }),
+  );
+  syncPolling();
+}
+
+/** Call onUpdate with each status of jobId until it finishes. Returns an unsubscribe function. */
+function watchJob(jobId: string, onUpdate: JobListener): () => void {
+  if (!watchers.has(jobId)) {
+    watchers.set(jobId, new Set());
+    // Events pushed before anyone watched the job are missed — a cached result
+    // completes during the POST itself — so check new jobs once, batched
+    catchUpTimer ??= setTimeout(() => {
+      catchUpTimer = null;
+      void pollWatchedJobs();
+    }, 0);
+  }
+  watchers.get(jobId)!.add(onUpdate);
+  syncPolling();
+  return () => {
+    const listeners = watchers.get(jobId);
+    listeners?.delete(onUpdate);
+    if (listeners && listeners.size === 0) watchers.delete(jobId);
+    syncPolling();
+  };
+}
+
+/** Called by the proposal socket when it opens/closes. */
+export function setJobPushActive(active: boolean) {
+  pushActive = active;
+  // Catch up on anything that finished while the socket was down
+  if (active) void pollWatchedJobs();
+  syncPolling();
+}
+
+/** Called by the proposal socket for job_progress / job_partial / job_complete messages. */
+export function receiveJobEvent(msg: { type: string; job_id: string; status: JobStatus["status"]; result?: unknown; items?: unknown[]; offset?: number; error?: string | null; completed_at?: string | null }) {
+  let result = msg.result ?? null;
+  if (msg.type === "job_partial") {
+    if (!watchers.has(msg.job_id)) return;
+    const items = partials.get(msg.job_id) ?? [];
+    items.splice(msg.offset ?? items.length, msg.items?.length ?? 0, ...(msg.items ?? []));
+    partials.set(msg.job_id, items);
+    result = [...items];
+  }
+  notify({
+    job_id: msg.job_id,
+    status: msg.status,
+    result: result as JobStatus["result"],
+    error: msg.error ?? null,
+    created_at: "",
+    completed_at: msg.completed_at ?? null,
+  });
+  syncPolling();
+}
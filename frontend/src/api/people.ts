@@ -15,6 +15,19 @@ export interface Person {
   cv_path: string | null;
 }
 
+export interface RerateRequest {
+  team?: string;
+  wsp_role?: string;
+  cost_rate?: number;
+  burdened_rate?: number;
+  hourly_rate?: number;
+}
+
+export interface RerateResult {
+  people_updated: number;
+  pricing_rows_updated: number;
+}
+
 export const peopleApi = {
   list: (proposalId: string) =>
     api.get<Person[]>(`/api/proposals/${proposalId}/people/`).then(r => r.data),
@@ -24,4 +37,6 @@ export const peopleApi = {
     api.patch<Person>(`/api/proposals/${proposalId}/people/${personId}`, data).then(r => r.data),
   delete: (proposalId: string, personId: string) =>
     api.delete(`/api/proposals/${proposalId}/people/${personId}`),
+  rerate: (proposalId: string, data: RerateRequest) =>
+    api.post<RerateResult>(`/api/proposals/${proposalId}/people/rerate`, data).then(r => r.data),
 };
@@ -17,6 +17,26 @@ export interface PricingRow {
   total_cost_internal: number;
 }
 
+export interface PricingBatch {
+  create?: Partial<PricingRow>[];
+  update?: (Partial<PricingRow> & { id: string })[];
+  delete?: string[];
+}
+
+export interface WBSTotals {
+  wbs_id: string;
+  total_hours: number;
+  total_cost: number;
+  total_cost_internal: number;
+}
+
+export interface PricingBatchResult {
+  created: PricingRow[];
+  updated: PricingRow[];
+  deleted: string[];
+  wbs_totals: WBSTotals[];
+}
+
 export const pricingApi = {
   list: (proposalId: string) =>
     api.get<PricingRow[]>(`/api/proposals/${proposalId}/pricing/`).then(r => r.data),
@@ -26,4 +46,6 @@ export const pricingApi = {
     api.patch<PricingRow>(`/api/proposals/${proposalId}/pricing/${rowId}`, data).then(r => r.data),
   delete: (proposalId: string, rowId: string) =>
     api.delete(`/api/proposals/${proposalId}/pricing/${rowId}`),
+  batch: (proposalId: string, data: PricingBatch) =>
+    api.post<PricingBatchResult>(`/api/proposals/${proposalId}/pricing/batch`, data).then(r => r.data),
 };
@@ -1,4 +1,4 @@
-import { useState, useRef, useCallback } from "react";
+import { useState, useRef, useCallback, useEffect } from "react";
 import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
 import { deliverablesApi, type Deliverable, type DeliverableType } from "../../api/deliverables";
 import { wbsApi, type WBSItem } from "../../api/wbs";
@@ -20,7 +20,8 @@ export default function DeliverablesTab({ proposalId }: Props) {
   const [formValues, setFormValues] = useState<Partial<Deliverable>>({});
   const [fetching, setFetching] = useState(false);
   const [fetchResults, setFetchResults] = useState<DeliverableResult[] | null>(null);
-  const pollRef = useRef<ReturnType<typeof setInterval> | null>(null);
+  const pollRef = useRef<(() => void) | null>(null);
+  useEffect(() => () => { pollRef.current?.(); }, []);
 
   const { data: deliverables = [], isLoading } = useQuery({
     queryKey: ["deliverables", proposalId],
@@ -59,22 +60,14 @@ export default function DeliverablesTab({ proposalId }: Props) {
     setFetchResults(null);
     try {
       const { job_id } = await agentsApi.startDeliverablesFetch(proposalId);
-      pollRef.current = setInterval(async () => {
-        try {
-          const job = await agentsApi.pollJob(job_id);
-          if (job.status === "complete" && job.result) {
-            if (pollRef.current) clearInterval(pollRef.current);
-            setFetchResults(job.result as unknown as DeliverableResult[]);
-            setFetching(false);
-          } else if (job.status === "error") {
-            if (pollRef.current) clearInterval(pollRef.current);
-            setFetching(false);
-          }
-        } catch {
-          if (pollRef.current) clearInterval(pollRef.current);
+      pollRef.current = agentsApi.watchJob(job_id, job => {
+        if (job.result) setFetchResults(job.result as unknown as DeliverableResult[]);
+        if (job.status === "complete" && job.result) {
+          setFetching(false);
+        } else if (job.status === "error") {
           setFetching(false);
         }
-      }, 1000);
+      });
     } catch {
       setFetching(false);
     }
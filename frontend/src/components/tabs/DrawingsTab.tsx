@@ -1,4 +1,4 @@
-import { useState, useRef, useCallback } from "react";
+import { useState, useRef, useCallback, useEffect } from "react";
 import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
 import { drawingsApi, type Drawing, type DrawingFormat } from "../../api/drawings";
 import { wbsApi, type WBSItem } from "../../api/wbs";
@@ -21,7 +21,8 @@ export default function DrawingsTab({ proposalId }: Props) {
   const [filterDiscipline, setFilterDiscipline] = useState<string>("");
   const [fetching, setFetching] = useState(false);
   const [fetchResults, setFetchResults] = useState<DrawingResult[] | null>(null);
-  const pollRef = useRef<ReturnType<typeof setInterval> | null>(null);
+  const pollRef = useRef<(() => void) | null>(null);
+  useEffect(() => () => { pollRef.current?.(); }, []);
 
   const { data: drawings = [], isLoading } = useQuery({
     queryKey: ["drawings", proposalId],
@@ -68,22 +69,14 @@ export default function DrawingsTab({ proposalId }: Props) {
     setFetchResults(null);
     try {
       const { job_id } = await agentsApi.startDrawingsFetch(proposalId);
-      pollRef.current = setInterval(async () => {
-        try {
-          const job = await agentsApi.pollJob(job_id);
-          if (job.status === "complete" && job.result) {
-            if (pollRef.current) clearInterval(pollRef.current);
-            setFetchResults(job.result as unknown as DrawingResult[]);
-            setFetching(false);
-          } else if (job.status === "error") {
-            if (pollRef.current) clearInterval(pollRef.current);
-            setFetching(false);
-          }
-        } catch {
-          if (pollRef.current) clearInterval(pollRef.current);
+      pollRef.current = agentsApi.watchJob(job_id, job => {
+        if (job.result) setFetchResults(job.result as unknown as DrawingResult[]);
+        if (job.status === "complete" && job.result) {
+          setFetching(false);
+        } else if (job.status === "error") {
           setFetching(false);
         }
-      }, 1000);
+      });
     } catch {
       setFetching(false);
     }
@@ -241,7 +241,7 @@ export default function OverviewTab({ proposalId }: Props) {
   const [fetchState, setFetchState] = useState<FetchState>("idle");
   const [rfpResults, setRfpResults] = useState<RFPScopeResult[]>([]);
   const [dismissed, setDismissed] = useState<Set<number>>(new Set());
-  const pollRef = useRef<ReturnType<typeof setInterval> | null>(null);
+  const pollRef = useRef<(() => void) | null>(null);
 
   const { data: sections = [], isLoading } = useQuery({
     queryKey: ["scope", proposalId],
@@ -279,10 +279,10 @@ export default function OverviewTab({ proposalId }: Props) {
     onSuccess: () => qc.invalidateQueries({ queryKey: ["scope", proposalId] }),
   });
 
-  // Cleanup poll on unmount
+  // Stop watching the job on unmount
   useEffect(() => {
     return () => {
-      if (pollRef.current) clearInterval(pollRef.current);
+      pollRef.current?.();
     };
   }, []);
 
@@ -292,23 +292,14 @@ export default function OverviewTab({ proposalId }: Props) {
     setDismissed(new Set());
     try {
       const { job_id } = await agentsApi.startRFPExtract(proposalId);
-      // Poll every 1s
-      pollRef.current = setInterval(async () => {
-        try {
-          const job = await agentsApi.pollJob(job_id);
-          if (job.status === "complete" && job.result) {
-            if (pollRef.current) clearInterval(pollRef.current);
-            setRfpResults(job.result as unknown as RFPScopeResult[]);
-            setFetchState("done");
-          } else if (job.status === "error") {
-            if (pollRef.current) clearInterval(pollRef.current);
-            setFetchState("error");
-          }
-        } catch {
-          if (pollRef.current) clearInterval(pollRef.current);
+      pollRef.current = agentsApi.watchJob(job_id, job => {
+        if (job.result) setRfpResults(job.result as unknown as RFPScopeResult[]);
+        if (job.status === "complete" && job.result) {
+          setFetchState("done");
+        } else if (job.status === "error") {
           setFetchState("error");
         }
-      }, 1000);
+      });
     } catch {
       setFetchState("error");
     }
@@ -377,7 +368,7 @@ export default function OverviewTab({ proposalId }: Props) {
         </div>
       )}
 
-      {fetchState === "done" && visibleResults.length > 0 && (
+      {(fetchState === "fetching" || fetchState === "done") && visibleResults.length > 0 && (
         <div className="mb-6 space-y-3">
           <p className="text-xs font-medium text-purple-600 uppercase tracking-wide">Extracted from RFP — Review & Accept</p>
           {visibleResults.map((r, _i) => {
@@ -18,7 +18,7 @@ export default function PeopleTab({ proposalId }: Props) {
   const [fetchState, setFetchState] = useState<FetchState>("idle");
   const [cvResults, setCvResults] = useState<CVResult[]>([]);
   const [dismissed, setDismissed] = useState<Set<string>>(new Set());
-  const pollRef = useRef<ReturnType<typeof setInterval> | null>(null);
+  const pollRef = useRef<(() => void) | null>(null);
 
   const { data: people = [], isLoading } = useQuery({
     queryKey: ["people", proposalId],
@@ -127,23 +127,20 @@ export default function PeopleTab({ proposalId }: Props) {
     setDismissed(new Set());
     try {
       const { job_id } = await agentsApi.startCVFetch(proposalId, names);
-      pollRef.current = setInterval(async () => {
-        const job = await agentsApi.pollJob(job_id);
+      pollRef.current = agentsApi.watchJob(job_id, job => {
+        if (job.result) setCvResults(job.result);
         if (job.status === "complete" && job.result) {
-          clearInterval(pollRef.current!);
-          setCvResults(job.result);
           setFetchState("done");
         } else if (job.status === "error") {
-          clearInterval(pollRef.current!);
           setFetchState("error");
         }
-      }, 800);
+      });
     } catch {
       setFetchState("error");
     }
   };
 
-  useEffect(() => () => { if (pollRef.current) clearInterval(pollRef.current); }, []);
+  useEffect(() => () => { pollRef.current?.(); }, []);
 
   const visibleResults = cvResults.filter(cv => !dismissed.has(cv.employee_id));
 
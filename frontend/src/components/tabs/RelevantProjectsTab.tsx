@@ -1,4 +1,4 @@
-import { useState, useRef, useCallback } from "react";
+import { useState, useRef, useCallback, useEffect } from "react";
 import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
 import { relevantProjectsApi, type RelevantProject } from "../../api/relevantProjects";
 import { peopleApi, type Person } from "../../api/people";
@@ -18,32 +18,25 @@ export default function RelevantProjectsTab({ proposalId }: Props) {
   const [expandedId, setExpandedId] = useState<string | null>(null);
   const [fetching, setFetching] = useState(false);
   const [fetchResults, setFetchResults] = useState<RelevantProjectResult[] | null>(null);
-  const pollRef = useRef<ReturnType<typeof setInterval> | null>(null);
+  const pollRef = useRef<(() => void) | null>(null);
   const [searchFetching, setSearchFetching] = useState(false);
   const [searchResults, setSearchResults] = useState<ProjectSearchResult[] | null>(null);
-  const searchPollRef = useRef<ReturnType<typeof setInterval> | null>(null);
+  const searchPollRef = useRef<(() => void) | null>(null);
+  useEffect(() => () => { pollRef.current?.(); searchPollRef.current?.(); }, []);
 
   const startFetch = useCallback(async () => {
     setFetching(true);
     setFetchResults(null);
     try {
       const { job_id } = await agentsApi.startRelevantProjectsFetch(proposalId);
-      pollRef.current = setInterval(async () => {
-        try {
-          const job = await agentsApi.pollJob(job_id);
-          if (job.status === "complete" && job.result) {
-            if (pollRef.current) clearInterval(pollRef.current);
-            setFetchResults(job.result as unknown as RelevantProjectResult[]);
-            setFetching(false);
-          } else if (job.status === "error") {
-            if (pollRef.current) clearInterval(pollRef.current);
-            setFetching(false);
-          }
-        } catch {
-          if (pollRef.current) clearInterval(pollRef.current);
+      pollRef.current = agentsApi.watchJob(job_id, job => {
+        if (job.result) setFetchResults(job.result as unknown as RelevantProjectResult[]);
+        if (job.status === "complete" && job.result) {
+          setFetching(false);
+        } else if (job.status === "error") {
           setFetching(false);
         }
-      }, 1000);
+      });
     } catch {
       setFetching(false);
     }
@@ -74,22 +67,14 @@ export default function RelevantProjectsTab({ proposalId }: Props) {
     setSearchResults(null);
     try {
       const { job_id } = await agentsApi.startProjectsSearch(proposalId);
-      searchPollRef.current = setInterval(async () => {
-        try {
-          const job = await agentsApi.pollJob(job_id);
-          if (job.status === "complete" && job.result) {
-            if (searchPollRef.current) clearInterval(searchPollRef.current);
-            setSearchResults(job.result as unknown as ProjectSearchResult[]);
-            setSearchFetching(false);
-          } else if (job.status === "error") {
-            if (searchPollRef.current) clearInterval(searchPollRef.current);
-            setSearchFetching(false);
-          }
-        } catch {
-          if (searchPollRef.current) clearInterval(searchPollRef.current);
+      searchPollRef.current = agentsApi.watchJob(job_id, job => {
+        if (job.result) setSearchResults(job.result as unknown as ProjectSearchResult[]);
+        if (job.status === "complete" && job.result) {
+          setSearchFetching(false);
+        } else if (job.status === "error") {
           setSearchFetching(false);
         }
-      }, 1000);
+      });
     } catch {
       setSearchFetching(false);
     }
@@ -1,9 +1,36 @@
 import { useEffect, useRef, useCallback } from "react";
 import { useQueryClient } from "@tanstack/react-query";
+import { receiveJobEvent, setJobPushActive } from "../api/agents";
 
 /** Presence map: tab id -> array of user names currently on that tab */
 export type Presence = Record<string, string[]>;
 
+/** Server-side presence: member id (one per connection) -> [user name, tab] */
+type Members = Record<string, [string, string]>;
+
+/**
+ * Frames use the server's "compact" encoding: JSON whose keys are shortened
+ * through a dictionary sent as the first frame ({ type: "keys", keys: { code: key } }).
+ * Keys escaped with a leading "~" are sent as-is.
+ */
+function expandKeys(value: unknown, keys: Record<string, string>): unknown {
+  if (Array.isArray(value)) return value.map(item => expandKeys(item, keys));
+  if (value === null || typeof value !== "object") return value;
+  const out: Record<string, unknown> = {};
+  for (const [key, item] of Object.entries(value)) {
+    out[key.startsWith("~") ? key.slice(1) : keys[key] ?? key] = expandKeys(item, keys);
+  }
+  return out;
+}
+
+function toPresence(members: Members): Presence {
+  const presence: Presence = {};
+  for (const [userName, tab] of Object.values(members)) {
+    (presence[tab] ??= []).push(userName);
+  }
+  return presence;
+}
+
 interface Options {
   proposalId: string;
   activeTab: string;
@@ -41,30 +68,54 @@ export function useProposalSocket({ proposalId, activeTab, onPresence }: Options
     let attempt = 0;
     let reconnectTimer: ReturnType<typeof setTimeout> | null = null;
     let intentionalClose = false;
+    // Full map on connect, then kept current from presence_diff frames
+    let members: Members = {};
+    let keys: Record<string, string> = {};
 
     const connect = () => {
       const apiBase = (import.meta.env.VITE_API_URL || "http://localhost:8001").replace("http", "ws");
-      const wsUrl = `${apiBase}/ws/proposals/${proposalId}?token=${token}&tab=${activeTabRef.current}`;
+      const wsUrl = `${apiBase}/ws/proposals/${proposalId}?token=${token}&tab=${activeTabRef.current}&encoding=compact`;
       const ws = new WebSocket(wsUrl);
       wsRef.current = ws;
 
       ws.onopen = () => {
         attempt = 0; // reset backoff on successful connection
+        setJobPushActive(true);
       };
 
       ws.onmessage = (event) => {
         try {
-          const msg = JSON.parse(event.data);
+          const frame = JSON.parse(event.data);
+          if (frame.type === "keys") {
+            keys = frame.keys ?? {};
+            return;
+          }
+          const msg = expandKeys(frame, keys) as any;
 
           if (msg.type === "presence") {
-            onPresence(msg.presence ?? {});
+            members = { ...(msg.members ?? {}) };
+            onPresence(toPresence(members));
+            return;
+          }
+
+          if (msg.type === "presence_diff") {
+            Object.assign(members, msg.set ?? {});
+            for (const id of msg.left ?? []) delete members[id];
+            onPresence(toPresence(members));
+            return;
+          }
+
+          if (msg.type === "job_progress" || msg.type === "job_partial" || msg.type === "job_complete") {
+            receiveJobEvent(msg);
             return;
           }
 
-          // Data change — invalidate the relevant query to trigger a refetch
-          const queryKey = msg.table ? TABLE_QUERY_KEY[msg.table] : null;
-          if (queryKey) {
-            qc.invalidateQueries({ queryKey: [queryKey, proposalId] });
+          // Data changes (the server batches peers' edits) — invalidate each
+          // affected query once to trigger a refetch
+          const changes: { table?: string }[] = msg.type === "batch" ? msg.updates ?? [] : [msg];
+          const queryKeys = new Set(changes.map(change => (change.table ? TABLE_QUERY_KEY[change.table] : undefined)));
+          for (const queryKey of queryKeys) {
+            if (queryKey) qc.invalidateQueries({ queryKey: [queryKey, proposalId] });
           }
         } catch {
           // ignore malformed frames
@@ -73,6 +124,7 @@ export function useProposalSocket({ proposalId, activeTab, onPresence }: Options
 
       ws.onclose = () => {
         wsRef.current = null;
+        setJobPushActive(false);
         if (!intentionalClose && attempt < 10) {
           const delay = Math.min(1000 * Math.pow(2, attempt), 30000);
           attempt++;